@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: append and scan throughput of the memory-mapped StatsArchive.
+
+Appends --rows synthetic snapshots (--videos videos polled round-robin,
+in batches) to a temporary archive, then times a full-range column sum,
+a half-range sum and the per-video latest-snapshot frame, reporting
+throughput and the process's peak resident memory after each step.
+
+    python -m benchmarks.bench_archive --rows 100000000 --videos 100000
+"""
+
+import argparse
+import resource
+import tempfile
+import time
+import numpy as np
+from src.archive import StatsArchive
+
+BATCH_ROWS = 1 << 20
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def fill(archive, rows, videos, seed=0):
+    rng = np.random.default_rng(seed)
+    video_ids = [f"v{i}" for i in range(videos)]
+    archive.append(video_ids, 0, np.zeros(videos), np.zeros(videos), np.zeros(videos))
+    for start in range(videos, rows, BATCH_ROWS):
+        count = min(BATCH_ROWS, rows - start)
+        index = np.arange(start, start + count) % videos
+        archive.append(
+            [video_ids[i] for i in index], np.arange(start, start + count) // videos * 3600,
+            views=index * 10 + start // videos, likes=rng.integers(0, 1000, count),
+            comments=rng.integers(0, 100, count)
+        )
+
+
+def timed(name, rows, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20}{elapsed * 1000:>12.1f}{rows / elapsed / 1e6:>12.1f}{peak_rss_mb():>15.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--videos", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = StatsArchive(tmp)
+        print(f"{'step':<20}{'time (ms)':>12}{'Mrows/s':>12}{'peak RSS (MB)':>15}")
+        timed("append", args.rows, lambda: fill(archive, args.rows, args.videos))
+        
+        def total_views(start=None):
+            return sum(int(chunk["views"].sum()) for chunk in archive.scan(start))
+        
+        timed("sum views", args.rows, total_views)
+        half = int(archive.column("taken_at")[args.rows // 2])
+        lo, hi = archive.row_range(half)
+        timed("sum views (half)", hi - lo, lambda: total_views(half))
+        timed("latest frame", args.rows, lambda: archive.to_frame())
+
+
+if __name__ == "__main__":
+    main()
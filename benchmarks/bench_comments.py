@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming comment-thread analysis over a local stand-in API.
+
+One "viral" video with --viral threads plus --videos ordinary videos of
+--comments threads each are streamed with
+AsyncYouTubeClient.stream_comment_threads into per-video CommentStats, as
+VideoAnalyzer.analyze_comments does. Reports threads per second and the
+peak Python heap (tracemalloc), which should stay flat as --viral grows.
+
+    python -m benchmarks.bench_comments --viral 100000 --videos 50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from benchmarks.fake_api import FakeYouTubeAPI, video_id
+from src.async_client import AsyncYouTubeClient
+from src.metrics import CommentStats
+
+
+async def stream_stats(transport, video_ids, max_concurrency):
+    stats = {vid: CommentStats() for vid in video_ids}
+    async with AsyncYouTubeClient(api_key="bench", transport=transport, max_concurrency=max_concurrency) as client:
+        async for vid, threads in client.stream_comment_threads(video_ids):
+            stats[vid].update(threads)
+    return {vid: s.to_metrics() for vid, s in stats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--viral", type=int, default=20_000)
+    parser.add_argument("--videos", type=int, default=50)
+    parser.add_argument("--comments", type=int, default=500)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    args = parser.parse_args()
+    
+    video_ids = [video_id(i) for i in range(args.videos + 1)]
+    viral_id = video_ids[0]
+    
+    def comments_for(vid):
+        return args.viral if vid == viral_id else args.comments
+    
+    with FakeYouTubeAPI(videos=len(video_ids), comments_for=comments_for) as api:
+        transport = api.transport(pool_maxsize=args.max_concurrency)
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = asyncio.run(stream_stats(transport, video_ids, args.max_concurrency))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    threads = sum(r["comment_threads"] for r in results.values())
+    print(f"threads:           {threads}")
+    print(f"time:              {elapsed:.2f} s ({threads / elapsed:,.0f} threads/s)")
+    print(f"peak heap:         {peak / 1e6:.1f} MB")
+    print(f"viral video:       {results[viral_id]}")
+
+
+if __name__ == "__main__":
+    main()
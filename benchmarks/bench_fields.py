@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: payload size and decode time of full vs projected video requests.
+
+Crawls --videos videos from a local FakeYouTubeAPI (which honours `part`
+and `fields` like the real API) three ways: full detail parts, the
+analysis FieldMask, and the FieldMask again with the part cache warm, so
+only statistics are requested. Reports requests, bytes received, JSON
+decode time and wall time for each.
+
+    python -m benchmarks.bench_fields --videos 10000
+"""
+
+import argparse
+import time
+from benchmarks.fake_api import FakeYouTubeAPI
+from src.fields import ANALYSIS_FIELDS
+from src.telemetry import TELEMETRY
+from src.youtube_client import YouTubeClient
+
+CHANNEL_ID = "UCbench"
+
+
+def crawl(client, videos, fields):
+    """Return (items, requests, bytes, decode seconds, wall seconds) for one crawl."""
+    TELEMETRY.reset()
+    start = time.perf_counter()
+    items = client.get_channel_videos(CHANNEL_ID, max_results=videos, fields=fields)
+    elapsed = time.perf_counter() - start
+    decode = sum(
+        histogram.sum for endpoint in ("videos", "playlistItems")
+        if (histogram := TELEMETRY.histogram("json_decode_seconds", endpoint=endpoint)) is not None
+    )
+    return (items, TELEMETRY.total("api_requests_total"), TELEMETRY.total("api_response_bytes_total"),
+            decode, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    TELEMETRY.enable()
+    with FakeYouTubeAPI(videos=args.videos) as api:
+        cases = (
+            ("full parts", None, YouTubeClient(api_key="bench", transport=api.transport())),
+            ("analysis fields", ANALYSIS_FIELDS, YouTubeClient(api_key="bench", transport=api.transport())),
+        )
+        print(f"{'case':<26}{'requests':>10}{'MB':>10}{'decode (ms)':>13}{'total (ms)':>12}")
+        for name, fields, client in cases + (("analysis fields, cached", ANALYSIS_FIELDS, cases[1][2]),):
+            items, requests, received, decode, elapsed = crawl(client, args.videos, fields)
+            assert len(items) == args.videos
+            print(f"{name:<26}{requests:>10}{received / 1e6:>10.2f}{decode * 1000:>13.1f}{elapsed * 1000:>12.1f}")
+        for _, _, client in cases:
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
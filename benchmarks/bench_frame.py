@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-video dict analysis vs the columnar VideoFrame.
+
+Builds a synthetic archive of API items and times ingest, comparison and
+filtering for both result shapes.
+
+    python -m benchmarks.bench_frame --videos 100000
+"""
+
+import argparse
+import random
+import time
+from unittest.mock import patch
+from src.analyzer import VideoAnalyzer
+from src.frame import VideoFrame
+
+
+def synthetic_videos(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"v{i}",
+            "snippet": {
+                "title": f"Video {i}",
+                "publishedAt": f"20{rng.randint(15, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00Z"
+            },
+            "statistics": {
+                "viewCount": str(rng.randint(1, 50_000_000)),
+                "likeCount": str(rng.randint(0, 1_000_000)),
+                "commentCount": str(rng.randint(0, 100_000))
+            }
+        }
+        for i in range(count)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    videos = synthetic_videos(args.videos)
+    with patch("src.analyzer.YouTubeClient"):
+        analyzer = VideoAnalyzer(api_key="bench")
+    
+    records, records_ingest = timed(lambda: analyzer.analyze_videos(videos))
+    frame, frame_ingest = timed(lambda: VideoFrame.from_videos(videos))
+    
+    print(f"{'step':<24}{'dicts (ms)':>12}{'frame (ms)':>12}")
+    print(f"{'ingest + metrics':<24}{records_ingest:>12.1f}{frame_ingest:>12.1f}")
+    for name, fn in [
+        ("comparison", lambda r: analyzer.get_comparison_data(r)),
+        ("filter", lambda r: analyzer.filter_by_performance(r, min_engagement=2.0)),
+    ]:
+        _, dict_ms = timed(lambda: fn(records))
+        _, frame_ms = timed(lambda: fn(frame))
+        print(f"{name:<24}{dict_ms:>12.1f}{frame_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held per video, raw API dicts vs compact Video records.
+
+Streams a synthetic catalogue of realistic `videos` items (descriptions,
+thumbnails, tags) and measures retained memory with tracemalloc. Keeping
+a million raw items would need several GB, so the raw figure is measured
+on a sample and extrapolated.
+
+    python -m benchmarks.bench_memory --videos 1000000 --raw-sample 20000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from src.video import Video
+
+THUMBNAIL_SIZES = ("default", "medium", "high", "standard", "maxres")
+
+
+def synthetic_items(count, seed=0):
+    """Yield `videos` API items shaped like real responses, one at a time."""
+    rng = random.Random(seed)
+    for i in range(count):
+        video_id = f"{i:011d}"
+        yield {
+            "kind": "youtube#video",
+            "etag": f"etag-{i}",
+            "id": video_id,
+            "snippet": {
+                "publishedAt": f"20{rng.randint(15, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00Z",
+                "channelId": "UC4Tklxku1yPcRIH0VVCKoeA",
+                "title": f"Incredible Construction Project #{i}",
+                "description": f"Video {i}. " + "Watch how this amazing project comes together. " * 20,
+                "thumbnails": {
+                    size: {"url": f"https://i.ytimg.com/vi/{video_id}/{size}.jpg", "width": 480, "height": 360}
+                    for size in THUMBNAIL_SIZES
+                },
+                "channelTitle": "Quantum Tech HD",
+                "tags": ["tech", "construction", "engineering", "diy", f"project{i % 100}"],
+                "categoryId": "28",
+                "liveBroadcastContent": "none",
+                "localized": {"title": f"Incredible Construction Project #{i}", "description": "..."}
+            },
+            "contentDetails": {"duration": "PT12M3S", "dimension": "2d", "definition": "hd", "caption": "false"},
+            "statistics": {
+                "viewCount": str(rng.randint(1, 50_000_000)),
+                "likeCount": str(rng.randint(0, 1_000_000)),
+                "favoriteCount": "0",
+                "commentCount": str(rng.randint(0, 100_000))
+            }
+        }
+
+
+def retained_bytes(build):
+    """Bytes still allocated after `build()` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=1_000_000)
+    parser.add_argument("--raw-sample", type=int, default=20_000)
+    args = parser.parse_args()
+    
+    raw_bytes, raw = retained_bytes(lambda: list(synthetic_items(args.raw_sample)))
+    del raw
+    video_bytes, videos = retained_bytes(lambda: [Video.from_api(d) for d in synthetic_items(args.videos)])
+    
+    raw_per_video = raw_bytes / args.raw_sample
+    video_per_video = video_bytes / len(videos)
+    
+    print(f"{'representation':<18}{'bytes/video':>14}{f'total for {args.videos:,}':>24}")
+    print(f"{'raw API dicts':<18}{raw_per_video:>14,.0f}{raw_per_video * args.videos / 2**20:>20,.0f} MiB (extrapolated)")
+    print(f"{'Video records':<18}{video_per_video:>14,.0f}{video_bytes / 2**20:>20,.0f} MiB")
+    print(f"{'reduction':<18}{raw_per_video / video_per_video:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
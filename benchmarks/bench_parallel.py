@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: process-pool rescoring of a large archive frame.
+
+Builds a synthetic columnar archive and times score_frame with 1, 2, 4,
+... workers (up to the core count), reporting throughput and speedup for
+a plain frame (inputs copied into shared memory) and for a frame built
+in shared memory with shared_frame() (no copies).
+
+    python -m benchmarks.bench_parallel --videos 5000000
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.frame import VideoFrame, COLUMNS
+from src.parallel import score_frame, shared_frame
+
+
+def synthetic_frame(count, seed=0):
+    rng = np.random.default_rng(seed)
+    zeros = np.zeros(count)
+    return VideoFrame(
+        video_id=np.full(count, "", dtype=object),
+        title=np.full(count, "", dtype=object),
+        views=rng.integers(1, 50_000_000, count),
+        likes=rng.integers(0, 1_000_000, count),
+        comments=rng.integers(0, 100_000, count),
+        days_old=zeros,
+        published_ts=rng.uniform(1.4e9, 1.7e9, count),
+        engagement_rate=zeros,
+        growth_score=zeros
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=5_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    
+    frame = synthetic_frame(args.videos)
+    workers = [1]
+    while workers[-1] * 2 <= args.max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != args.max_workers:
+        workers.append(args.max_workers)
+    
+    shared = shared_frame(**{name: frame[name] for name in COLUMNS})
+    print(f"{os.cpu_count()} core(s)")
+    print(f"{'frame':<8}{'workers':<10}{'time (ms)':>12}{'Mrows/s':>10}{'speedup':>10}")
+    baseline = None
+    for label, scored in (("copied", frame), ("shared", shared)):
+        for n in workers:
+            # Start the pool outside the timed region, as a long-running job would
+            with ProcessPoolExecutor(max_workers=n) as pool:
+                list(pool.map(abs, range(n)))
+                start = time.perf_counter()
+                score_frame(scored, workers=n, executor=pool)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{label:<8}{n:<10}{elapsed * 1000:>12.1f}{args.videos / elapsed / 1e6:>10.1f}"
+                  f"{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed queries against a linear scan of a large catalogue.
+
+Builds a synthetic VideoFrame of --videos rows with generated titles,
+indexes it with VideoIndex, then times each query through the index and
+as a full-column NumPy scan, reporting the best of --repeat runs.
+
+    python -m benchmarks.bench_query --videos 1000000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from src.frame import VideoFrame, days_since
+from src.metrics import calculate_engagement_rates, calculate_growth_scores
+from src.query import VideoIndex, tokenize
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+VOCABULARY = [f"word{i}" for i in range(5000)] + ["bridge", "tunnel", "review", "tower", "build"]
+
+
+def synthetic_frame(count, seed=0):
+    rng = np.random.default_rng(seed)
+    # Zipf-like word choice, so a few words are common and most are rare
+    words = np.minimum(rng.zipf(1.3, (count, 6)) - 1, len(VOCABULARY) - 1)
+    titles = [" ".join(VOCABULARY[w] for w in row) for row in words]
+    titles = [title + " bridge" if i % 997 == 0 else title for i, title in enumerate(titles)]
+    views = rng.lognormal(10, 2.5, count).astype(np.int64)
+    likes = (views * rng.uniform(0, 0.08, count)).astype(np.int64)
+    published_ts = NOW.timestamp() - rng.uniform(0, 5 * 365, count) * 86400
+    days_old = days_since(published_ts, NOW)
+    return VideoFrame(
+        video_id=[f"v{i}" for i in range(count)],
+        title=titles,
+        views=views,
+        likes=likes,
+        comments=likes // 10,
+        days_old=days_old,
+        published_ts=published_ts,
+        engagement_rate=calculate_engagement_rates(likes, views),
+        growth_score=calculate_growth_scores(views, days_old)
+    )
+
+
+def scan(frame, text=None, min_views=None, min_engagement=None, published_after=None):
+    mask = np.ones(len(frame), dtype=bool)
+    if min_views is not None:
+        mask &= frame.views >= min_views
+    if min_engagement is not None:
+        mask &= frame.engagement_rate >= min_engagement
+    if published_after is not None:
+        mask &= frame.published_ts >= published_after.timestamp()
+    if text is not None:
+        tokens = set(tokenize(text))
+        mask &= [tokens <= set(tokenize(title)) for title in frame.title]
+    return np.flatnonzero(mask)
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    frame = synthetic_frame(args.videos)
+    start = time.perf_counter()
+    index = VideoIndex(frame)
+    print(f"index build: {time.perf_counter() - start:.2f} s for {args.videos} videos\n")
+    
+    last_30_days = NOW - timedelta(days=30)
+    queries = {
+        "views >= 1M": {"min_views": 1_000_000},
+        "engagement >= 7.5": {"min_engagement": 7.5},
+        "last 30 days": {"published_after": last_30_days},
+        "'bridge'": {"text": "bridge"},
+        "views>=1M, 30d, 'bridge'": {"text": "bridge", "min_views": 1_000_000, "published_after": last_30_days},
+    }
+    print(f"{'query':<28}{'rows':>9}{'index (ms)':>12}{'scan (ms)':>12}")
+    for name, query in queries.items():
+        indexed, rows = best_of(args.repeat, lambda: index.search(**query))
+        # Text scans tokenize every title; one run is plenty
+        scanned, expected = best_of(1 if "text" in query else args.repeat, lambda: scan(frame, **query))
+        assert rows.tolist() == expected.tolist()
+        print(f"{name:<28}{len(rows):>9}{indexed * 1000:>12.3f}{scanned * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
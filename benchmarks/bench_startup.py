@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start time of library imports and the CLI.
+
+Every case runs in a fresh interpreter, so the numbers are what a cron
+job or serverless invocation pays before doing any work. The best of
+--repeat runs is reported, with whether the case loaded the network stack
+(requests / asyncio).
+
+    python -m benchmarks.bench_startup --repeat 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from src.snapshots import SnapshotStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NETWORK_MODULES = ("requests", "asyncio")
+
+
+def startup_cases(snapshot_db):
+    """Case name -> interpreter arguments."""
+    return {
+        "python": ["-c", "pass"],
+        "import src": ["-c", "import src"],
+        "import src.metrics": ["-c", "import src.metrics"],
+        "import src.formatters": ["-c", "import src.formatters"],
+        "import src.analyzer": ["-c", "import src.analyzer"],
+        "main.py --help": ["main.py", "--help"],
+        "main.py --offline": ["main.py", "UCbench", "--offline", "--snapshot-db", snapshot_db],
+    }
+
+
+def seed_store(path, videos=50):
+    with SnapshotStore(path) as store:
+        store.record([
+            {
+                "id": f"v{i}",
+                "snippet": {"channelId": "UCbench", "title": f"Video {i}", "publishedAt": "2024-11-01T00:00:00Z"},
+                "statistics": {"viewCount": str(1000 * (i + 1)), "likeCount": str(10 * i), "commentCount": "1"}
+            }
+            for i in range(videos)
+        ])
+
+
+def run_case(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   check=True)
+    return time.perf_counter() - start
+
+
+def network_imports(args):
+    """The network modules a case imports, from one -X importtime run."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if "|" in line}
+    return [module for module in NETWORK_MODULES if module in imported]
+
+
+def measure_startup(repeat):
+    """Return {case: ([seconds per run], [network modules imported])}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_db = os.path.join(tmp, "snapshots.db")
+        seed_store(snapshot_db)
+        return {
+            name: ([run_case(args) for _ in range(repeat)], network_imports(args))
+            for name, args in startup_cases(snapshot_db).items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'case':<24}{'best (ms)':>11}  network modules")
+    for name, (timings, modules) in measure_startup(args.repeat).items():
+        print(f"{name:<24}{min(timings) * 1000:>11.1f}  {', '.join(modules) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: end-to-end timings against a synthetic YouTube API.
+
+For each catalogue size, starts a local FakeYouTubeAPI and times fetching
+(get_channel_videos), analyze_videos, get_comparison_data,
+filter_by_performance and the text formatters, plus cold-start times of
+the library and CLI (see bench_startup). Results are written as JSON;
+pass --compare with an earlier results file to flag regressions.
+
+    python -m benchmarks.bench_suite --sizes 10 1000 100000 --output after.json
+    python -m benchmarks.bench_suite --compare before.json --threshold 1.2
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+from benchmarks.fake_api import FakeYouTubeAPI
+from benchmarks.bench_startup import measure_startup
+from src.analyzer import VideoAnalyzer
+from src.video import Video
+from src.formatters import format_video_report, format_comparison_table
+from src.youtube_client import MAX_PAGE_SIZE
+
+DEFAULT_SIZES = (10, 1000, 10_000)
+CHANNEL_ID = "UCbench"
+
+# Stages faster than this in both runs are too noisy to flag as regressions
+NOISE_FLOOR = 0.001
+
+STAGES = (
+    "get_channel_videos",
+    "analyze_videos",
+    "get_comparison_data",
+    "filter_by_performance",
+    "formatters",
+)
+
+
+def time_call(fn, repeat):
+    """Run `fn` `repeat` times; return (the last result, list of seconds per run)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def format_report(results, comparison):
+    return "\n".join(format_video_report(r) for r in results) + format_comparison_table(comparison)
+
+
+def bench_size(size, args):
+    """
+    Time every stage on a catalogue of `size` videos; return
+    ({stage: [seconds, ...]}, API requests per fetch).
+    """
+    timings = {}
+    with FakeYouTubeAPI(videos=size, latency=args.latency, page_size=args.page_size, seed=args.seed) as api:
+        analyzer = VideoAnalyzer(api_key="bench", transport=api.transport())
+        
+        # Network-bound: fewer repeats at large sizes keeps the suite practical
+        fetch_repeat = args.repeat if size <= 10_000 else 1
+        videos, timings["get_channel_videos"] = time_call(
+            lambda: analyzer.client.get_channel_videos(CHANNEL_ID, max_results=size), fetch_repeat
+        )
+        requests_sent = api.requests // fetch_repeat
+        analyzer.videos = [Video.from_api(d) for d in videos]
+        del videos
+        
+        results, timings["analyze_videos"] = time_call(analyzer.analyze_videos, args.repeat)
+        comparison, timings["get_comparison_data"] = time_call(
+            lambda: analyzer.get_comparison_data(results), args.repeat
+        )
+        median_views = comparison["total_views"] / comparison["total_videos"]
+        _, timings["filter_by_performance"] = time_call(
+            lambda: analyzer.filter_by_performance(results, min_views=median_views, min_engagement=1.0),
+            args.repeat
+        )
+        _, timings["formatters"] = time_call(lambda: format_report(results, comparison), args.repeat)
+        analyzer.client.close()
+    
+    return timings, requests_sent
+
+
+def summarize(size, stage, timings):
+    best = min(timings)
+    return {
+        "videos": size,
+        "stage": stage,
+        "runs": len(timings),
+        "min_s": best,
+        "median_s": statistics.median(timings),
+        "us_per_video": best / size * 1e6 if size else None,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print current vs baseline per (size, stage); return the entries slower than `threshold`x."""
+    before = {(r["videos"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    print()
+    print(f"{'videos':>9}  {'stage':<32}{'before':>11}{'after':>11}{'ratio':>8}")
+    for r in results:
+        old = before.get((r["videos"], r["stage"]))
+        if old is None:
+            continue
+        ratio = r["min_s"] / old["min_s"] if old["min_s"] else float("inf")
+        regressed = ratio > threshold and max(r["min_s"], old["min_s"]) >= NOISE_FLOOR
+        flag = "  ⚠️" if regressed else ""
+        print(f"{r['videos']:>9}  {r['stage']:<32}{old['min_s']:>10.4f}s{r['min_s']:>10.4f}s{ratio:>7.2f}x{flag}")
+        if regressed:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Catalogue sizes to benchmark, 10 to 1000000 videos")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds of simulated latency per API response")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE,
+                        help="Largest page the stand-in API returns")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here (default: stdout summary only)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression (default: 1.25)")
+    parser.add_argument("--no-startup", action="store_true",
+                        help="Skip the cold-start (import and CLI startup) timings")
+    args = parser.parse_args(argv)
+    
+    results = []
+    requests_sent = {}
+    print(f"{'videos':>9}  {'stage':<32}{'min':>11}{'us/video':>11}")
+    for size in args.sizes:
+        timings, requests_sent[size] = bench_size(size, args)
+        for stage in STAGES:
+            entry = summarize(size, stage, timings[stage])
+            results.append(entry)
+            print(f"{size:>9}  {stage:<32}{entry['min_s']:>10.4f}s{entry['us_per_video']:>11.2f}")
+    if not args.no_startup:
+        # Startup entries have no catalogue; they are keyed as 0 videos
+        for case, (timings, network_modules) in measure_startup(args.repeat).items():
+            entry = summarize(0, f"startup: {case}", timings)
+            entry["network_modules"] = network_modules
+            results.append(entry)
+            print(f"{0:>9}  {entry['stage']:<32}{entry['min_s']:>10.4f}s{'-':>11}")
+    
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "config": {
+            "latency": args.latency,
+            "page_size": args.page_size,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "requests_per_fetch": requests_sent,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if {k: v for k, v in baseline["config"].items() if k != "requests_per_fetch"} != \
+                {k: v for k, v in report["config"].items() if k != "requests_per_fetch"}:
+            print("\n⚠️  Baseline was run with a different --latency/--page-size/--repeat/--seed")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than {args.threshold:g}x the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
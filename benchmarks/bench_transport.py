@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bare requests.get vs the pooled HTTPTransport.
+
+Starts a local keep-alive stub server and measures requests/sec for both
+approaches, single-threaded and from a small thread pool.
+
+    python -m benchmarks.bench_transport --requests 2000 --threads 8
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from src.transport import HTTPTransport
+
+PAYLOAD = json.dumps({"items": [{"id": f"v{i}"} for i in range(5)]}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+    
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(fetch, url, total, threads):
+    """Issue `total` GETs through `fetch` and return requests/sec."""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(total):
+            fetch(url)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: fetch(url), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_port}/videos"
+    
+    def bare(url):
+        return requests.get(url).json()
+    
+    transport = HTTPTransport(pool_maxsize=args.threads)
+    
+    print(f"{'mode':<28}{'req/s':>10}")
+    for threads in (1, args.threads):
+        before = run(bare, url, args.requests, threads)
+        after = run(transport.get, url, args.requests, threads)
+        print(f"{f'requests.get x{threads}':<28}{before:>10.0f}")
+        print(f"{f'HTTPTransport x{threads}':<28}{after:>10.0f}")
+        print(f"{'speedup':<28}{after / before:>9.2f}x")
+    
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
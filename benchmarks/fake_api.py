@@ -0,0 +1,261 @@
+"""
+Local stand-in for the YouTube Data API, for benchmarks without network access.
+
+Serves `channels`, `playlistItems` and `videos` for synthetic channels
+whose catalogues are generated on the fly from each video's index, so a
+million-video channel costs no memory. Every response is deterministic
+for a given seed; latency and the maximum page size are configurable.
+
+    with FakeYouTubeAPI(videos=100_000, latency=0.002) as api:
+        client = YouTubeClient(api_key="bench", transport=api.transport())
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from src.fields import apply_fields
+from src.transport import HTTPTransport
+from src.youtube_client import BASE_URL, MAX_PAGE_SIZE
+
+# Newest upload time; older videos are spaced SPACING seconds apart
+NEWEST_TS = datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp()
+SPACING = 6 * 60 * 60
+
+
+def video_id(index):
+    return f"v{index:010d}"
+
+
+def video_index(video_id):
+    return int(video_id[1:])
+
+
+def mix(index, seed):
+    """Cheap deterministic 32-bit hash of a video index."""
+    x = (index * 2654435761 + seed * 40503 + 0x9E3779B9) & 0xFFFFFFFF
+    x ^= x >> 16
+    x = (x * 0x45D9F3B) & 0xFFFFFFFF
+    return x ^ (x >> 16)
+
+
+def thumbnails(video_id):
+    return {
+        name: {"url": f"https://i.ytimg.com/vi/{video_id}/{name}.jpg", "width": width, "height": height}
+        for name, width, height in (("default", 120, 90), ("medium", 320, 180), ("high", 480, 360),
+                                    ("standard", 640, 480), ("maxres", 1280, 720))
+    }
+
+
+def video_item(index, seed=0, channel_id="UCbench"):
+    """A `videos` item for the video at `index` (0 is the newest upload), shaped like a real full response."""
+    h = mix(index, seed)
+    views = 100 + h % 5_000_000
+    published = datetime.fromtimestamp(NEWEST_TS - index * SPACING, timezone.utc)
+    title = f"Synthetic Upload #{index}"
+    description = f"Generated by the benchmark stand-in. Upload #{index} of the synthetic channel.\n\n" * 4
+    return {
+        "kind": "youtube#video",
+        "etag": f"etag{h:08x}",
+        "id": video_id(index),
+        "snippet": {
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "channelId": channel_id,
+            "title": title,
+            "description": description,
+            "thumbnails": thumbnails(video_id(index)),
+            "channelTitle": "Benchmark Channel",
+            "tags": ["benchmark", "synthetic", f"upload {index % 100}"],
+            "categoryId": "28",
+            "liveBroadcastContent": "none",
+            "defaultAudioLanguage": "en",
+            "localized": {"title": title, "description": description}
+        },
+        "contentDetails": {
+            "duration": "PT10M", "dimension": "2d", "definition": "hd", "caption": "false",
+            "licensedContent": True, "contentRating": {}, "projection": "rectangular"
+        },
+        "statistics": {
+            "viewCount": str(views),
+            "likeCount": str(views * (h >> 8 & 0x3F) // 1000),
+            "favoriteCount": "0",
+            "commentCount": str(views * (h >> 14 & 0x0F) // 10000)
+        }
+    }
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        api = self.server.api
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.rsplit("/", 1)[-1]
+        
+        handler = getattr(api, f"handle_{endpoint}", None)
+        status, body = (200, handler(params)) if handler else (404, {"error": {"code": 404}})
+        if status == 200 and "fields" in params:
+            body = apply_fields(body, params["fields"])
+        api.count_request()
+        if api.latency:
+            time.sleep(api.latency)
+        
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+
+class FakeYouTubeAPI:
+    """
+    Synthetic YouTube Data API server on a local port.
+    
+    Every channel ID resolves to an uploads playlist of `videos` videos,
+    each with `comments` comment threads. `page_size` caps maxResults like
+    the real API's limit of 50, and `latency` seconds are added to every
+    response.
+    """
+    
+    def __init__(self, videos=1000, latency=0.0, page_size=MAX_PAGE_SIZE, seed=0, comments=0, comments_for=None):
+        self.videos = videos
+        self.comments = comments
+        self.comments_for = comments_for
+        self.latency = latency
+        self.page_size = page_size
+        self.seed = seed
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+    
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+    
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAPIHandler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def transport(self, **kwargs):
+        """An HTTPTransport that sends API requests to this server."""
+        return FakeAPITransport(self.url, **kwargs)
+    
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+    
+    def handle_channels(self, params):
+        return {"items": [
+            {"id": channel_id, "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}}}
+            for channel_id in params.get("id", "").split(",") if channel_id
+        ]}
+    
+    def handle_playlistItems(self, params):
+        start = int(params.get("pageToken", 0))
+        end = min(start + min(int(params.get("maxResults", 5)), self.page_size), self.videos)
+        body = {
+            "items": [
+                {
+                    "kind": "youtube#playlistItem",
+                    "id": f"PLI{i}",
+                    "snippet": {
+                        "title": f"Synthetic Upload #{i}",
+                        "description": "Generated by the benchmark stand-in.",
+                        "thumbnails": thumbnails(video_id(i)),
+                        "position": i,
+                        "resourceId": {"kind": "youtube#video", "videoId": video_id(i)}
+                    }
+                }
+                for i in range(start, end)
+            ],
+            "pageInfo": {"totalResults": self.videos, "resultsPerPage": self.page_size}
+        }
+        if end < self.videos:
+            body["nextPageToken"] = str(end)
+        return body
+    
+    def handle_videos(self, params):
+        indexes = [video_index(v) for v in params.get("id", "").split(",") if v]
+        parts = set(params.get("part", "").split(","))
+        return {"items": [
+            {name: value for name, value in video_item(i, self.seed).items()
+             if name in ("kind", "etag", "id") or name in parts}
+            for i in indexes[:self.page_size] if i < self.videos
+        ]}
+    
+    
+    def handle_commentThreads(self, params):
+        """
+        `comments` threads per video (`comments_for(video_id)` if set),
+        newest first, from a few hundred distinct commenters.
+        """
+        count = self.comments_for(params["videoId"]) if self.comments_for else self.comments
+        start = int(params.get("pageToken", 0))
+        end = min(start + min(int(params.get("maxResults", 20)), 100), count)
+        body = {"items": [comment_thread(params["videoId"], i, self.seed) for i in range(start, end)]}
+        if end < count:
+            body["nextPageToken"] = str(end)
+        return body
+
+
+def comment_thread(video_id, index, seed=0):
+    """A `commentThreads` item: the `index`-th newest top-level comment on a video."""
+    h = mix(index, seed)
+    published = datetime.fromtimestamp(NEWEST_TS - index * 60, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "kind": "youtube#commentThread",
+        "id": f"{video_id}-c{index}",
+        "snippet": {
+            "videoId": video_id,
+            "topLevelComment": {
+                "kind": "youtube#comment",
+                "id": f"{video_id}-c{index}",
+                "snippet": {
+                    "authorDisplayName": f"@viewer{h % 500}",
+                    "authorChannelId": {"value": f"UCviewer{h % 500}"},
+                    "textDisplay": "Synthetic comment text for the benchmark stand-in.",
+                    "textOriginal": "Synthetic comment text for the benchmark stand-in.",
+                    "likeCount": h % 50,
+                    "publishedAt": published,
+                    "updatedAt": published
+                }
+            },
+            "canReply": True,
+            "totalReplyCount": h >> 8 & 0x7,
+            "isPublic": True
+        }
+    }
+
+
+class FakeAPITransport(HTTPTransport):
+    """HTTPTransport that rewrites YouTube API URLs to a local base URL."""
+    
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+    
+    def fetch(self, url, params=None, headers=None):
+        return super().fetch(url.replace(BASE_URL, self.base_url, 1), params=params, headers=headers)
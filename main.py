@@ -4,61 +4,434 @@ Video Performance Analyzer - QforMedia Internal Tool
 
 Analyzes the latest 5 videos from Quantum Tech HD channel
 and provides performance metrics and comparisons.
+
+Pass channel IDs (or --channels-file) to analyze a whole portfolio of
+channels in parallel, with a cross-channel rollup at the end.
 """
 
+import argparse
+import contextlib
+import os
 import sys
-from src.analyzer import VideoAnalyzer
-from src.formatters import format_video_report, format_comparison_table, format_video_list
+from src import config
+from src.config import DEFAULT_MAX_CONCURRENCY, DEFAULT_RESULT_TTL, DEFAULT_MAX_AGE, DEFAULT_UPLOAD_INTERVAL
+from src.aggregate import VideoAggregate, merge_comparison_data
+from src.metrics import analyze_video
+from src.snapshots import SnapshotStore
+from src.scheduler import RequestScheduler, QuotaExceededError, DEFAULT_DAILY_QUOTA, DEFAULT_RATE
+from src.formatters import format_video_report, format_comparison_table, format_video_list, format_profile
+from src.exporters import EXPORTERS
+from src.telemetry import TELEMETRY, serve_prometheus
+# The API client stack (src.analyzer, src.youtube_client, src.cache, src.watch)
+# is imported by the online branches only, so --offline and --help never load it
+
+DEFAULT_CACHE_DIR = ".cache/youtube"
+
+# Replayed requests never reach the API, so any key will do
+REPLAY_API_KEY = "replay"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="QforMedia Video Performance Analyzer")
+    parser.add_argument("channels", nargs="*",
+                        help="Channel IDs to analyze (default: Quantum Tech HD)")
+    parser.add_argument("-f", "--channels-file",
+                        help="File with one channel ID per line ('#' starts a comment)")
+    parser.add_argument("-n", "--count", type=int, default=5,
+                        help="Number of latest videos per channel (default: 5)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"Concurrent API requests in portfolio mode (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for cached API responses (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always fetch fresh data from the API")
+    parser.add_argument("--snapshot-db",
+                        help="SQLite file recording statistics history; enables delta refresh")
+    parser.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE,
+                        help=f"Seconds before stored statistics are refreshed (default: {DEFAULT_MAX_AGE})")
+    parser.add_argument("--daily-quota", type=int, default=DEFAULT_DAILY_QUOTA,
+                        help=f"Daily quota units per API key (default: {DEFAULT_DAILY_QUOTA})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"Quota units per second per API key (default: {DEFAULT_RATE:g})")
+    parser.add_argument("--format", choices=["text", *EXPORTERS], default="text",
+                        help="Output format; jsonl, csv and parquet stream one row per video (default: text)")
+    parser.add_argument("-o", "--output",
+                        help="File to write exported rows to (default: stdout)")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="CASSETTE",
+                          help="Record API traffic to a cassette file (.jsonl or .jsonl.gz)")
+    cassette.add_argument("--replay", metavar="CASSETTE",
+                          help="Replay API traffic from a cassette instead of the network")
+    parser.add_argument("--replay-realtime", action="store_true",
+                        help="Wait each replayed response's recorded latency")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print request, cache and per-stage timing statistics at the end")
+    parser.add_argument("--metrics-file",
+                        help="Write metrics in Prometheus text format to this file at the end")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running, re-polling videos on an age- and velocity-based schedule "
+                             "and reporting each new or changed video")
+    parser.add_argument("--upload-interval", type=int, default=DEFAULT_UPLOAD_INTERVAL,
+                        help=f"Seconds between new-upload checks in watch mode (default: {DEFAULT_UPLOAD_INTERVAL})")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="Serve analyses as JSON over HTTP on 127.0.0.1:PORT until interrupted")
+    parser.add_argument("--result-ttl", type=int, default=DEFAULT_RESULT_TTL,
+                        help=f"Seconds the service reuses a channel's results (default: {DEFAULT_RESULT_TTL})")
+    parser.add_argument("--offline", action="store_true",
+                        help="Render the report from --snapshot-db only, without the network or an API key")
+    args = parser.parse_args(argv)
+    if args.offline:
+        if not args.snapshot_db:
+            parser.error("--offline requires --snapshot-db")
+        if args.watch or args.serve or args.record or args.replay or args.format != "text":
+            parser.error("--offline only renders the text report")
+    if args.format != "text" and EXPORTERS[args.format][1]:
+        if args.watch:
+            parser.error(f"--format {args.format} cannot be streamed; use jsonl or csv with --watch")
+        if not args.output:
+            parser.error(f"--format {args.format} requires --output")
+    return args
+
+
+def read_channel_file(path):
+    """Read channel IDs from a file, skipping blank lines and comments."""
+    channel_ids = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                channel_ids.append(line)
+    return channel_ids
+
+
+def collect_channel_ids(args):
+    """Combine channel IDs from the command line and file, dropping duplicates."""
+    channel_ids = list(args.channels)
+    if args.channels_file:
+        channel_ids.extend(read_channel_file(args.channels_file))
+    return list(dict.fromkeys(channel_ids))
+
+
+def run_single_channel(analyzer, channel_id, count, max_age):
+    # Fetch latest videos
+    print(f"📡 Fetching latest {count} videos...")
+    if analyzer.store is not None:
+        analyzer.refresh_latest_videos(count=count, channel_id=channel_id, max_age=max_age)
+    else:
+        analyzer.fetch_latest_videos(count=count, channel_id=channel_id)
+    print(f"   Found {len(analyzer.videos)} videos")
+    print()
+    
+    # Analyze videos
+    print("📊 Analyzing performance metrics...")
+    results = analyzer.analyze_videos()
+    print()
+    
+    print_channel_report(results, analyzer.get_comparison_data(results), analyzer.get_top_performer(results))
+
+
+def print_channel_report(results, comparison, top):
+    # Display individual video reports
+    print("📹 VIDEO DETAILS")
+    print("-" * 60)
+    for video in results:
+        print(format_video_report(video))
+    
+    # Display comparison summary
+    print(format_comparison_table(comparison))
+    
+    # Show top performer
+    if top:
+        print()
+        print("🏆 TOP PERFORMER DETAILS:")
+        print(format_video_report(top))
+
+
+def run_offline(store, channel_ids, count):
+    """
+    Render reports from the snapshot store alone: no API key, no network
+    modules imported. Returns whether every channel had stored videos.
+    """
+    print(f"🗄️  Reading the latest {count} stored videos per channel from {store.path}...")
+    print()
+    comparisons = []
+    missing = []
+    for channel_id in channel_ids:
+        videos = store.get_videos(store.latest_video_ids(channel_id, count))
+        if not videos:
+            missing.append(channel_id)
+            continue
+        results = [analyze_video(v, store.views_per_day(v["id"])) for v in videos]
+        aggregate = VideoAggregate.from_results(results)
+        comparison = aggregate.to_comparison()
+        comparisons.append(comparison)
+        
+        if len(channel_ids) == 1:
+            print_channel_report(results, comparison, aggregate.best("views"))
+        else:
+            print(f"📺 CHANNEL {channel_id}")
+            print("-" * 60)
+            print(format_video_list(results))
+            print(format_comparison_table(comparison))
+            print()
+    
+    if len(channel_ids) > 1 and comparisons:
+        print(format_comparison_table(merge_comparison_data(comparisons),
+                                      title=f"PORTFOLIO SUMMARY ({len(comparisons)} CHANNELS)"))
+    if missing:
+        print(f"⚠️  No stored videos for {len(missing)} channel(s): {', '.join(missing)}")
+    return not missing
+
+
+def run_portfolio(analyzer, channel_ids, count, workers):
+    print(f"📡 Fetching latest {count} videos from {len(channel_ids)} channels "
+          f"({workers} concurrent requests)...")
+    channel_results = analyzer.analyze_channels(
+        channel_ids, count=count, max_concurrency=workers, return_exceptions=True
+    )
+    print()
+    
+    comparisons = []
+    failed = []
+    for channel_id, results in channel_results.items():
+        print(f"📺 CHANNEL {channel_id}")
+        print("-" * 60)
+        if isinstance(results, Exception):
+            print(f"❌ Error: {results}")
+            print()
+            failed.append(channel_id)
+            continue
+        
+        print(format_video_list(results))
+        comparison = analyzer.get_comparison_data(results)
+        if comparison:
+            print(format_comparison_table(comparison))
+            comparisons.append(comparison)
+        print()
+    
+    rollup = merge_comparison_data(comparisons)
+    if rollup:
+        print(format_comparison_table(rollup, title=f"PORTFOLIO SUMMARY ({len(comparisons)} CHANNELS)"))
+    if failed:
+        print(f"⚠️  {len(failed)} channel(s) failed: {', '.join(failed)}")
+    return not failed
+
+
+def iter_export_rows(analyzer, channel_ids, count, workers, failed):
+    """
+    Yield analysis rows tagged with their channel ID. A single channel is
+    streamed video by video; failed portfolio channels are appended to `failed`.
+    """
+    if len(channel_ids) > 1:
+        channel_results = analyzer.analyze_channels(
+            channel_ids, count=count, max_concurrency=workers, return_exceptions=True
+        )
+        for channel_id, results in channel_results.items():
+            if isinstance(results, Exception):
+                print(f"❌ {channel_id}: {results}")
+                failed.append(channel_id)
+                continue
+            for row in results:
+                yield dict(row, channel_id=channel_id)
+        return
+    
+    channel_id = channel_ids[0] if channel_ids else config.channel_id()
+    videos = analyzer.stream_channel_videos(channel_id, limit=count)
+    for row in analyzer.iter_analysis(videos):
+        yield dict(row, channel_id=channel_id)
+
+
+def run_export(analyzer, channel_ids, args, stdout):
+    """Stream rows in `args.format` to `args.output` (or `stdout`); return whether every channel succeeded."""
+    exporter, binary = EXPORTERS[args.format]
+    failed = []
+    rows = iter_export_rows(analyzer, channel_ids, args.count, args.workers, failed)
+    
+    print(f"📤 Exporting {args.format} to {args.output or 'stdout'}...")
+    if not args.output:
+        written = exporter(rows, stdout)
+        stdout.flush()
+    elif binary:
+        with open(args.output, "wb") as out:
+            written = exporter(rows, out)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            written = exporter(rows, out)
+    print(f"   Wrote {written} rows")
+    
+    if failed:
+        print(f"⚠️  {len(failed)} channel(s) failed: {', '.join(failed)}")
+    return not failed
+
 
+def flushing(rows, out):
+    """Pass rows through, flushing `out` once each one has been written."""
+    for row in rows:
+        yield row
+        out.flush()
 
-def main():
+
+def run_watch(analyzer, channel_ids, args, stdout=None, max_polls=None):
+    """
+    Report new and changed videos until interrupted (or `max_polls` passes).
+    Text goes to the console; jsonl/csv rows are flushed as they arrive.
+    """
+    from src.watch import ChannelWatcher
+    
+    watcher = ChannelWatcher(analyzer, channel_ids or [config.channel_id()], count=args.count,
+                             upload_interval=args.upload_interval)
+    print(f"👀 Watching {len(watcher.channel_ids)} channel(s), latest {args.count} videos each "
+          "(Ctrl+C to stop)...")
+    print()
+    updates = watcher.run(max_polls)
+    try:
+        if args.format == "text":
+            for channel_id, analysis in updates:
+                print(f"🔄 {channel_id}")
+                print(format_video_report(analysis))
+                sys.stdout.flush()
+        elif args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as out:
+                EXPORTERS[args.format][0](flushing((row for _, row in updates), out), out)
+        else:
+            EXPORTERS[args.format][0](flushing((row for _, row in updates), stdout), stdout)
+    except KeyboardInterrupt:
+        print()
+    print(f"👋 Stopped watching after {watcher.polls} polls")
+    return True
+
+
+def run_service(analyzer, args):
+    """Serve the JSON analysis API until interrupted."""
+    import asyncio
+    from src.service import AnalysisService
+    
+    service = AnalysisService(analyzer, ttl=args.result_ttl)
+    print(f"🌐 Serving analyses on http://127.0.0.1:{args.serve}/channels/<id>/videos (Ctrl+C to stop)...")
+    try:
+        asyncio.run(service.serve_forever(port=args.serve))
+    except KeyboardInterrupt:
+        print()
+    stats = service.results.stats
+    print(f"👋 Stopped serving: {stats['misses']} upstream fetches, {stats['hits']} cached "
+          f"and {stats['merged']} merged requests")
+    return True
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.format == "text":
+        run(args)
+    else:
+        # Exported rows own stdout; progress and summaries move to stderr
+        stdout = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            run(args, stdout)
+
+
+def run(args, stdout=None):
+    channel_ids = collect_channel_ids(args)
+    
     print("=" * 60)
     print("🎬 QforMedia Video Performance Analyzer")
-    print("   Analyzing Quantum Tech HD Channel")
+    if len(channel_ids) > 1:
+        print(f"   Portfolio mode: {len(channel_ids)} channels")
+    elif channel_ids:
+        print(f"   Analyzing channel {channel_ids[0]}")
+    else:
+        print("   Analyzing Quantum Tech HD Channel")
     print("=" * 60)
     print()
     
+    if args.offline:
+        with SnapshotStore(args.snapshot_db) as store:
+            ok = run_offline(store, channel_ids or [config.channel_id()], args.count)
+        if not ok:
+            sys.exit(1)
+        return
+    
+    from src.analyzer import VideoAnalyzer
+    from src.cache import ResponseCache, DiskCache, UploadsPlaylistCache
+    
+    transport = None
+    metrics_server = None
+    if args.profile or args.metrics_file or args.metrics_port:
+        TELEMETRY.enable()
+    if args.metrics_port:
+        metrics_server = serve_prometheus(args.metrics_port)
     try:
         # Initialize analyzer
-        analyzer = VideoAnalyzer()
+        # Cassette runs bypass the caches so every request is recorded or replayed
+        if args.no_cache or args.record or args.replay:
+            cache, playlist_cache = None, None
+        else:
+            cache = ResponseCache(DiskCache(os.path.join(args.cache_dir, "responses")))
+            playlist_cache = UploadsPlaylistCache(os.path.join(args.cache_dir, "uploads_playlists.json"))
+        store = SnapshotStore(args.snapshot_db) if args.snapshot_db else None
+        scheduler = RequestScheduler(rate=args.rate, daily_quota=args.daily_quota)
+        if args.record:
+            from src.cassette import RecordingTransport
+            transport = RecordingTransport(args.record)
+        elif args.replay:
+            from src.cassette import ReplayTransport
+            transport = ReplayTransport(args.replay, realtime=args.replay_realtime)
+        analyzer = VideoAnalyzer(REPLAY_API_KEY if args.replay else None, transport=transport, cache=cache,
+                                 playlist_cache=playlist_cache, store=store, scheduler=scheduler)
         
-        # Fetch latest 5 videos
-        print("📡 Fetching latest 5 videos...")
-        analyzer.fetch_latest_videos(count=5)
-        print(f"   Found {len(analyzer.videos)} videos")
-        print()
+        if args.serve:
+            ok = run_service(analyzer, args)
+        elif args.watch:
+            ok = run_watch(analyzer, channel_ids, args, stdout)
+        elif args.format != "text":
+            ok = run_export(analyzer, channel_ids, args, stdout)
+        elif len(channel_ids) > 1:
+            ok = run_portfolio(analyzer, channel_ids, args.count, args.workers)
+        else:
+            run_single_channel(analyzer, channel_ids[0] if channel_ids else None, args.count, args.max_age)
+            ok = True
         
-        # Analyze videos
-        print("📊 Analyzing performance metrics...")
-        results = analyzer.analyze_videos()
         print()
-        
-        # Display individual video reports
-        print("📹 VIDEO DETAILS")
-        print("-" * 60)
-        for video in results:
-            print(format_video_report(video))
-        
-        # Display comparison summary
-        comparison = analyzer.get_comparison_data(results)
-        print(format_comparison_table(comparison))
-        
-        # Show top performer
-        top = analyzer.get_top_performer(results)
-        if top:
+        if cache is not None:
+            stats = cache.stats
+            print(f"🗄️  Cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_ratio']:.0%} hit ratio)")
+        for key, usage in analyzer.client.keys.usage(scheduler).items():
+            status = "" if usage["active"] else f" (out of rotation: {usage['disabled_reason']})"
+            print(f"🎫 Quota {key}: {usage['used']} units used, {usage['remaining']} remaining today{status}")
+        if args.record:
+            print(f"⏺️  Recorded {transport.recorded} responses to {args.record}")
+        elif args.replay:
+            print(f"⏯️  Replayed {transport.requests} responses "
+                  f"({transport.wait_seconds:.2f}s simulated network wait)")
+        if args.profile:
             print()
-            print("🏆 TOP PERFORMER DETAILS:")
-            print(format_video_report(top))
+            print(format_profile(TELEMETRY))
         
+        if not ok:
+            sys.exit(1)
+    
+    except QuotaExceededError as e:
+        print(f"❌ Quota Error: {e}")
+        print("   Try again after the daily quota resets (midnight Pacific time)")
+        sys.exit(1)
     except ValueError as e:
         print(f"❌ Configuration Error: {e}")
-        print("   Make sure YOUTUBE_API_KEY is set in your .env file")
+        print("   Make sure YOUTUBE_API_KEY (or YOUTUBE_API_KEYS) is set in your .env file")
         sys.exit(1)
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        # Closing finishes the cassette file (a gzip cassette is unreadable until then)
+        if transport is not None:
+            transport.close()
+        if args.metrics_file:
+            TELEMETRY.write_prometheus(args.metrics_file)
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
 
 if __name__ == "__main__":
     main()
-
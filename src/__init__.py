@@ -1,8 +1,50 @@
 # Video Performance Analyzer
 # Internal tool for QforMedia
+#
+# Submodules are imported on first attribute access, so `import src.metrics`
+# or `from src import format_video_report` never loads the HTTP stack.
 
-from .youtube_client import YouTubeClient
-from .analyzer import VideoAnalyzer
-from .metrics import calculate_engagement_rate, calculate_growth_score
-from .formatters import format_video_report, format_comparison_table
+import importlib
 
+_EXPORTS = {
+    "HTTPTransport": "transport",
+    "ResponseCache": "cache",
+    "MemoryCache": "cache",
+    "DiskCache": "cache",
+    "PartCache": "cache",
+    "FieldMask": "fields",
+    "RequestScheduler": "scheduler",
+    "QuotaExceededError": "scheduler",
+    "APIKeyPool": "keys",
+    "YouTubeClient": "youtube_client",
+    "APIError": "youtube_client",
+    "ChannelNotFoundError": "youtube_client",
+    "AsyncYouTubeClient": "async_client",
+    "VideoAnalyzer": "analyzer",
+    "VideoFrame": "frame",
+    "VideoAggregate": "aggregate",
+    "RankIndex": "ranking",
+    "VideoIndex": "query",
+    "SnapshotStore": "snapshots",
+    "StatsArchive": "archive",
+    "calculate_engagement_rate": "metrics",
+    "calculate_growth_score": "metrics",
+    "CommentStats": "metrics",
+    "format_video_report": "formatters",
+    "format_comparison_table": "formatters",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,146 @@
+"""
+Single-pass, mergeable aggregation over analysis results.
+"""
+
+import heapq
+
+NUMERIC_FIELDS = ("views", "likes", "comments", "engagement_rate", "growth_score", "days_old")
+DEFAULT_TOP_METRICS = ("views", "engagement_rate")
+
+
+def merge_comparison_data(comparisons):
+    """
+    Roll several get_comparison_data() aggregates up into one.
+    
+    Totals are summed and averages re-weighted by each part's video count,
+    so the result matches what a single comparison over every video would give.
+    """
+    comparisons = [c for c in comparisons if c]
+    if not comparisons:
+        return {}
+    
+    total_videos = sum(c["total_videos"] for c in comparisons)
+    total_views = sum(c["total_views"] for c in comparisons)
+    total_likes = sum(c["total_likes"] for c in comparisons)
+    total_comments = sum(c["total_comments"] for c in comparisons)
+    weighted_engagement = sum(c["average_engagement"] * c["total_videos"] for c in comparisons)
+    
+    top_performers = [c["top_performer"] for c in comparisons if c.get("top_performer")]
+    best_engagements = [c["best_engagement"] for c in comparisons if c.get("best_engagement")]
+    
+    return {
+        "total_videos": total_videos,
+        "total_views": total_views,
+        "total_likes": total_likes,
+        "total_comments": total_comments,
+        "average_views": total_views / total_videos,
+        "average_likes": total_likes / total_videos,
+        "average_engagement": weighted_engagement / total_videos,
+        "top_performer": max(top_performers, key=lambda v: int(v["views"]), default=None),
+        "best_engagement": max(best_engagements, key=lambda v: v["engagement_rate"], default=None)
+    }
+
+
+class VideoAggregate:
+    """
+    Running totals, min/max and top-K over analyze_video() results.
+    
+    Consumes any iterable once, holding only O(k) records per tracked
+    metric, so a streamed full-channel crawl can be compared in constant
+    memory. Aggregates built on separate shards or channels combine with
+    merge() into the same result a single pass over everything would give.
+    Ties in top-K go to the video seen first.
+    """
+    
+    def __init__(self, top_k=1, top_metrics=DEFAULT_TOP_METRICS):
+        self.top_k = top_k
+        self.count = 0
+        self.sums = dict.fromkeys(NUMERIC_FIELDS, 0)
+        self.mins = {}
+        self.maxes = {}
+        # Min-heaps of (value, -sequence, record); the root is the weakest kept entry
+        self._heaps = {metric: [] for metric in top_metrics}
+    
+    @classmethod
+    def from_results(cls, results, **kwargs):
+        aggregate = cls(**kwargs)
+        aggregate.update(results)
+        return aggregate
+    
+    def add(self, result):
+        """Fold one analysis result into the aggregate."""
+        sequence = self.count
+        self.count += 1
+        
+        for field in NUMERIC_FIELDS:
+            value = result[field]
+            self.sums[field] += value
+            if field not in self.mins or value < self.mins[field]:
+                self.mins[field] = value
+            if field not in self.maxes or value > self.maxes[field]:
+                self.maxes[field] = value
+        
+        for metric, heap in self._heaps.items():
+            self._push(heap, (result[metric], -sequence, result))
+    
+    def update(self, results):
+        for result in results:
+            self.add(result)
+        return self
+    
+    def _push(self, heap, entry):
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    
+    def merge(self, other):
+        """Fold another aggregate in, as if its videos came after this one's."""
+        offset = self.count
+        self.count += other.count
+        
+        for field in NUMERIC_FIELDS:
+            self.sums[field] += other.sums[field]
+        for field, value in other.mins.items():
+            if field not in self.mins or value < self.mins[field]:
+                self.mins[field] = value
+        for field, value in other.maxes.items():
+            if field not in self.maxes or value > self.maxes[field]:
+                self.maxes[field] = value
+        
+        for metric, heap in self._heaps.items():
+            for value, negative_sequence, result in other._heaps.get(metric, []):
+                self._push(heap, (value, negative_sequence - offset, result))
+        return self
+    
+    def mean(self, field):
+        return self.sums[field] / self.count if self.count else 0
+    
+    def top(self, metric, k=None):
+        """The best `k` results on `metric`, highest first."""
+        if metric not in self._heaps:
+            raise KeyError(f"Top-K is not tracked for {metric!r}")
+        ranked = sorted(self._heaps[metric], key=lambda entry: entry[:2], reverse=True)
+        return [result for _, _, result in ranked[:k]]
+    
+    def best(self, metric):
+        """The single best result on `metric`, or None if nothing was added."""
+        top = self.top(metric, 1)
+        return top[0] if top else None
+    
+    def to_comparison(self):
+        """The get_comparison_data() dict for everything aggregated so far."""
+        if not self.count:
+            return {}
+        
+        return {
+            "total_videos": self.count,
+            "total_views": self.sums["views"],
+            "total_likes": self.sums["likes"],
+            "total_comments": self.sums["comments"],
+            "average_views": self.mean("views"),
+            "average_likes": self.mean("likes"),
+            "average_engagement": self.mean("engagement_rate"),
+            "top_performer": self.best("views"),
+            "best_engagement": self.best("engagement_rate")
+        }
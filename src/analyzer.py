@@ -2,127 +2,320 @@
 Video Analyzer - Core analysis logic for YouTube video performance.
 """
 
-from datetime import datetime, timedelta
+import sys
 from .youtube_client import YouTubeClient
-from .metrics import calculate_engagement_rate, calculate_growth_score
+from .config import DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_AGE
+from .cache import PartCache
+from .fields import ANALYSIS_FIELDS, STATISTICS_FIELDS
+from .aggregate import VideoAggregate, merge_comparison_data
+from .video import Video, as_video
+from .metrics import analyze_video, CommentStats
+from .telemetry import TELEMETRY
+
+# merge_comparison_data is re-exported from its old home here
+__all__ = ["VideoAnalyzer", "analyze_video", "merge_comparison_data"]
+
+
+def _is_loaded_instance(obj, module, name):
+    """
+    isinstance(obj, <module>.<name>) without importing `module`: nothing is
+    an instance of a class whose module was never loaded, and the frame and
+    query modules would pull in NumPy.
+    """
+    loaded = sys.modules.get(f"{__package__}.{module}")
+    return loaded is not None and isinstance(obj, getattr(loaded, name))
 
 
 class VideoAnalyzer:
-    def __init__(self, api_key=None):
-        self.client = YouTubeClient(api_key)
+    def __init__(self, api_key=None, transport=None, cache=None, playlist_cache=None, store=None,
+                 keep_raw=False, scheduler=None, fields=None, part_cache=None):
+        # Shared by the sync and async clients, so either skips parts the other fetched
+        self.part_cache = part_cache if part_cache is not None else PartCache()
+        self.client = YouTubeClient(api_key, transport=transport, cache=cache, playlist_cache=playlist_cache,
+                                    scheduler=scheduler, part_cache=self.part_cache)
+        self.cache = cache
+        self.playlist_cache = playlist_cache
+        self.scheduler = scheduler
+        self.store = store
+        self.keep_raw = keep_raw
+        # Video fields to request: only what analysis reads, unless whole
+        # payloads are being kept (or a FieldMask such as SEARCH_FIELDS is given)
+        self.fields = fields if fields is not None else (None if keep_raw else ANALYSIS_FIELDS)
         self.videos = []
     
-    def fetch_latest_videos(self, count=5):
+    def _ingest(self, items):
+        """Parse API items into Video records, keeping payloads only if asked to."""
+        return (Video.from_api(d, keep_raw=self.keep_raw) for d in items)
+    
+    @TELEMETRY.timed("fetch_latest_videos")
+    def fetch_latest_videos(self, count=5, channel_id=None):
         """Fetch the latest videos from the channel."""
-        self.videos = self.client.get_channel_videos(max_results=count)
+        self.videos = list(self._ingest(self.client.iter_channel_videos(channel_id, limit=count, fields=self.fields)))
         return self.videos
     
-    def analyze_videos(self):
+    @TELEMETRY.timed("refresh_latest_videos")
+    def refresh_latest_videos(self, count=5, channel_id=None, max_age=DEFAULT_MAX_AGE):
+        """
+        Fetch the latest videos through the snapshot store.
+        
+        Videos seen for the first time get full details. Known videos only
+        re-request `statistics`, and only once their latest snapshot is
+        older than `max_age` seconds; their snippets are never refetched.
+        """
+        if self.store is None:
+            raise ValueError("A snapshot store is required to refresh videos")
+        
+        uploads_playlist_id = self.client.get_uploads_playlist_id(channel_id)
+        video_ids = list(self.client.iter_playlist_video_ids(uploads_playlist_id, limit=count))
+        
+        known = self.store.known_video_ids(video_ids)
+        new_ids = [video_id for video_id in video_ids if video_id not in known]
+        stale_ids = self.store.stale_video_ids([v for v in video_ids if v in known], max_age)
+        
+        if new_ids:
+            self.store.record(self.client.iter_video_details(new_ids, fields=self.fields))
+        if stale_ids:
+            self.store.record(self.client.iter_video_details(stale_ids, fields=STATISTICS_FIELDS))
+        
+        self.videos = list(self._ingest(self.store.get_videos(video_ids)))
+        return self.videos
+    
+    async def analyze_channels_async(self, channel_ids, count=5, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                                     return_exceptions=False):
+        """Fetch and analyze the latest videos of many channels concurrently."""
+        # The asyncio stack is only imported by callers that go concurrent
+        from .async_client import AsyncYouTubeClient
+        
+        async with AsyncYouTubeClient(self.client.keys, transport=self.client.transport,
+                                      max_concurrency=max_concurrency, cache=self.cache,
+                                      playlist_cache=self.playlist_cache, scheduler=self.scheduler,
+                                      part_cache=self.part_cache) as client:
+            channel_videos = await client.get_many_channel_videos(
+                channel_ids, max_results=count, return_exceptions=return_exceptions, fields=self.fields
+            )
+        
+        if self.store is not None:
+            self.store.record(
+                video for videos in channel_videos.values()
+                if not isinstance(videos, Exception) for video in videos
+            )
+        
+        return {
+            channel_id: videos if isinstance(videos, Exception) else self.analyze_videos(videos)
+            for channel_id, videos in channel_videos.items()
+        }
+    
+    @TELEMETRY.timed("analyze_channels")
+    def analyze_channels(self, channel_ids, count=5, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                         return_exceptions=False):
+        """
+        Analyze the latest `count` videos of every channel, keyed by channel ID.
+        
+        Channels are fetched concurrently, so wall-clock time tracks the
+        slowest channel rather than the sum of all of them. With
+        `return_exceptions`, a failed channel maps to its exception.
+        """
+        import asyncio
+        
+        return asyncio.run(self.analyze_channels_async(
+            channel_ids, count=count, max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions
+        ))
+    
+    async def analyze_comments_async(self, video_ids, limit=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                                     now=None):
+        """Stream many videos' comment threads concurrently into per-video CommentStats."""
+        from .async_client import AsyncYouTubeClient
+        
+        video_ids = list(dict.fromkeys(video_ids))
+        stats = {video_id: CommentStats() for video_id in video_ids}
+        async with AsyncYouTubeClient(self.client.keys, transport=self.client.transport,
+                                      max_concurrency=max_concurrency, cache=self.cache,
+                                      playlist_cache=self.playlist_cache, scheduler=self.scheduler,
+                                      part_cache=self.part_cache) as client:
+            async for video_id, threads in client.stream_comment_threads(video_ids, limit=limit):
+                stats[video_id].update(threads)
+                TELEMETRY.count("comment_threads_total", len(threads))
+        
+        return {video_id: s.to_metrics(now) for video_id, s in stats.items()}
+    
+    @TELEMETRY.timed("analyze_comments")
+    def analyze_comments(self, video_ids=None, limit=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, now=None):
+        """
+        Conversation metrics for each video (default: the fetched videos),
+        keyed by video ID: comment velocity, reply depth and top-commenter
+        concentration, from up to `limit` of its newest comment threads.
+        
+        Threads are streamed page by page and folded into running totals,
+        so videos with hundreds of thousands of comments are never held
+        in memory.
+        """
+        if video_ids is None:
+            if not self.videos:
+                self.fetch_latest_videos()
+            video_ids = [video.video_id for video in self.videos]
+        
+        import asyncio
+        
+        return asyncio.run(self.analyze_comments_async(
+            video_ids, limit=limit, max_concurrency=max_concurrency, now=now
+        ))
+    
+    def stream_channel_videos(self, channel_id=None, limit=None):
+        """Stream a channel's whole back catalogue (or `limit` videos) as a generator of Videos."""
+        return self._ingest(self.client.iter_channel_videos(channel_id, limit=limit, fields=self.fields))
+    
+    def iter_analysis(self, videos=None):
+        """Yield performance data for each video as it is consumed."""
+        if videos is None:
+            if not self.videos:
+                self.fetch_latest_videos()
+            videos = self.videos
+        
+        for d in videos:
+            video = as_video(d)
+            views_per_day = self.store.views_per_day(video.video_id) if self.store is not None else None
+            TELEMETRY.count("videos_analyzed_total")
+            yield analyze_video(video, views_per_day)
+    
+    @TELEMETRY.timed("analyze_videos")
+    def analyze_videos(self, videos=None):
         """Analyze all fetched videos and return performance data."""
-        if not self.videos:
-            self.fetch_latest_videos()
+        return list(self.iter_analysis(videos))
+    
+    @TELEMETRY.timed("analyze_frame")
+    def analyze_frame(self, videos=None, now=None):
+        """Analyze videos into a columnar VideoFrame, computing metrics vectorized."""
+        if videos is None:
+            if not self.videos:
+                self.fetch_latest_videos()
+            videos = self.videos
         
-        results = []
+        from .frame import VideoFrame
         
-        for i in range(4):
-            if i >= len(self.videos):
-                break
-                
-            d = self.videos[i]
-            
-            tmp = d.get("statistics", {})
-            views = tmp.get("viewCount", "0")
-            likes = tmp.get("likeCount", "0")
-            comments = tmp.get("commentCount", "0")
-            
-            snippet = d.get("snippet", {})
-            title = snippet.get("title", "Unknown")
-            published = snippet.get("publishedAt", "")
-            
-            # Calculate engagement
-            engagement = calculate_engagement_rate(int(likes), int(views))
-            
-            # Calculate days since published
-            if published:
-                pub_date = datetime.fromisoformat(published.replace("Z", "+00:00"))
-                days_old = (datetime.now(pub_date.tzinfo) - pub_date).days
-            else:
-                days_old = 0
-            
-            growth = calculate_growth_score(int(views), days_old)
-            
-            results.append({
-                "title": title,
-                "video_id": d.get("id"),
-                "views": views,
-                "likes": likes,
-                "comments": comments,
-                "engagement_rate": engagement,
-                "growth_score": growth,
-                "days_old": days_old,
-                "published_at": published
-            })
-        
-        return results
+        return VideoFrame.from_videos(videos, now=now)
+    
+    @TELEMETRY.timed("index_videos")
+    def index_videos(self, videos=None, now=None):
+        """
+        Build a VideoIndex over videos for repeated range and text queries.
+        
+        Tags and descriptions are searchable only for videos fetched with
+        `keep_raw`; otherwise queries match titles.
+        """
+        if videos is None:
+            if not self.videos:
+                self.fetch_latest_videos()
+            videos = self.videos
+        
+        from .query import VideoIndex
+        
+        return VideoIndex.from_videos(videos, now=now)
+    
+    @TELEMETRY.timed("search_videos")
+    def search_videos(self, index, text=None, **predicates):
+        """
+        Videos in a VideoIndex matching a title/tag `text` query and
+        VideoIndex.search() ranges, as a VideoFrame.
+        """
+        return index.select(text, **predicates)
+    
+    @TELEMETRY.timed("rescore_frame")
+    def rescore_frame(self, frame, workers=None, now=None):
+        """
+        Recompute a frame's days_old, engagement and growth columns on a
+        process pool, e.g. over a historical archive after a metric change,
+        and return its get_comparison_data().
+        
+        Rows are split into one shard per worker (default: every core) and
+        the per-shard aggregates merged. Frames from analyze_archive(...,
+        shared=True) are handed to the workers without copying.
+        """
+        from .parallel import score_frame
+        
+        return score_frame(frame, workers=workers, now=now).to_comparison(frame)
     
+    @TELEMETRY.timed("analyze_archive")
+    def analyze_archive(self, archive, start=None, end=None, now=None, shared=False):
+        """
+        Analyze a StatsArchive's latest snapshot of each video taken in
+        [start, end) into a VideoFrame, scoring growth on the views per day
+        measured across that range rather than over each video's life.
+        Pass `shared` to build it in shared memory for rescore_frame().
+        """
+        return archive.to_frame(start, end, now=now, shared=shared)
+    
+    @TELEMETRY.timed("get_top_performer")
     def get_top_performer(self, results=None):
         """Find the video with the highest view count."""
         if results is None:
             results = self.analyze_videos()
         
-        if not results:
-            return None
-        
-        top = results[0]
-        for x in results[1:]:
-            if x["views"] < top["views"]:
-                top = x
+        if _is_loaded_instance(results, "frame", "VideoFrame"):
+            return results.record(int(results.views.argmax())) if len(results) else None
         
-        return top
+        return VideoAggregate.from_results(results, top_metrics=("views",)).best("views")
     
+    @TELEMETRY.timed("get_comparison_data")
     def get_comparison_data(self, results=None):
-        """Compare metrics across all videos."""
+        """
+        Compare metrics across all videos in a single pass.
+        
+        `results` may be any iterable, including a generator over a
+        streamed crawl, which is then compared in constant memory.
+        """
         if results is None:
             results = self.analyze_videos()
         
-        if not results:
-            return {}
+        if _is_loaded_instance(results, "frame", "VideoFrame"):
+            return self._frame_comparison_data(results)
         
-        total_views = 0
-        total_likes = 0
-        total_comments = 0
-        
-        for r in results:
-            total_views += int(r["views"])
-            total_likes += int(r["likes"])
-            total_comments += int(r["comments"])
-        
-        avg_views = total_views / len(results)
-        avg_likes = total_likes / len(results)
-        avg_engagement = sum(r["engagement_rate"] for r in results) / len(results)
+        return VideoAggregate.from_results(results).to_comparison()
+    
+    def _frame_comparison_data(self, frame):
+        """get_comparison_data over a VideoFrame, reducing whole columns at once."""
+        if not len(frame):
+            return {}
         
-        best_engagement = results[0]
-        for r in results[1:]:
-            if r["engagement_rate"] > best_engagement["engagement_rate"]:
-                best_engagement = r
+        total_views = int(frame.views.sum())
+        total_likes = int(frame.likes.sum())
         
         return {
-            "total_videos": len(results),
+            "total_videos": len(frame),
             "total_views": total_views,
             "total_likes": total_likes,
-            "total_comments": total_comments,
-            "average_views": avg_views,
-            "average_likes": avg_likes,
-            "average_engagement": avg_engagement,
-            "top_performer": self.get_top_performer(results),
-            "best_engagement": best_engagement
+            "total_comments": int(frame.comments.sum()),
+            "average_views": total_views / len(frame),
+            "average_likes": total_likes / len(frame),
+            "average_engagement": float(frame.engagement_rate.mean()),
+            "top_performer": self.get_top_performer(frame),
+            "best_engagement": frame.record(int(frame.engagement_rate.argmax()))
         }
     
+    @TELEMETRY.timed("filter_by_performance")
     def filter_by_performance(self, results=None, min_views=None, min_engagement=None):
-        """Filter videos by minimum performance thresholds."""
+        """
+        Filter videos by minimum performance thresholds.
+        
+        A VideoIndex answers from its sorted indexes instead of a scan and
+        returns a VideoFrame, as a VideoFrame does.
+        """
         if results is None:
             results = self.analyze_videos()
         
+        if _is_loaded_instance(results, "query", "VideoIndex"):
+            return results.select(min_views=min_views, min_engagement=min_engagement)
+        
+        if _is_loaded_instance(results, "frame", "VideoFrame"):
+            import numpy as np
+            
+            mask = np.ones(len(results), dtype=bool)
+            if min_views is not None:
+                mask &= results.views >= min_views
+            if min_engagement is not None:
+                mask &= results.engagement_rate >= min_engagement
+            return results[mask]
+        
         filtered = []
         for v in results:
             passes = True
@@ -0,0 +1,291 @@
+"""
+Append-only, memory-mapped columnar archive of statistics snapshots.
+
+An archive is a directory holding one file per column, each a flat array
+of little-endian fixed-width integers with one entry per snapshot row,
+plus a small dictionary of video metadata:
+
+    video.i4        row -> index into videos.jsonl
+    taken_at.i8     epoch seconds, non-decreasing
+    views.i8, likes.i8, comments.i8
+    videos.jsonl    one [index, video_id, channel_id, title, published_ts] per line
+
+Readers map the column files with np.memmap, so a time range is a slice
+of each column found by binary search on taken_at, with nothing copied
+or parsed; the page cache, not the process, holds the data. Per-video
+aggregations walk a range in fixed-size chunks, so resident memory grows
+with the chunk size and the number of videos, not the number of rows.
+"""
+
+import json
+import os
+import threading
+import time
+import numpy as np
+from .frame import VideoFrame, days_since
+from .metrics import calculate_engagement_rates, calculate_growth_scores
+from .video import Video, parse_timestamp
+
+COLUMNS = {
+    "video": np.dtype("<i4"),
+    "taken_at": np.dtype("<i8"),
+    "views": np.dtype("<i8"),
+    "likes": np.dtype("<i8"),
+    "comments": np.dtype("<i8")
+}
+
+VIDEOS_FILE = "videos.jsonl"
+
+# Rows per chunk for aggregations (~36 MB of column data)
+DEFAULT_CHUNK_ROWS = 1 << 20
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def column_file(name):
+    return f"{name}.{COLUMNS[name].str[1:]}"
+
+
+class StatsArchive:
+    """
+    Statistics history for many videos, stored column by column on disk.
+    
+    Rows are only ever appended, in time order. A crash mid-append leaves
+    some column files longer than others, or a partial last line in the
+    video dictionary; only rows present in every column and complete
+    dictionary lines count, and the extra bytes are cut off on the next
+    append.
+    """
+    
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps = {}
+        
+        self.video_ids = []
+        self.channel_ids = []
+        self.titles = []
+        self.published_ts = []
+        self._index = {}
+        self._videos_size = 0
+        self._load_videos()
+        self._rows = min(self._file_rows(name) for name in COLUMNS)
+    
+    def _path(self, name):
+        return os.path.join(self.path, name)
+    
+    def _file_rows(self, name):
+        try:
+            return os.path.getsize(self._path(column_file(name))) // COLUMNS[name].itemsize
+        except FileNotFoundError:
+            return 0
+    
+    def _load_videos(self):
+        try:
+            with open(self._path(VIDEOS_FILE), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # Anything after the last newline is a torn line from an interrupted append
+        self._videos_size = data.rfind(b"\n") + 1
+        for line in data[:self._videos_size].decode("utf-8").splitlines():
+            index, *entry = json.loads(line)
+            if index > len(self.video_ids):
+                raise ValueError(f"{VIDEOS_FILE} is missing videos before index {index}")
+            self._set_video(*entry)
+    
+    def _set_video(self, video_id, channel_id=None, title="Unknown", published_ts=None):
+        """Add or update a dictionary entry; return (index, changed)."""
+        entry = (channel_id, title, published_ts)
+        i = self._index.get(video_id)
+        if i is None:
+            i = self._index[video_id] = len(self.video_ids)
+            self.video_ids.append(video_id)
+            self.channel_ids.append(channel_id)
+            self.titles.append(title)
+            self.published_ts.append(published_ts)
+            return i, True
+        if entry == (self.channel_ids[i], self.titles[i], self.published_ts[i]):
+            return i, False
+        self.channel_ids[i], self.titles[i], self.published_ts[i] = entry
+        return i, True
+    
+    def __len__(self):
+        return self._rows
+    
+    def record(self, videos, taken_at=None):
+        """
+        Store API `videos` items (or Video records): snippet fields for new
+        or changed videos, plus a statistics row for every item with statistics.
+        """
+        taken_at = self.clock() if taken_at is None else taken_at
+        videos = [d.to_api() if isinstance(d, Video) else d for d in videos]
+        
+        with self._lock:
+            changed = []
+            for d in videos:
+                if "snippet" in d:
+                    snippet = d["snippet"]
+                    entry = (d["id"], snippet.get("channelId"), snippet.get("title", "Unknown"),
+                             parse_timestamp(snippet.get("publishedAt", "")))
+                    if self._set_video(*entry)[1]:
+                        changed.append(entry)
+            self._write_videos(changed)
+        
+        stats = [(d["id"], d["statistics"]) for d in videos if "statistics" in d]
+        self.append(
+            [video_id for video_id, _ in stats], taken_at,
+            views=[int(s.get("viewCount", 0)) for _, s in stats],
+            likes=[int(s.get("likeCount", 0)) for _, s in stats],
+            comments=[int(s.get("commentCount", 0)) for _, s in stats]
+        )
+    
+    def append(self, video_ids, taken_at, views, likes, comments):
+        """
+        Append statistics rows column-wise, for bulk loads. `taken_at` is one
+        time for every row or a non-decreasing column; unknown video IDs get
+        a bare dictionary entry.
+        """
+        with self._lock:
+            new = [(video_id,) for video_id in dict.fromkeys(video_ids) if video_id not in self._index]
+            for entry in new:
+                self._set_video(*entry)
+            self._write_videos(new)
+            
+            count = len(video_ids)
+            if not count:
+                return
+            columns = {
+                "video": np.fromiter((self._index[video_id] for video_id in video_ids), COLUMNS["video"], count),
+                "taken_at": np.broadcast_to(np.asarray(taken_at, dtype=COLUMNS["taken_at"]), (count,)),
+                "views": views,
+                "likes": likes,
+                "comments": comments
+            }
+            columns = {name: np.asarray(values, dtype=COLUMNS[name]) for name, values in columns.items()}
+            
+            times = columns["taken_at"]
+            last = self.column("taken_at")[-1] if self._rows else times[0]
+            if times[0] < last or (np.diff(times) < 0).any():
+                raise ValueError("Snapshots must be appended in time order")
+            
+            for name, values in columns.items():
+                with open(self._path(column_file(name)), "ab") as f:
+                    # Drop the tail of a torn earlier append before writing
+                    f.truncate(self._rows * COLUMNS[name].itemsize)
+                    f.write(values.tobytes())
+            self._rows += count
+            self._maps.clear()
+    
+    def _write_videos(self, entries):
+        if entries:
+            lines = []
+            for entry in entries:
+                i = self._index[entry[0]]
+                lines.append(json.dumps([i, self.video_ids[i], self.channel_ids[i], self.titles[i],
+                                         self.published_ts[i]]) + "\n")
+            with open(self._path(VIDEOS_FILE), "ab") as f:
+                # Drop a torn line from an earlier append, so the first new line starts clean
+                f.truncate(self._videos_size)
+                f.write("".join(lines).encode("utf-8"))
+                self._videos_size = f.tell()
+    
+    def column(self, name):
+        """Read-only memory map of a whole column (no data is read until used)."""
+        column = self._maps.get(name)
+        if column is None:
+            if self._rows:
+                column = np.memmap(self._path(column_file(name)), dtype=COLUMNS[name], mode="r",
+                                   shape=(self._rows,))
+            else:
+                column = np.empty(0, dtype=COLUMNS[name])
+            self._maps[name] = column
+        return column
+    
+    def row_range(self, start=None, end=None):
+        """Row bounds (lo, hi) of the snapshots taken in [start, end)."""
+        taken_at = self.column("taken_at")
+        lo = 0 if start is None else int(np.searchsorted(taken_at, start, side="left"))
+        hi = self._rows if end is None else int(np.searchsorted(taken_at, end, side="left"))
+        return lo, max(lo, hi)
+    
+    def columns(self, start=None, end=None):
+        """Every column restricted to [start, end), as views into the memory maps."""
+        lo, hi = self.row_range(start, end)
+        return {name: self.column(name)[lo:hi] for name in COLUMNS}
+    
+    def scan(self, start=None, end=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield the columns of [start, end) in chunks of at most `chunk_rows` rows."""
+        lo, hi = self.row_range(start, end)
+        for i in range(lo, hi, chunk_rows):
+            yield {name: self.column(name)[i:min(i + chunk_rows, hi)] for name in COLUMNS}
+    
+    def _end_rows(self, start=None, end=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Row numbers of each video's first and last snapshot in range (-1 if none)."""
+        lo, hi = self.row_range(start, end)
+        first = np.full(len(self.video_ids), hi, dtype=np.int64)
+        last = np.full(len(self.video_ids), -1, dtype=np.int64)
+        for i in range(lo, hi, chunk_rows):
+            videos = self.column("video")[i:min(i + chunk_rows, hi)]
+            rows = np.arange(i, i + len(videos))
+            np.minimum.at(first, videos, rows)
+            np.maximum.at(last, videos, rows)
+        first[last < 0] = -1
+        return first, last
+    
+    def latest(self, start=None, end=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Each video's last snapshot in [start, end), as columns over the
+        videos that have one (dictionary order), plus their views per day
+        since their first snapshot in range (NaN with only one).
+        """
+        first, last = self._end_rows(start, end, chunk_rows)
+        present = np.flatnonzero(last >= 0)
+        first, last = first[present], last[present]
+        
+        result = {name: np.asarray(self.column(name)[last]) for name in COLUMNS}
+        taken_at = self.column("taken_at")
+        elapsed_days = (taken_at[last] - taken_at[first]) / SECONDS_PER_DAY
+        gained = np.maximum(result["views"] - self.column("views")[first], 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result["views_per_day"] = np.where(elapsed_days > 0, gained / elapsed_days, np.nan)
+        return result
+    
+    def to_frame(self, start=None, end=None, now=None, chunk_rows=DEFAULT_CHUNK_ROWS, shared=False):
+        """
+        A VideoFrame of each video's last snapshot in [start, end), with
+        growth scored on the views per day measured across the range.
+        With `shared`, its numeric columns are allocated in shared memory
+        (see parallel.shared_frame) for rescoring on a process pool.
+        """
+        latest = self.latest(start, end, chunk_rows)
+        index = latest["video"]
+        published_ts = np.array(
+            [np.nan if self.published_ts[i] is None else self.published_ts[i] for i in index], dtype=np.float64
+        )
+        days_old = days_since(published_ts, now)
+        if shared:
+            from .parallel import shared_frame
+        return (shared_frame if shared else VideoFrame)(
+            video_id=[self.video_ids[i] for i in index],
+            title=[self.titles[i] for i in index],
+            published_ts=published_ts,
+            views=latest["views"],
+            likes=latest["likes"],
+            comments=latest["comments"],
+            days_old=days_old,
+            engagement_rate=calculate_engagement_rates(latest["likes"], latest["views"]),
+            growth_score=calculate_growth_scores(latest["views"], days_old, latest["views_per_day"]),
+            views_per_day=latest["views_per_day"]
+        )
+    
+    def close(self):
+        self._maps.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,254 @@
+"""
+Asyncio YouTube API client for fetching many channels concurrently.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from . import config
+from .config import DEFAULT_MAX_CONCURRENCY
+from .transport import HTTPTransport
+from .fields import PLAYLIST_ITEM_FIELDS, UPLOADS_PLAYLIST_FIELDS
+from .scheduler import PRIORITY_FRESH, PRIORITY_NORMAL, PRIORITY_BACKLOG
+from .youtube_client import (
+    YouTubeClient,
+    MAX_PAGE_SIZE,
+    MAX_COMMENT_PAGE_SIZE,
+    DETAIL_PARTS,
+    COMMENTS_DISABLED,
+    APIError,
+    ChannelNotFoundError,
+    chunked,
+    uploads_playlists_from
+)
+
+
+class AsyncYouTubeClient:
+    """
+    Async counterpart of YouTubeClient.
+    
+    Requests go through the same pooled HTTPTransport, run on a private
+    thread pool; a semaphore caps how many are in flight at once, so
+    fetching hundreds of channels never opens more than `max_concurrency`
+    connections. A `transport` passed in is shared with its owner and
+    left open by close().
+    """
+    
+    def __init__(self, api_key=None, transport=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, cache=None,
+                 playlist_cache=None, scheduler=None, part_cache=None):
+        self._owns_transport = transport is None
+        transport = transport or HTTPTransport(pool_maxsize=max_concurrency)
+        self.client = YouTubeClient(api_key, transport=transport, cache=cache, playlist_cache=playlist_cache,
+                                    scheduler=scheduler, part_cache=part_cache)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="youtube-client"
+        )
+    
+    async def _get(self, endpoint, params, priority=PRIORITY_NORMAL):
+        """Make a GET request without blocking the event loop."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(self.client._get, endpoint, params, priority=priority)
+            )
+    
+    async def resolve_uploads_playlists(self, channel_ids):
+        """
+        Map channel IDs to uploads playlist IDs, resolving unknown ones 50 per
+        request. If a batch fails, the others are still cached before its
+        error is raised.
+        """
+        playlist_cache = self.client.playlist_cache
+        pages = await asyncio.gather(*(
+            self._get("channels", {
+                "part": "contentDetails",
+                "id": ",".join(batch),
+                "fields": UPLOADS_PLAYLIST_FIELDS
+            }, priority=PRIORITY_FRESH)
+            for batch in chunked(playlist_cache.missing(channel_ids), MAX_PAGE_SIZE)
+        ), return_exceptions=True)
+        errors = [page for page in pages if isinstance(page, BaseException)]
+        for channel_data in pages:
+            if not isinstance(channel_data, BaseException):
+                playlist_cache.update(uploads_playlists_from(channel_data))
+        if errors:
+            raise errors[0]
+        
+        return {
+            channel_id: playlist_cache.get(channel_id)
+            for channel_id in channel_ids
+            if channel_id in playlist_cache
+        }
+    
+    async def get_uploads_playlist_id(self, channel_id=None):
+        """Look up the uploads playlist ID for a channel."""
+        channel_id = channel_id or config.channel_id()
+        
+        playlists = await self.resolve_uploads_playlists([channel_id])
+        if channel_id not in playlists:
+            raise ChannelNotFoundError(f"Channel not found: {channel_id}")
+        return playlists[channel_id]
+    
+    async def get_playlist_video_ids(self, playlist_id, limit=None):
+        """Collect video IDs from a playlist, following page tokens until exhausted."""
+        video_ids = []
+        page_token = None
+        
+        while limit is None or len(video_ids) < limit:
+            remaining = None if limit is None else limit - len(video_ids)
+            page_size = MAX_PAGE_SIZE if remaining is None else min(remaining, MAX_PAGE_SIZE)
+            params = {
+                "part": "snippet",
+                "playlistId": playlist_id,
+                "maxResults": page_size,
+                "fields": PLAYLIST_ITEM_FIELDS
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            
+            priority = PRIORITY_BACKLOG if page_token else PRIORITY_FRESH
+            playlist_data = await self._get("playlistItems", params, priority=priority)
+            
+            for item in playlist_data["items"][:page_size]:
+                video_ids.append(item["snippet"]["resourceId"]["videoId"])
+            
+            page_token = playlist_data.get("nextPageToken")
+            if not page_token:
+                break
+        
+        return video_ids
+    
+    async def _get_video_batch(self, batch, fields, priority):
+        """One `videos` batch projected onto `fields`, skipping parts the part cache holds."""
+        params = self.client.video_request(batch, fields)
+        data = None if params is None else await self._get("videos", params, priority=priority)
+        return self.client.merge_video_items(batch, fields, data)
+    
+    async def get_video_details(self, video_ids, fields=None):
+        """
+        Fetch detailed statistics for video IDs, requesting 50-ID batches
+        concurrently; a FieldMask as `fields` projects them as in
+        YouTubeClient.iter_video_details().
+        """
+        if not video_ids:
+            return []
+        
+        batches = list(chunked(video_ids, MAX_PAGE_SIZE))
+        if fields is not None:
+            pages = await asyncio.gather(*(
+                self._get_video_batch(batch, fields, PRIORITY_BACKLOG if i else PRIORITY_FRESH)
+                for i, batch in enumerate(batches)
+            ))
+            return [item for page in pages for item in page]
+        
+        pages = await asyncio.gather(*(
+            self._get("videos", {
+                "part": DETAIL_PARTS,
+                "id": ",".join(batch)
+            }, priority=PRIORITY_BACKLOG if i else PRIORITY_FRESH)
+            for i, batch in enumerate(batches)
+        ))
+        return [item for page in pages for item in page["items"]]
+    
+    async def get_channel_videos(self, channel_id=None, max_results=5, fields=None):
+        """Fetch the latest videos from a channel."""
+        uploads_playlist_id = await self.get_uploads_playlist_id(channel_id)
+        video_ids = await self.get_playlist_video_ids(uploads_playlist_id, limit=max_results)
+        return await self.get_video_details(video_ids, fields=fields)
+    
+    async def get_many_channel_videos(self, channel_ids, max_results=5, return_exceptions=False, fields=None):
+        """
+        Fetch the latest videos for every channel at once, keyed by channel ID.
+        
+        With `return_exceptions`, a channel that fails maps to its exception
+        instead of cancelling the whole batch.
+        """
+        try:
+            await self.resolve_uploads_playlists(channel_ids)
+        except Exception:
+            # Channels from a failed batch retry (and report) their own lookup below
+            pass
+        results = await asyncio.gather(*(
+            self.get_channel_videos(channel_id, max_results=max_results, fields=fields)
+            for channel_id in channel_ids
+        ), return_exceptions=return_exceptions)
+        return dict(zip(channel_ids, results))
+    
+    async def _stream_video_comments(self, video_id, limit, queue):
+        """Page through one video's comment threads, handing each page to `queue`."""
+        page_token = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = MAX_COMMENT_PAGE_SIZE if remaining is None else min(remaining, MAX_COMMENT_PAGE_SIZE)
+            try:
+                data = await self._get("commentThreads",
+                                       self.client.comment_thread_params(video_id, page_size, page_token),
+                                       priority=PRIORITY_BACKLOG)
+            except APIError as e:
+                if e.reason == COMMENTS_DISABLED:
+                    return
+                raise
+            items = data["items"][:page_size]
+            if items:
+                # Waits while the consumer is behind, so unread pages stay bounded
+                await queue.put((video_id, items))
+            if remaining is not None:
+                remaining -= len(items)
+            
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                break
+    
+    async def stream_comment_threads(self, video_ids, limit=None):
+        """
+        Async generator of (video_id, page of comment threads) for many
+        videos, up to `limit` threads each, newest first.
+        
+        Up to `max_concurrency` videos are paged at once and at most that
+        many fetched pages wait to be consumed, so memory stays bounded
+        however many videos or comments there are. Pages of different
+        videos interleave; each video's pages arrive in order.
+        """
+        queue = asyncio.Queue(maxsize=self.max_concurrency)
+        video_ids = iter(video_ids)
+        
+        async def worker():
+            # Workers share the ID iterator; each ends with None or its error
+            try:
+                for video_id in video_ids:
+                    await self._stream_video_comments(video_id, limit, queue)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+        
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                page = await queue.get()
+                if page is None:
+                    running -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield page
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    def close(self):
+        """Stop the worker threads and release pooled connections of a private transport."""
+        self._executor.shutdown(wait=True)
+        if self._owns_transport:
+            self.client.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.close()
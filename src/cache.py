@@ -0,0 +1,399 @@
+"""
+HTTP response caching for the YouTube API client.
+
+Responses are stored by endpoint and request params. Within an endpoint's
+TTL a cached body is served without touching the network; once stale it
+is revalidated with If-None-Match, and a 304 refreshes it as a hit.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from .fields import STATIC_PARTS
+from .telemetry import TELEMETRY
+
+# Seconds a response stays fresh, by endpoint. Upload playlists rarely
+# move, statistics change constantly.
+DEFAULT_TTLS = {
+    "channels": 24 * 60 * 60,
+    "playlistItems": 15 * 60,
+    "videos": 5 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+# Params that never change the response and must not leak into the cache
+UNCACHED_PARAMS = ("key",)
+
+
+def cache_key(endpoint, params):
+    """Build a stable cache key from an endpoint and its request params."""
+    params = {k: v for k, v in params.items() if k not in UNCACHED_PARAMS}
+    return endpoint + "?" + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class MemoryCache:
+    """In-memory LRU backend holding at most `max_entries` responses."""
+    
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    On-disk backend storing one JSON file per response under `directory`.
+    
+    Reads bump a file's mtime, so once the directory grows past
+    `max_bytes` the least recently used files are removed first. The
+    directory's size is tracked as files are written and deleted, and only
+    rescanned when it goes over the cap.
+    """
+    
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._stat_files())
+    
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+    
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("key") == key else None
+    
+    def set(self, key, entry):
+        data = json.dumps(dict(entry, key=key)).encode()
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            replaced = _file_size(path)
+            os.replace(tmp_path, path)
+            self._size += len(data) - replaced
+            over = self._size > self.max_bytes
+        if over:
+            self._enforce_size_cap()
+    
+    def delete(self, key):
+        path = self._path(key)
+        with self._lock:
+            size = _file_size(path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return
+            self._size -= size
+    
+    def keys(self):
+        keys = []
+        for path in self._files():
+            try:
+                with open(path) as f:
+                    keys.append(json.load(f)["key"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return keys
+    
+    def clear(self):
+        with self._lock:
+            for path in self._files():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+    
+    def _files(self):
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+    
+    def _stat_files(self):
+        """(mtime, size, path) of every cached file."""
+        files = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+    
+    def _enforce_size_cap(self):
+        with self._lock:
+            # A full scan also picks up files written or removed by other processes
+            files = self._stat_files()
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                total -= size
+                self.evictions += 1
+            self._size = total
+    
+    def __len__(self):
+        return len(self._files())
+
+
+class ResponseCache:
+    """
+    Caching policy in front of a storage backend.
+    
+    Tracks hits (fresh or revalidated by a 304), misses and revalidations
+    so callers can see how much traffic and quota the cache is saving.
+    """
+    
+    def __init__(self, backend=None, ttls=None, default_ttl=DEFAULT_TTL, clock=time.time):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+    
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+    
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def fetch(self, send, endpoint, params):
+        """
+        Return the JSON body for a request, from cache where possible.
+        
+        `send(headers)` performs the actual request and returns the HTTP
+        response; it is only called on a miss or to revalidate.
+        """
+        key = cache_key(endpoint, params)
+        entry = self.backend.get(key)
+        now = self.clock()
+        
+        if entry is not None and now - entry["stored_at"] < self.ttl_for(endpoint):
+            self._count("hits")
+            TELEMETRY.count("cache_lookups_total", result="hit")
+            return entry["body"]
+        
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        
+        response = send(headers)
+        
+        if response.status_code == 304 and entry is not None:
+            self._count("hits")
+            self._count("revalidations")
+            TELEMETRY.count("cache_lookups_total", result="revalidated")
+            self.backend.set(key, dict(entry, stored_at=now))
+            return entry["body"]
+        
+        self._count("misses")
+        TELEMETRY.count("cache_lookups_total", result="miss")
+        with TELEMETRY.timer("json_decode_seconds", endpoint=endpoint):
+            body = response.json()
+        if response.status_code == 200:
+            etag = response.headers.get("ETag") or body.get("etag")
+            self.backend.set(key, {"etag": etag, "stored_at": now, "body": body})
+        return body
+    
+    def evict_expired(self):
+        """Drop every entry older than its endpoint's TTL; return how many went."""
+        now = self.clock()
+        evicted = 0
+        for key in self.backend.keys():
+            entry = self.backend.get(key)
+            endpoint = key.split("?", 1)[0]
+            if entry is None or now - entry["stored_at"] >= self.ttl_for(endpoint):
+                self.backend.delete(key)
+                evicted += 1
+        return evicted
+    
+    @property
+    def stats(self):
+        """Hit/miss counters, plus the hit ratio over all lookups."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.backend.evictions,
+            "entries": len(self.backend),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class UploadsPlaylistCache:
+    """
+    Channel ID -> uploads playlist ID map, optionally persisted to `path`.
+    
+    The mapping never changes for a channel, so entries have no TTL and
+    are only written back when new channels are resolved.
+    """
+    
+    def __init__(self, path=None):
+        self.path = path
+        self._playlists = {}
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path) as f:
+                    self._playlists = json.load(f)
+            except (OSError, ValueError):
+                self._playlists = {}
+    
+    def get(self, channel_id):
+        return self._playlists.get(channel_id)
+    
+    def missing(self, channel_ids):
+        """Return the channel IDs without a known playlist, in order and deduplicated."""
+        return [c for c in dict.fromkeys(channel_ids) if c not in self._playlists]
+    
+    def update(self, playlists):
+        with self._lock:
+            self._playlists.update(playlists)
+            if self.path and playlists:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(self._playlists, f, indent=1, sort_keys=True)
+                os.replace(tmp_path, self.path)
+    
+    def __contains__(self, channel_id):
+        return channel_id in self._playlists
+    
+    def __len__(self):
+        return len(self._playlists)
+
+
+class PartCache:
+    """
+    Video ID -> the rarely changing parts of its `videos` item (snippet,
+    contentDetails) from earlier projected responses, holding at most
+    `max_videos` videos in LRU order.
+    
+    Each part remembers the fields it was fetched with, so it is only
+    reused for requests that need no more than those fields, and when it
+    was stored: parts older than `ttl` seconds are requested again, so
+    renamed titles reach long-running processes.
+    """
+    
+    def __init__(self, max_videos=100_000, ttl=DEFAULT_TTLS["channels"], clock=time.time):
+        self.max_videos = max_videos
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self._videos = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _covers(self, video_id, part, fields, now):
+        entry = self._videos.get(video_id, {}).get(part)
+        if entry is None:
+            return False
+        cached_fields, _, stored_at = entry
+        if now - stored_at >= self.ttl:
+            return False
+        return cached_fields is None or (fields is not None and fields <= cached_fields)
+    
+    def covers(self, video_ids, part, fields):
+        """Whether a fresh `part` is cached for every video with at least `fields` (None: the whole part)."""
+        now = self.clock()
+        with self._lock:
+            return all(self._covers(video_id, part, fields, now) for video_id in video_ids)
+    
+    def update(self, items, mask):
+        """Remember the static parts of response `items` fetched with FieldMask `mask`."""
+        now = self.clock()
+        with self._lock:
+            for item in items:
+                parts = {
+                    part: (mask.part_fields(part), item[part], now)
+                    for part in STATIC_PARTS if part in item and part in mask.parts
+                }
+                if parts:
+                    self._videos.setdefault(item["id"], {}).update(parts)
+                    self._videos.move_to_end(item["id"])
+            while len(self._videos) > self.max_videos:
+                self._videos.popitem(last=False)
+    
+    def fill(self, item, mask):
+        """
+        `item` with the mask's cached static parts it lacks added. A copy
+        is returned when anything is added: `item` may belong to a body
+        held by the response cache, which must keep only what the API sent.
+        """
+        with self._lock:
+            cached = self._videos.get(item["id"], {})
+            missing = [part for part in mask.parts if part not in item and part in cached]
+            if missing:
+                item = dict(item)
+                for part in missing:
+                    item[part] = cached[part][1]
+                self.hits += len(missing)
+            if cached:
+                self._videos.move_to_end(item["id"])
+        return item
+    
+    def __len__(self):
+        return len(self._videos)
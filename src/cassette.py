@@ -0,0 +1,164 @@
+"""
+Record/replay transports for offline, deterministic client runs.
+
+RecordingTransport wraps a real transport and appends every exchange to a
+cassette: JSON Lines, gzip-compressed when the path ends in ".gz", with
+the API key stripped from the recorded request. ReplayTransport serves the
+cassette back through the normal client path, either at full speed or
+with the recorded latencies, so parsing and analysis can be profiled
+without network access and CPU time told apart from network wait.
+"""
+
+import gzip
+import json
+import threading
+import time
+from datetime import timedelta
+from requests.structures import CaseInsensitiveDict
+from .cache import cache_key, UNCACHED_PARAMS
+from .transport import HTTPTransport
+
+# Response headers worth keeping; the rest is noise in a cassette
+RECORDED_HEADERS = ("Content-Type", "ETag")
+
+
+class CassetteMiss(LookupError):
+    """Raised when a replayed request has no recorded response."""
+
+
+def open_cassette(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordedResponse:
+    """The parts of a requests.Response the client reads, rebuilt from a cassette."""
+    
+    def __init__(self, status_code, headers, text, elapsed=0.0, url=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.text = text
+        self.elapsed = timedelta(seconds=elapsed)
+        self.url = url
+    
+    @property
+    def content(self):
+        return self.text.encode()
+    
+    def json(self):
+        # Parsed on every call, like a live response, so profiles include decoding
+        return json.loads(self.text)
+
+
+class RecordingTransport:
+    """
+    Pass requests through to `transport` (a pooled HTTPTransport by
+    default), appending each exchange to the cassette at `path`.
+    """
+    
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or HTTPTransport()
+        self.recorded = 0
+        self._file = open_cassette(path, "a")
+        self._lock = threading.Lock()
+    
+    def fetch(self, url, params=None, headers=None):
+        response = self.transport.fetch(url, params=params, headers=headers)
+        entry = {
+            "url": url,
+            "params": {k: v for k, v in (params or {}).items() if k not in UNCACHED_PARAMS},
+            "status": response.status_code,
+            "headers": {k: response.headers[k] for k in RECORDED_HEADERS if k in response.headers},
+            "elapsed": round(response.elapsed.total_seconds(), 6)
+        }
+        # JSON bodies are stored inline rather than as an escaped string
+        try:
+            entry["json"] = response.json()
+        except ValueError:
+            entry["text"] = response.text
+        
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+        return response
+    
+    def get(self, url, params=None):
+        return self.fetch(url, params=params).json()
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayTransport:
+    """
+    Serve responses from a cassette instead of the network.
+    
+    Requests are matched on URL and params (ignoring the API key);
+    repeated identical requests get the recorded responses in order, then
+    the last one again. With `realtime`, each response waits its recorded
+    latency times `latency_scale`; `wait_seconds` totals that simulated network
+    time so it can be subtracted from a profile.
+    """
+    
+    def __init__(self, path, realtime=False, latency_scale=1.0, sleep=time.sleep):
+        self.path = path
+        self.realtime = realtime
+        self.latency_scale = latency_scale
+        self.sleep = sleep
+        self.requests = 0
+        self.wait_seconds = 0.0
+        self._interactions = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        
+        with open_cassette(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if "json" in entry:
+                        entry["text"] = json.dumps(entry.pop("json"), separators=(",", ":"), ensure_ascii=False)
+                    self._interactions.setdefault(cache_key(entry["url"], entry["params"]), []).append(entry)
+    
+    def __len__(self):
+        return sum(len(entries) for entries in self._interactions.values())
+    
+    def fetch(self, url, params=None, headers=None):
+        key = cache_key(url, params or {})
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {key}")
+            position = self._positions.get(key, 0)
+            entry = entries[min(position, len(entries) - 1)]
+            self._positions[key] = position + 1
+            self.requests += 1
+            wait = entry["elapsed"] * self.latency_scale if self.realtime else 0.0
+            self.wait_seconds += wait
+        
+        if wait:
+            self.sleep(wait)
+        return RecordedResponse(entry["status"], entry["headers"], entry["text"], entry["elapsed"], url)
+    
+    def get(self, url, params=None):
+        return self.fetch(url, params=params).json()
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,47 @@
+"""
+Settings read from the environment, loaded on first use.
+
+Nothing here runs at import time: the .env file is only searched for and
+loaded the first time a setting is read, so code paths that never talk to
+the API (metrics, formatters, offline reports) never pay for it.
+"""
+
+import os
+
+# Quantum Tech HD, unless YOUTUBE_CHANNEL_ID overrides it
+DEFAULT_CHANNEL_ID = "UC4Tklxku1yPcRIH0VVCKoeA"
+
+# Shared defaults for the CLI, kept here so --help needs no network modules
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_RESULT_TTL = 5 * 60
+# Statistics snapshots younger than this are reused by refresh_latest_videos
+DEFAULT_MAX_AGE = 60 * 60
+# Seconds between new-upload checks in watch mode
+DEFAULT_UPLOAD_INTERVAL = 5 * 60
+
+_env_loaded = False
+
+
+def load_env():
+    """Load .env into os.environ once (existing variables win)."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def api_key():
+    load_env()
+    return os.getenv("YOUTUBE_API_KEY")
+
+
+def api_keys():
+    """Comma-separated keys from several Cloud projects, each with its own quota."""
+    load_env()
+    return [key.strip() for key in os.getenv("YOUTUBE_API_KEYS", "").split(",") if key.strip()]
+
+
+def channel_id():
+    load_env()
+    return os.getenv("YOUTUBE_CHANNEL_ID", DEFAULT_CHANNEL_ID)
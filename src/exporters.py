@@ -0,0 +1,88 @@
+"""
+Streaming machine-readable exporters for analysis results.
+
+Each exporter consumes an iterable of analyze_video() dicts one row at a
+time, so a generator pipeline (stream_channel_videos -> iter_analysis)
+can be written out without holding the whole report in memory.
+"""
+
+import csv
+import json
+
+EXPORT_FIELDS = (
+    "channel_id", "video_id", "title", "published_at",
+    "views", "likes", "comments", "engagement_rate", "growth_score", "days_old"
+)
+
+# Rows buffered per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+PARQUET_TYPES = {
+    "views": "int64",
+    "likes": "int64",
+    "comments": "int64",
+    "days_old": "int64",
+    "engagement_rate": "float64",
+    "growth_score": "float64",
+}
+
+
+def export_jsonl(rows, out, fields=EXPORT_FIELDS):
+    """Write one JSON object per line to the text stream `out`; return the row count."""
+    count = 0
+    for row in rows:
+        out.write(json.dumps({field: row.get(field) for field in fields}, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def export_csv(rows, out, fields=EXPORT_FIELDS):
+    """Write a header and one CSV line per row to `out` (opened with newline=""); return the row count."""
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def export_parquet(rows, out, fields=EXPORT_FIELDS, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Write rows to a Parquet file (path or binary stream), one row group
+    per `row_group_size` rows; return the row count. Requires pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from None
+    
+    schema = pa.schema([(field, getattr(pa, PARQUET_TYPES.get(field, "string"))()) for field in fields])
+    columns = {field: [] for field in fields}
+    count = 0
+    
+    def flush(writer):
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+        for values in columns.values():
+            values.clear()
+    
+    with pq.ParquetWriter(out, schema) as writer:
+        for row in rows:
+            for field in fields:
+                columns[field].append(row.get(field))
+            count += 1
+            if count % row_group_size == 0:
+                flush(writer)
+        if count % row_group_size or not count:
+            flush(writer)
+    return count
+
+
+# format name -> (exporter, whether it writes bytes rather than text)
+EXPORTERS = {
+    "jsonl": (export_jsonl, False),
+    "csv": (export_csv, False),
+    "parquet": (export_parquet, True),
+}
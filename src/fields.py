@@ -0,0 +1,133 @@
+"""
+Field projections for partial API responses.
+
+Callers name the fields they read as dotted paths ("statistics.viewCount");
+a FieldMask turns them into the smallest `part` list and a `fields`
+selector, so the API sends (and we decode) only those values instead of
+whole snippets with descriptions, thumbnails and localizations.
+"""
+
+# Parts of a `videos` item that rarely change once published, and can be
+# reused from an earlier response (see cache.PartCache)
+STATIC_PARTS = ("snippet", "contentDetails")
+
+# `playlistItems` and `channels` lookups only ever need these values
+PLAYLIST_ITEM_FIELDS = "nextPageToken,items/snippet/resourceId/videoId"
+UPLOADS_PLAYLIST_FIELDS = "items(id,contentDetails/relatedPlaylists/uploads)"
+VIDEO_COUNT_FIELDS = "items(id,statistics/videoCount)"
+# What CommentStats reads from a `commentThreads` item (no comment text)
+COMMENT_THREAD_FIELDS = (
+    "nextPageToken,"
+    "items/snippet(totalReplyCount,topLevelComment/snippet(authorChannelId,publishedAt,likeCount))"
+)
+
+
+def _render(tree):
+    return ",".join(f"{name}({_render(children)})" if children else name for name, children in tree.items())
+
+
+def parse_selector(selector):
+    """
+    Parse a `fields` selector ("items(id,snippet/title),nextPageToken")
+    into a nested dict of field names; an empty dict selects everything.
+    """
+    tree, stack, name, path = {}, [], "", []
+    
+    def close_name():
+        nonlocal name
+        node = stack[-1] if stack else tree
+        for part in path + [name]:
+            if part:
+                node = node.setdefault(part, {})
+        path.clear()
+        name = ""
+        return node
+    
+    for char in selector + ",":
+        if char == "/":
+            path.append(name)
+            name = ""
+        elif char == "(":
+            stack.append(close_name())
+        elif char == ")":
+            close_name()
+            stack.pop()
+        elif char == ",":
+            close_name()
+        elif not char.isspace():
+            name += char
+    return tree
+
+
+def apply_fields(value, selector):
+    """Project a response body onto a `fields` selector, as the API does server-side."""
+    return _project(value, parse_selector(selector) if isinstance(selector, str) else selector)
+
+
+def _project(value, tree):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {name: _project(value[name], children) for name, children in tree.items() if name in value}
+    return value
+
+
+class FieldMask:
+    """
+    The fields of a `videos` item a caller reads, as dotted paths.
+    
+    A path naming a whole part ("statistics") selects all of it. The item
+    "id" is always requested, so responses can be matched to videos.
+    """
+    
+    def __init__(self, *paths):
+        self.paths = tuple(dict.fromkeys(paths))
+        self.tree = {"id": {}}
+        whole = set()
+        for path in self.paths:
+            part, *names = path.split(".")
+            if not names:
+                whole.add(part)
+                self.tree[part] = {}
+            elif part not in whole:
+                node = self.tree.setdefault(part, {})
+                for name in names:
+                    node = node.setdefault(name, {})
+    
+    @property
+    def parts(self):
+        """Top-level parts to request, in order of first mention."""
+        return [name for name in self.tree if name != "id"]
+    
+    def part_fields(self, part):
+        """Field names selected within `part`, or None for the whole part."""
+        children = self.tree.get(part)
+        return frozenset(children) if children else None
+    
+    def selector(self, parts=None):
+        """The `fields` parameter selecting the mask's items, limited to `parts`."""
+        parts = self.parts if parts is None else parts
+        tree = {name: children for name, children in self.tree.items() if name == "id" or name in parts}
+        return f"items({_render(tree)})"
+    
+    def __or__(self, other):
+        return FieldMask(*self.paths, *other.paths)
+    
+    def __eq__(self, other):
+        return isinstance(other, FieldMask) and self.tree == other.tree
+    
+    def __repr__(self):
+        return f"FieldMask({', '.join(map(repr, self.paths))})"
+
+
+# What analyze_video / Video.from_api and the snapshot store read
+ANALYSIS_FIELDS = FieldMask(
+    "snippet.channelId", "snippet.title", "snippet.publishedAt",
+    "statistics.viewCount", "statistics.likeCount", "statistics.commentCount"
+)
+# Only the counters, for refreshing videos whose snippet is already stored
+STATISTICS_FIELDS = FieldMask("statistics.viewCount", "statistics.likeCount", "statistics.commentCount")
+# Analysis plus the text VideoIndex searches
+SEARCH_FIELDS = ANALYSIS_FIELDS | FieldMask("snippet.tags", "snippet.description")
@@ -2,6 +2,8 @@
 Output formatters for video performance reports.
 """
 
+from .telemetry import TELEMETRY
+
 
 def format_number(num):
     """Format large numbers with K/M suffixes."""
@@ -16,6 +18,7 @@ def format_number(num):
         return str(num)
 
 
+@TELEMETRY.timed("format_video_report")
 def format_video_report(video_data):
     """Format a single video's data as a readable report."""
     lines = [
@@ -31,11 +34,12 @@ def format_video_report(video_data):
     return "\n".join(lines)
 
 
-def format_comparison_table(comparison_data):
+@TELEMETRY.timed("format_comparison_table")
+def format_comparison_table(comparison_data, title="CHANNEL PERFORMANCE SUMMARY"):
     """Format comparison data as a summary table."""
     lines = [
         "=" * 50,
-        "📊 CHANNEL PERFORMANCE SUMMARY",
+        f"📊 {title}",
         "=" * 50,
         f"Total Videos Analyzed: {comparison_data['total_videos']}",
         f"Total Views: {format_number(comparison_data['total_views'])}",
@@ -63,6 +67,7 @@ def format_comparison_table(comparison_data):
     return "\n".join(lines)
 
 
+@TELEMETRY.timed("format_video_list")
 def format_video_list(videos):
     """Format a list of videos as numbered entries."""
     lines = []
@@ -72,3 +77,26 @@ def format_video_list(videos):
         lines.append("")
     return "\n".join(lines)
 
+
+def format_profile(telemetry):
+    """Format a telemetry registry as a timing and counter summary, slowest first."""
+    lines = [
+        "=" * 72,
+        "⏱️  PROFILE",
+        "=" * 72,
+        f"{'Timer':<40}{'Calls':>7}{'Total':>9}{'Mean':>8}{'p95':>8}",
+    ]
+    for name, labels, count, total, mean, p95, _ in telemetry.summary():
+        label = f"{name.replace('_seconds', '')} {' '.join(labels.values())}"
+        lines.append(f"{label[:39]:<40}{count:>7}{total:>8.3f}s{mean * 1000:>6.1f}ms{p95 * 1000:>6.1f}ms")
+    lines.extend([
+        "-" * 72,
+        f"API requests: {telemetry.total('api_requests_total')} "
+        f"({format_number(telemetry.total('api_response_bytes_total'))}B received, "
+        f"{telemetry.total('quota_units_total')} quota units)",
+        f"Cache lookups: {telemetry.total('cache_lookups_total', result='hit')} hits, "
+        f"{telemetry.total('cache_lookups_total', result='revalidated')} revalidated, "
+        f"{telemetry.total('cache_lookups_total', result='miss')} misses",
+        f"Videos analyzed: {telemetry.total('videos_analyzed_total')}",
+    ])
+    return "\n".join(lines)
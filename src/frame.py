@@ -0,0 +1,134 @@
+"""
+Columnar result set for video analysis.
+
+A VideoFrame holds one typed NumPy array per metric instead of one dict
+per video, so comparisons and filters run over whole columns at once.
+"""
+
+from datetime import datetime, timezone
+import numpy as np
+from .metrics import (
+    calculate_engagement_rates,
+    calculate_growth_scores,
+    calculate_virality_indices,
+    calculate_percentiles,
+    calculate_ranks
+)
+from .video import as_video, format_timestamp, parse_timestamp
+
+COUNT_COLUMNS = ("views", "likes", "comments", "days_old")
+METRIC_COLUMNS = ("published_ts", "engagement_rate", "growth_score")
+TEXT_COLUMNS = ("video_id", "title")
+COLUMNS = TEXT_COLUMNS + COUNT_COLUMNS + METRIC_COLUMNS
+# Views per day measured between snapshots (NaN: score growth on the lifetime average)
+RATE_COLUMN = "views_per_day"
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def days_since(published_ts, now=None):
+    """Whole days between epoch publish times and `now`; 0 where missing (NaN)."""
+    now = (now or datetime.now(timezone.utc)).timestamp()
+    published_ts = np.asarray(published_ts, dtype=np.float64)
+    days = np.floor_divide(now - np.nan_to_num(published_ts, nan=now), SECONDS_PER_DAY)
+    return days.astype(np.int64)
+
+
+class VideoFrame:
+    """
+    Analysis results for many videos, stored column by column.
+    
+    Count columns are int64 and metric columns float64. Index a frame with
+    a column name to get that column, or with a boolean mask / index array
+    to get a new frame of the selected rows. The optional views_per_day
+    column keeps the rates growth was scored on, so rescoring can reuse them.
+    """
+    
+    def __init__(self, **columns):
+        missing = set(COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+        
+        for name in TEXT_COLUMNS:
+            setattr(self, name, np.asarray(columns[name], dtype=object))
+        for name in COUNT_COLUMNS:
+            setattr(self, name, np.asarray(columns[name], dtype=np.int64))
+        for name in METRIC_COLUMNS:
+            setattr(self, name, np.asarray(columns[name], dtype=np.float64))
+        rate = columns.get(RATE_COLUMN)
+        self.views_per_day = (np.full(len(self.views), np.nan) if rate is None
+                              else np.asarray(rate, dtype=np.float64))
+    
+    @classmethod
+    def from_videos(cls, videos, now=None):
+        """Build a frame from Video records or raw API items, computing every metric vectorized."""
+        videos = [as_video(d) for d in videos]
+        count = len(videos)
+        
+        views = np.fromiter((v.views for v in videos), np.int64, count)
+        likes = np.fromiter((v.likes for v in videos), np.int64, count)
+        comments = np.fromiter((v.comments for v in videos), np.int64, count)
+        published_ts = np.fromiter(
+            (np.nan if v.published_ts is None else v.published_ts for v in videos), np.float64, count
+        )
+        days_old = days_since(published_ts, now)
+        
+        return cls(
+            video_id=[v.video_id for v in videos],
+            title=[v.title for v in videos],
+            published_ts=published_ts,
+            views=views,
+            likes=likes,
+            comments=comments,
+            days_old=days_old,
+            engagement_rate=calculate_engagement_rates(likes, views),
+            growth_score=calculate_growth_scores(views, days_old)
+        )
+    
+    @classmethod
+    def from_records(cls, records):
+        """Build a frame from per-video dicts as returned by analyze_video()."""
+        records = list(records)
+        columns = {
+            name: [r[name] for r in records]
+            for name in COLUMNS if name != "published_ts"
+        }
+        columns["published_ts"] = [
+            np.nan if not r["published_at"] else parse_timestamp(r["published_at"])
+            for r in records
+        ]
+        return cls(**columns)
+    
+    def __len__(self):
+        return len(self.views)
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in COLUMNS and key != RATE_COLUMN:
+                raise KeyError(key)
+            return getattr(self, key)
+        return VideoFrame(**{name: getattr(self, name)[key] for name in COLUMNS + (RATE_COLUMN,)})
+    
+    def virality(self):
+        """Virality class ("viral", "trending", "normal") for every row."""
+        return calculate_virality_indices(self.views, self.likes, self.comments, self.days_old)
+    
+    def percentiles(self, metric="views"):
+        """Percentile of every row on `metric` within this frame."""
+        return calculate_percentiles(self[metric])
+    
+    def ranks(self, metric="views"):
+        """Rank of every row on `metric` within this frame, 1 for the highest."""
+        return calculate_ranks(self[metric])
+    
+    def record(self, i):
+        """Row `i` as a plain dict with the same keys as analyze_video()."""
+        row = {name: getattr(self, name)[i] for name in TEXT_COLUMNS}
+        row.update({name: getattr(self, name)[i].item() for name in COUNT_COLUMNS + METRIC_COLUMNS})
+        published_ts = row.pop("published_ts")
+        row["published_at"] = "" if np.isnan(published_ts) else format_timestamp(published_ts)
+        return row
+    
+    def to_records(self):
+        """Every row as a plain dict, in frame order."""
+        return [self.record(i) for i in range(len(self))]
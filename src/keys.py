@@ -0,0 +1,128 @@
+"""
+Pool of YouTube API keys used in rotation.
+"""
+
+import threading
+from .scheduler import quota_day
+
+# Rejections that last until the daily quota resets; anything else (an
+# invalid or expired key) keeps the key out of rotation for good
+QUOTA_ERROR_REASONS = ("quotaExceeded", "dailyLimitExceeded")
+
+
+class APIKeyPool:
+    """
+    Spreads requests over several API keys (one per Google Cloud project).
+    
+    choose() picks the active key with the most quota left according to
+    the scheduler, or the least used key without one. Keys rejected for
+    quota or credential errors are taken out of rotation; keys out of
+    quota come back when the quota day (`day`) rolls over. Per-key request
+    and error counts are kept for reporting.
+    """
+    
+    def __init__(self, keys, day=quota_day):
+        keys = list(dict.fromkeys(k for k in keys if k))
+        if not keys:
+            raise ValueError("YouTube API key is required")
+        self.keys = keys
+        self._requests = dict.fromkeys(keys, 0)
+        self._errors = dict.fromkeys(keys, 0)
+        self.day = day
+        self._disabled = {}
+        self._disabled_day = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_keys(cls, keys):
+        """Build a pool from a pool, a single key or an iterable of keys."""
+        if isinstance(keys, cls):
+            return keys
+        if isinstance(keys, str):
+            keys = [keys]
+        return cls(keys or [])
+    
+    def _roll_day(self):
+        """Put keys disabled for quota on an earlier quota day back into rotation."""
+        if self._disabled_day:
+            today = self.day()
+            for key, day in list(self._disabled_day.items()):
+                if day != today:
+                    del self._disabled_day[key]
+                    del self._disabled[key]
+    
+    @property
+    def active_keys(self):
+        """Keys still in rotation, in pool order."""
+        with self._lock:
+            self._roll_day()
+            return [k for k in self.keys if k not in self._disabled]
+    
+    def choose(self, scheduler=None, exclude=()):
+        """
+        Pick the key for the next request, skipping `exclude`, or None if
+        every key is out of rotation.
+        """
+        with self._lock:
+            self._roll_day()
+            active = [k for k in self.keys if k not in self._disabled and k not in exclude]
+            if not active:
+                return None
+            if scheduler is not None:
+                key = max(active, key=lambda k: (scheduler.remaining(k), -self._requests[k]))
+            else:
+                key = min(active, key=lambda k: self._requests[k])
+            self._requests[key] += 1
+            return key
+    
+    def disable(self, key, reason="quotaExceeded"):
+        """Take a key out of rotation, until the next quota day for quota errors."""
+        with self._lock:
+            self._errors[key] += 1
+            self._disabled[key] = reason
+            if reason in QUOTA_ERROR_REASONS:
+                self._disabled_day[key] = self.day()
+            else:
+                self._disabled_day.pop(key, None)
+    
+    def record_error(self, key):
+        """Count an error against a key that stays in rotation."""
+        with self._lock:
+            self._errors[key] += 1
+    
+    def enable_all(self):
+        """Put every key back into rotation, e.g. after the daily quota reset."""
+        with self._lock:
+            self._disabled.clear()
+            self._disabled_day.clear()
+    
+    def usage(self, scheduler=None):
+        """
+        Per-key request and error counts, keyed by a masked key. With a
+        scheduler, each key's quota units used and remaining are included.
+        """
+        with self._lock:
+            self._roll_day()
+            usage = {
+                key: {
+                    "requests": self._requests[key],
+                    "errors": self._errors[key],
+                    "active": key not in self._disabled,
+                    "disabled_reason": self._disabled.get(key)
+                }
+                for key in self.keys
+            }
+        if scheduler is not None:
+            quota = scheduler.usage()
+            for key, entry in usage.items():
+                entry["used"] = quota.get(key, {}).get("used", 0)
+                entry["remaining"] = scheduler.remaining(key)
+        return {mask_key(key): entry for key, entry in usage.items()}
+    
+    def __len__(self):
+        return len(self.keys)
+
+
+def mask_key(key):
+    """Hide all but the last four characters of an API key."""
+    return "…" + key[-4:]
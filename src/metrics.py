@@ -2,6 +2,12 @@
 Metrics calculations for video performance analysis.
 """
 
+from bisect import bisect_left
+import time
+from .video import as_video, parse_timestamp
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
 
 def calculate_engagement_rate(likes, views):
     """Calculate engagement rate as percentage of likes to views."""
@@ -9,12 +15,18 @@ def calculate_engagement_rate(likes, views):
     return round(engagement, 2)
 
 
-def calculate_growth_score(views, days_old):
-    """Calculate growth score based on views per day."""
+def calculate_growth_score(views, days_old, views_per_day=None):
+    """
+    Calculate growth score based on views per day.
+    
+    `views_per_day` defaults to the lifetime average; pass a rate measured
+    between snapshots to score current momentum instead.
+    """
     if days_old == 0:
         days_old = 1
     
-    views_per_day = views / days_old
+    if views_per_day is None:
+        views_per_day = views / days_old
     
     if views_per_day > 1000000:
         score = 10.0
@@ -62,7 +74,262 @@ def calculate_performance_percentile(video_views, all_views):
         return 0
     
     sorted_views = sorted(all_views)
-    position = sorted_views.index(video_views)
+    position = bisect_left(sorted_views, video_views)
     percentile = (position / len(sorted_views)) * 100
     
     return round(percentile, 1)
+
+
+def analyze_video(d, views_per_day=None):
+    """
+    Calculate performance data for a single video (a Video or raw API dict).
+    
+    A measured `views_per_day` (e.g. from snapshots) replaces the lifetime
+    average in the growth score.
+    """
+    video = as_video(d)
+    
+    # Calculate engagement (0 for premieres and upcoming streams without views,
+    # like calculate_engagement_rates)
+    engagement = calculate_engagement_rate(video.likes, video.views) if video.views else 0.0
+    
+    # Calculate days since published
+    if video.published_ts is not None:
+        days_old = int((time.time() - video.published_ts) // SECONDS_PER_DAY)
+    else:
+        days_old = 0
+    
+    growth = calculate_growth_score(video.views, days_old, views_per_day)
+    
+    return {
+        "title": video.title,
+        "video_id": video.video_id,
+        "views": video.views,
+        "likes": video.likes,
+        "comments": video.comments,
+        "engagement_rate": engagement,
+        "growth_score": growth,
+        "days_old": days_old,
+        "published_at": video.published_at
+    }
+
+
+# Vectorized versions of the metrics above, operating on whole NumPy columns.
+# They match the scalar functions row for row, except that zero views give
+# an engagement rate of 0 instead of raising. Each imports NumPy itself, so
+# callers of the scalar metrics above never pay for loading it.
+
+def calculate_engagement_rates(likes, views):
+    """Calculate engagement rate for every row of the likes/views columns."""
+    import numpy as np
+    
+    likes = np.asarray(likes, dtype=np.float64)
+    views = np.asarray(views, dtype=np.float64)
+    engagement = np.divide(likes, views, out=np.zeros_like(likes), where=views != 0) * 100
+    return np.round(engagement, 2)
+
+
+GROWTH_THRESHOLDS = (10000, 50000, 100000, 500000, 1000000)
+GROWTH_SCORES = (1.0, 2.0, 4.0, 6.0, 8.0, 10.0)
+
+
+def calculate_growth_scores(views, days_old, views_per_day=None):
+    """
+    Calculate growth score for every row of the views/days_old columns.
+    
+    A `views_per_day` column of measured rates replaces the lifetime
+    average row by row; NaN entries keep the lifetime average.
+    """
+    import numpy as np
+    
+    days_old = np.maximum(np.asarray(days_old, dtype=np.int64), 1)
+    lifetime = np.asarray(views, dtype=np.float64) / days_old
+    if views_per_day is None:
+        views_per_day = lifetime
+    else:
+        views_per_day = np.asarray(views_per_day, dtype=np.float64)
+        views_per_day = np.where(np.isnan(views_per_day), lifetime, views_per_day)
+    
+    # side="left" places a value equal to a threshold below it, matching the
+    # strict ">" comparisons in calculate_growth_score
+    thresholds = np.array(GROWTH_THRESHOLDS, dtype=np.float64)
+    score = np.array(GROWTH_SCORES)[np.searchsorted(thresholds, views_per_day, side="left")]
+    
+    # Apply recency bonus
+    bonus = np.where(days_old < 7, 1.5, np.where(days_old < 30, 1.2, 1.0))
+    return np.round(score * bonus, 2)
+
+
+def calculate_virality_indices(views, likes, comments, days_old):
+    """Classify every row as "viral", "trending" or "normal"."""
+    import numpy as np
+    
+    views = np.asarray(views, dtype=np.float64)
+    likes = np.asarray(likes, dtype=np.float64)
+    comments = np.asarray(comments, dtype=np.float64)
+    days_old = np.maximum(np.asarray(days_old, dtype=np.int64), 1)
+    
+    interactions = likes * 2 + comments * 3
+    interaction_score = np.divide(interactions, views, out=np.zeros_like(views), where=views > 0)
+    velocity = views / days_old
+    
+    virality = (interaction_score * 1000) + (velocity / 10000)
+    
+    return np.where(virality > 0.02, "viral", np.where(virality > 0.01, "trending", "normal"))
+
+
+def calculate_percentiles(values):
+    """
+    Percentile of every value against the whole column, sorting only once.
+    
+    Same definition as calculate_performance_percentile: the share of values
+    strictly below, so tied values always share a percentile.
+    """
+    import numpy as np
+    
+    values = np.asarray(values)
+    if not len(values):
+        return np.zeros(0)
+    
+    below = np.searchsorted(np.sort(values), values, side="left")
+    return np.round(below / len(values) * 100, 1)
+
+
+def calculate_ranks(values):
+    """Rank every value, 1 for the highest; ties share the best rank (1, 2, 2, 4)."""
+    import numpy as np
+    
+    values = np.asarray(values)
+    not_above = np.searchsorted(np.sort(values), values, side="right")
+    return (len(values) - not_above + 1).astype(np.int64)
+
+
+# Commenters tracked exactly before TopCounter starts approximating
+DEFAULT_TOP_CAPACITY = 1024
+
+
+class TopCounter:
+    """
+    Counts of the most frequent keys in a stream, in at most `capacity`
+    counters (Misra-Gries).
+    
+    Exact while there are no more than `capacity` distinct keys; beyond
+    that each count is underestimated by at most total / (capacity + 1),
+    so heavy hitters are always kept. Summaries merge into one with the
+    same bound.
+    """
+    
+    def __init__(self, capacity=DEFAULT_TOP_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self.counts = {}
+    
+    def add(self, key, count=1):
+        self.total += count
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0) + count
+            return
+        # Full: charge every counter (and the new key) until one drops out
+        decrement = min(count, min(self.counts.values()))
+        self.counts = {k: c - decrement for k, c in self.counts.items() if c > decrement}
+        if count > decrement:
+            self.counts[key] = count - decrement
+    
+    def merge(self, other):
+        """Fold another summary's counts into this one."""
+        self.total += other.total
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        if len(self.counts) > self.capacity:
+            cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {k: c - cut for k, c in self.counts.items() if c > cut}
+        return self
+    
+    def most_common(self, n):
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+    
+    def share(self, n):
+        """Percentage of the stream taken by the `n` most frequent keys (a lower bound)."""
+        if not self.total:
+            return 0
+        return round(sum(count for _, count in self.most_common(n)) / self.total * 100, 2)
+
+
+class CommentStats:
+    """
+    Running conversation metrics over one video's comment threads.
+    
+    Threads are folded in one at a time and only counters and a bounded
+    TopCounter of commenters are kept, so a viral video's comments can be
+    streamed through without being held in memory. Stats for several
+    videos merge() into channel-level totals.
+    """
+    
+    def __init__(self, top_capacity=DEFAULT_TOP_CAPACITY):
+        self.threads = 0
+        self.replies = 0
+        self.max_replies = 0
+        self.threads_with_replies = 0
+        self.likes = 0
+        self.first_ts = None
+        self.commenters = TopCounter(top_capacity)
+    
+    def add(self, published_ts=None, author=None, replies=0, likes=0):
+        """Fold in one top-level comment and the size of its reply chain."""
+        self.threads += 1
+        self.replies += replies
+        self.likes += likes
+        if replies:
+            self.threads_with_replies += 1
+            self.max_replies = max(self.max_replies, replies)
+        if published_ts is not None and (self.first_ts is None or published_ts < self.first_ts):
+            self.first_ts = published_ts
+        if author is not None:
+            self.commenters.add(author)
+    
+    def add_thread(self, item):
+        """Fold in a `commentThreads` API item."""
+        snippet = item.get("snippet", {})
+        comment = snippet.get("topLevelComment", {}).get("snippet", {})
+        self.add(
+            published_ts=parse_timestamp(comment.get("publishedAt", "")),
+            author=comment.get("authorChannelId", {}).get("value"),
+            replies=int(snippet.get("totalReplyCount", 0)),
+            likes=int(comment.get("likeCount", 0))
+        )
+    
+    def update(self, items):
+        for item in items:
+            self.add_thread(item)
+        return self
+    
+    def merge(self, other):
+        self.threads += other.threads
+        self.replies += other.replies
+        self.max_replies = max(self.max_replies, other.max_replies)
+        self.threads_with_replies += other.threads_with_replies
+        self.likes += other.likes
+        if other.first_ts is not None and (self.first_ts is None or other.first_ts < self.first_ts):
+            self.first_ts = other.first_ts
+        self.commenters.merge(other.commenters)
+        return self
+    
+    def to_metrics(self, now=None, top=10):
+        """
+        Comment velocity (comments and replies per day since the oldest
+        comment seen, at least one day), reply depth and the share of
+        comments written by the `top` most active commenters.
+        """
+        now = time.time() if now is None else now
+        comments = self.threads + self.replies
+        days = 1 if self.first_ts is None else max((now - self.first_ts) / SECONDS_PER_DAY, 1)
+        return {
+            "comment_threads": self.threads,
+            "comments": comments,
+            "comments_per_day": round(comments / days, 2),
+            "average_replies": round(self.replies / self.threads, 2) if self.threads else 0,
+            "max_replies": self.max_replies,
+            "reply_rate": round(self.threads_with_replies / self.threads * 100, 2) if self.threads else 0,
+            "comment_likes": self.likes,
+            "top_commenter_share": self.commenters.share(top)
+        }
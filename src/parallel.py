@@ -0,0 +1,208 @@
+"""
+Process-pool metric computation for large archives.
+
+The numeric columns of a VideoFrame live in one memory-mapped block file,
+on a RAM-backed filesystem where there is one. Each worker process maps
+it by path, scores its own row range with the vectorized metrics and
+writes the results back in place, returning only a small per-shard
+summary. No per-video data is pickled.
+
+Frames built with shared_frame() (or StatsArchive.to_frame(shared=True))
+already keep their columns in a block, so scoring them copies nothing;
+other frames have their input columns copied into a temporary block
+first, and take its output columns as they are.
+"""
+
+import os
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+from .frame import VideoFrame, days_since, RATE_COLUMN
+from .metrics import calculate_engagement_rates, calculate_growth_scores
+
+# Below this many rows the pool costs more than it saves
+MIN_PARALLEL_ROWS = 100_000
+
+# Row layout of the shared block: inputs, then the columns workers fill in
+INPUT_COLUMNS = ("views", "likes", "comments", "published_ts", "views_per_day")
+OUTPUT_COLUMNS = ("days_old", "engagement_rate", "growth_score")
+BLOCK_COLUMNS = INPUT_COLUMNS + OUTPUT_COLUMNS
+INT_COLUMNS = ("views", "likes", "comments", "days_old")
+
+SUMMED_COLUMNS = ("views", "likes", "comments", "engagement_rate", "growth_score", "days_old")
+BEST_COLUMNS = ("views", "engagement_rate")
+
+# Block files go to shared memory where the platform has it, else the temp dir
+BLOCK_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _columns(buf, rows):
+    """Name -> array views of every column in a shared block of `rows` rows."""
+    return {
+        name: np.ndarray(rows, dtype=np.int64 if name in INT_COLUMNS else np.float64,
+                         buffer=buf, offset=i * rows * 8)
+        for i, name in enumerate(BLOCK_COLUMNS)
+    }
+
+
+class SharedBlock:
+    """
+    BLOCK_COLUMNS for `rows` rows in one memory-mapped file that workers
+    map by path. The file is removed once the block is garbage collected;
+    arrays taken from `columns` stay valid after that.
+    """
+    
+    def __init__(self, rows):
+        fd, self.path = tempfile.mkstemp(prefix="videoframe-", suffix=".block", dir=BLOCK_DIR)
+        try:
+            # A zero-length file cannot be mapped
+            os.ftruncate(fd, max(rows, 1) * 8 * len(BLOCK_COLUMNS))
+        finally:
+            os.close(fd)
+        weakref.finalize(self, os.unlink, self.path)
+        self.rows = rows
+        self.columns = _columns(np.memmap(self.path, mode="r+"), rows)
+    
+    def holds(self, frame):
+        """Whether every block column of `frame` is still this block's array."""
+        return all(frame[name] is column for name, column in self.columns.items())
+
+
+# Frames built by shared_frame() -> the block holding their numeric columns
+_blocks = weakref.WeakKeyDictionary()
+
+
+def shared_frame(**columns):
+    """
+    A VideoFrame like VideoFrame(**columns) whose numeric columns are
+    allocated in a SharedBlock, so score_frame() shares them with its
+    workers without copying. The block lives as long as the frame.
+    """
+    block = SharedBlock(len(columns["views"]))
+    block.columns[RATE_COLUMN][:] = np.nan
+    for name, column in block.columns.items():
+        if columns.get(name) is not None:
+            column[:] = columns[name]
+    frame = VideoFrame(**dict(columns, **block.columns))
+    _blocks[frame] = block
+    return frame
+
+
+class ShardSummary:
+    """
+    Count, column sums and best rows of a range of scored rows.
+    
+    Summaries of consecutive shards merge into the summary of their
+    union; ties on the best rows go to the earlier row, as in VideoAggregate.
+    """
+    
+    __slots__ = ("count", "sums", "best")
+    
+    def __init__(self, count=0, sums=None, best=None):
+        self.count = count
+        self.sums = sums or dict.fromkeys(SUMMED_COLUMNS, 0)
+        # metric -> (value, row index)
+        self.best = best or {}
+    
+    @classmethod
+    def from_columns(cls, columns, start=0):
+        count = len(columns["views"])
+        if not count:
+            return cls()
+        sums = {name: columns[name].sum().item() for name in SUMMED_COLUMNS}
+        best = {}
+        for name in BEST_COLUMNS:
+            i = int(columns[name].argmax())
+            best[name] = (columns[name][i].item(), start + i)
+        return cls(count, sums, best)
+    
+    def merge(self, other):
+        self.count += other.count
+        for name in SUMMED_COLUMNS:
+            self.sums[name] += other.sums[name]
+        for name, (value, index) in other.best.items():
+            current = self.best.get(name)
+            if current is None or value > current[0] or (value == current[0] and index < current[1]):
+                self.best[name] = (value, index)
+        return self
+    
+    def to_comparison(self, frame):
+        """The get_comparison_data() dict for `frame`, whose rows this summary covers."""
+        if not self.count:
+            return {}
+        
+        return {
+            "total_videos": self.count,
+            "total_views": self.sums["views"],
+            "total_likes": self.sums["likes"],
+            "total_comments": self.sums["comments"],
+            "average_views": self.sums["views"] / self.count,
+            "average_likes": self.sums["likes"] / self.count,
+            "average_engagement": self.sums["engagement_rate"] / self.count,
+            "top_performer": frame.record(self.best["views"][1]),
+            "best_engagement": frame.record(self.best["engagement_rate"][1])
+        }
+
+
+def _score(columns, start, stop, now):
+    shard = {name: column[start:stop] for name, column in columns.items()}
+    shard["days_old"][:] = days_since(shard["published_ts"], now)
+    shard["engagement_rate"][:] = calculate_engagement_rates(shard["likes"], shard["views"])
+    shard["growth_score"][:] = calculate_growth_scores(shard["views"], shard["days_old"], shard["views_per_day"])
+    return ShardSummary.from_columns(shard, start)
+
+
+def _score_shard(block_path, rows, start, stop, now):
+    """Worker entry point: score rows [start, stop) of the block file at `block_path`."""
+    columns = _columns(np.memmap(block_path, mode="r+"), rows)
+    return _score(columns, start, stop, now)
+
+
+def shard_bounds(rows, shards):
+    """(start, stop) row ranges splitting `rows` into `shards` near-equal parts."""
+    edges = np.linspace(0, rows, shards + 1).astype(np.int64)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def score_frame(frame, workers=None, now=None, executor=None):
+    """
+    Recompute days_old, engagement_rate and growth_score of every row in
+    `frame` in place, sharded across `workers` processes (default: every
+    core). Returns the merged ShardSummary of the whole frame.
+    
+    Small frames are scored in-process. Pass a ProcessPoolExecutor as
+    `executor` to reuse one pool across calls. Frames from shared_frame()
+    are scored without copying; any other frame has its inputs copied
+    into a block once and ends up with that block's output columns.
+    """
+    rows = len(frame)
+    workers = workers or os.cpu_count() or 1
+    now = now or datetime.now(timezone.utc)
+    
+    if rows < MIN_PARALLEL_ROWS or workers == 1:
+        # The frame's own columns are scored in place
+        return _score({name: frame[name] for name in BLOCK_COLUMNS}, 0, rows, now)
+    
+    block = _blocks.get(frame)
+    if block is None or not block.holds(frame):
+        block = SharedBlock(rows)
+        for name in INPUT_COLUMNS:
+            block.columns[name][:] = frame[name]
+        for name in OUTPUT_COLUMNS:
+            setattr(frame, name, block.columns[name])
+    
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            pool.submit(_score_shard, block.path, rows, start, stop, now)
+            for start, stop in shard_bounds(rows, workers)
+        ]
+        summary = ShardSummary()
+        for future in futures:
+            summary.merge(future.result())
+        return summary
+    finally:
+        if executor is None:
+            pool.shutdown()
@@ -0,0 +1,146 @@
+"""
+Indexed range and text queries over a VideoFrame.
+
+A VideoIndex keeps each range column (views, engagement, growth, publish
+time) in sorted order and an inverted index from word tokens to rows, so
+a query looks up every predicate's candidate rows by binary search or
+dictionary lookup, starts from the smallest set and checks the others
+only on those rows, instead of scanning the whole catalogue.
+"""
+
+import re
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
+from .frame import VideoFrame
+from .video import as_video
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# search() keyword prefix -> VideoFrame column
+RANGE_COLUMNS = {
+    "views": "views",
+    "engagement": "engagement_rate",
+    "growth": "growth_score"
+}
+INDEXED_COLUMNS = tuple(RANGE_COLUMNS.values()) + ("published_ts",)
+
+
+def tokenize(text):
+    """Case-folded word tokens of `text`, as used on both sides of a text query."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def video_text(video):
+    """Searchable text of a Video: its title, plus tags and description if the raw payload was kept."""
+    snippet = (video.raw or {}).get("snippet", {})
+    return " ".join([video.title, *snippet.get("tags", ()), snippet.get("description", "")])
+
+
+def _timestamp(value):
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+class VideoIndex:
+    """
+    Range and full-text indexes over a frame's rows.
+    
+    `texts` holds the searchable text of each row (default: its title).
+    The index is a snapshot of the frame; build a new one when the
+    catalogue changes.
+    """
+    
+    def __init__(self, frame, texts=None):
+        self.frame = frame
+        self._sorted = {}
+        self._ranks = {}
+        for column in INDEXED_COLUMNS:
+            values = frame[column]
+            order = np.argsort(values, kind="stable")
+            ranks = np.empty_like(order)
+            ranks[order] = np.arange(len(order))
+            # NaN (unknown publish time) sorts last and never matches a range
+            self._sorted[column] = (values[order], order, int(np.count_nonzero(~np.isnan(values))))
+            self._ranks[column] = ranks
+        
+        postings = defaultdict(list)
+        for row, text in enumerate(frame.title if texts is None else texts):
+            for token in set(tokenize(text)):
+                postings[token].append(row)
+        self._postings = {token: np.array(rows, dtype=np.intp) for token, rows in postings.items()}
+        self._no_rows = np.empty(0, dtype=np.intp)
+    
+    @classmethod
+    def from_videos(cls, videos, now=None):
+        """Index Video records or raw API items, searching tags and descriptions where present."""
+        videos = [as_video(d, keep_raw=True) for d in videos]
+        return cls(VideoFrame.from_videos(videos, now=now), [video_text(v) for v in videos])
+    
+    def __len__(self):
+        return len(self.frame)
+    
+    def _range(self, column, low, high, high_side="right"):
+        """(size, rows, check) for low <= column <= high (< high with side "left")."""
+        values, order, finite = self._sorted[column]
+        lo = 0 if low is None else int(np.searchsorted(values[:finite], low, side="left"))
+        hi = finite if high is None else int(np.searchsorted(values[:finite], high, side=high_side))
+        hi = max(lo, hi)
+        ranks = self._ranks[column]
+        
+        def check(rows):
+            rank = ranks[rows]
+            return (rank >= lo) & (rank < hi)
+        
+        return hi - lo, lambda: np.sort(order[lo:hi]), check
+    
+    def _token(self, token):
+        """(size, rows, check) for rows containing `token`."""
+        posting = self._postings.get(token, self._no_rows)
+        
+        def check(rows):
+            if not len(posting):
+                return np.zeros(len(rows), dtype=bool)
+            i = np.minimum(np.searchsorted(posting, rows), len(posting) - 1)
+            return posting[i] == rows
+        
+        return len(posting), lambda: posting, check
+    
+    def search(self, text=None, published_after=None, published_before=None, **ranges):
+        """
+        Rows matching every given predicate, in frame order.
+        
+        `text` matches rows containing all of its tokens. Ranges are passed
+        as min_/max_ views, engagement or growth (both inclusive);
+        `published_after` (inclusive) and `published_before` (exclusive)
+        take datetimes or epoch seconds.
+        """
+        predicates = []
+        for name in ranges:
+            bound, _, key = name.partition("_")
+            if bound not in ("min", "max") or key not in RANGE_COLUMNS:
+                raise TypeError(f"search() got an unexpected keyword argument {name!r}")
+        for key, column in RANGE_COLUMNS.items():
+            low, high = ranges.get(f"min_{key}"), ranges.get(f"max_{key}")
+            if low is not None or high is not None:
+                predicates.append(self._range(column, low, high))
+        if published_after is not None or published_before is not None:
+            predicates.append(self._range("published_ts", _timestamp(published_after),
+                                          _timestamp(published_before), high_side="left"))
+        if text is not None:
+            predicates.extend(self._token(token) for token in dict.fromkeys(tokenize(text)))
+        
+        if not predicates:
+            return np.arange(len(self.frame))
+        
+        # Materialize the most selective predicate; filter its rows through the rest
+        predicates.sort(key=lambda predicate: predicate[0])
+        rows = predicates[0][1]()
+        for _, _, check in predicates[1:]:
+            if not len(rows):
+                break
+            rows = rows[check(rows)]
+        return rows
+    
+    def select(self, text=None, **predicates):
+        """The frame rows matching search(), as a new VideoFrame."""
+        return self.frame[self.search(text, **predicates)]
@@ -0,0 +1,81 @@
+"""
+Maintained sorted index for percentile and rank lookups on one metric.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+import numpy as np
+
+
+class RankIndex:
+    """
+    Sorted values of a single metric (views, engagement_rate, ...).
+    
+    New videos are inserted in place, so percentiles and ranks over a large
+    catalogue stay cheap to query without re-sorting after every update.
+    Percentiles and ranks follow calculate_percentiles / calculate_ranks.
+    """
+    
+    def __init__(self, values=()):
+        self._values = sorted(values)
+        self._array = None
+    
+    @classmethod
+    def from_frame(cls, frame, metric="views"):
+        """Index one column of a VideoFrame."""
+        return cls(frame[metric].tolist())
+    
+    def add(self, value):
+        insort(self._values, value)
+        self._array = None
+    
+    def update(self, values):
+        values = list(values)
+        if len(values) > len(self._values) // 8:
+            # Bulk loads are cheaper to merge with one sort than insert one by one
+            self._values = sorted(self._values + values)
+        else:
+            for value in values:
+                insort(self._values, value)
+        self._array = None
+    
+    def remove(self, value):
+        i = bisect_left(self._values, value)
+        if i == len(self._values) or self._values[i] != value:
+            raise ValueError(f"{value!r} is not in the index")
+        del self._values[i]
+        self._array = None
+    
+    def percentile(self, value):
+        """Share of indexed values strictly below `value`, as a percentage."""
+        if not self._values:
+            return 0
+        return round(bisect_left(self._values, value) / len(self._values) * 100, 1)
+    
+    def rank(self, value):
+        """Rank `value` would have among the indexed values, 1 for the highest."""
+        return len(self._values) - bisect_right(self._values, value) + 1
+    
+    def _sorted_array(self):
+        if self._array is None:
+            self._array = np.asarray(self._values)
+        return self._array
+    
+    def percentiles(self, values):
+        """Vectorized percentile() for a whole column of values."""
+        values = np.asarray(values)
+        if not self._values:
+            return np.zeros(len(values))
+        below = np.searchsorted(self._sorted_array(), values, side="left")
+        return np.round(below / len(self._values) * 100, 1)
+    
+    def ranks(self, values):
+        """Vectorized rank() for a whole column of values."""
+        not_above = np.searchsorted(self._sorted_array(), np.asarray(values), side="right")
+        return (len(self._values) - not_above + 1).astype(np.int64)
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def __contains__(self, value):
+        i = bisect_left(self._values, value)
+        return i < len(self._values) and self._values[i] == value
@@ -0,0 +1,188 @@
+"""
+Quota-aware request scheduling for the YouTube Data API.
+
+Every request is charged its endpoint's quota cost against a per-key
+daily budget and drawn from a per-key token bucket, so crawls run as fast
+as the rate limit allows and stop cleanly before the quota wall.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except ZoneInfoNotFoundError:
+    # No tz database on this system; Pacific standard time is close enough
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+# Quota units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    "channels": 1,
+    "playlistItems": 1,
+    "videos": 1,
+    "commentThreads": 1,
+    "comments": 1,
+    "search": 100,
+}
+DEFAULT_COST = 1
+DEFAULT_DAILY_QUOTA = 10_000
+
+# Token bucket defaults, in quota units
+DEFAULT_RATE = 50.0
+DEFAULT_BURST = 100
+
+# Lower runs first: the newest uploads before the back catalogue
+PRIORITY_FRESH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_BACKLOG = 10
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a request would exceed a key's daily quota."""
+    
+    def __init__(self, key, message=None):
+        self.key = key
+        super().__init__(message or "Daily YouTube API quota exhausted")
+
+
+def quota_day(now=None):
+    """The quota day (quota resets at midnight Pacific time) for `now`."""
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(QUOTA_TIMEZONE).date()
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second, holding at most `capacity`."""
+    
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def take(self, tokens):
+        """
+        Take `tokens` if available and return 0; otherwise return how many
+        seconds to wait before they will be.
+        """
+        self._refill()
+        # A request costing more than the bucket holds may drain it completely
+        tokens = min(tokens, self.capacity)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0
+        return (tokens - self.tokens) / self.rate
+
+
+class RequestScheduler:
+    """
+    Admits API requests per key in priority order, within rate and quota.
+    
+    acquire() blocks until the request may be sent. Waiting requests for
+    the same key are released by priority, then arrival order.
+    """
+    
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, daily_quota=DEFAULT_DAILY_QUOTA,
+                 costs=None, clock=time.monotonic, day=quota_day):
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.costs = dict(QUOTA_COSTS, **(costs or {}))
+        self.clock = clock
+        self.day = day
+        self._buckets = {}
+        self._used = {}
+        self._requests = {}
+        self._exhausted = set()
+        self._waiting = {}
+        self._current_day = day()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+    
+    def cost(self, endpoint):
+        return self.costs.get(endpoint, DEFAULT_COST)
+    
+    def _roll_day(self):
+        today = self.day()
+        if today != self._current_day:
+            self._current_day = today
+            self._used.clear()
+            self._requests.clear()
+            self._exhausted.clear()
+    
+    def _bucket(self, key):
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(self.rate, self.burst, clock=self.clock)
+        return self._buckets[key]
+    
+    def _check_budget(self, key, cost):
+        if key in self._exhausted or self._used.get(key, 0) + cost > self.daily_quota:
+            raise QuotaExceededError(key)
+    
+    def acquire(self, endpoint, key="default", priority=PRIORITY_NORMAL):
+        """Block until a request to `endpoint` may be sent, then charge it."""
+        cost = self.cost(endpoint)
+        ticket = (priority, next(self._sequence))
+        
+        with self._condition:
+            self._roll_day()
+            self._check_budget(key, cost)
+            waiting = self._waiting.setdefault(key, [])
+            heapq.heappush(waiting, ticket)
+            try:
+                while True:
+                    if waiting[0] != ticket:
+                        self._condition.wait()
+                        continue
+                    
+                    self._roll_day()
+                    self._check_budget(key, cost)
+                    wait = self._bucket(key).take(cost)
+                    if wait == 0:
+                        break
+                    self._condition.wait(wait)
+                
+                self._used[key] = self._used.get(key, 0) + cost
+                self._requests[key] = self._requests.get(key, 0) + 1
+            finally:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._condition.notify_all()
+    
+    def exhaust(self, key="default"):
+        """Mark a key's quota as spent, e.g. after the API answers quotaExceeded."""
+        with self._condition:
+            self._exhausted.add(key)
+            self._condition.notify_all()
+    
+    def remaining(self, key="default"):
+        """Quota units left today for `key`."""
+        with self._condition:
+            self._roll_day()
+            if key in self._exhausted:
+                return 0
+            return max(self.daily_quota - self._used.get(key, 0), 0)
+    
+    def usage(self):
+        """Per-key requests sent, units used and units remaining today."""
+        with self._condition:
+            self._roll_day()
+            keys = set(self._used) | set(self._exhausted)
+        return {
+            key: {
+                "requests": self._requests.get(key, 0),
+                "used": self._used.get(key, 0),
+                "remaining": self.remaining(key),
+            }
+            for key in keys
+        }
@@ -0,0 +1,268 @@
+"""
+Local HTTP service exposing VideoAnalyzer results as JSON.
+
+An asyncio server (standard library only) wraps one shared VideoAnalyzer.
+Analysed channel results are cached in process for `ttl` seconds, and
+concurrent requests for the same channel wait on a single upstream fetch,
+so dashboards polling the same channel share one fetch's quota.
+
+    GET /channels/<id>/videos?count=5
+    GET /channels/<id>/comparison?count=5
+    GET /channels/<id>/top?count=5
+    GET /channels/<id>/filter?count=5&min_views=1000&min_engagement=2.5
+    GET /health
+"""
+
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs, unquote
+from .scheduler import QuotaExceededError
+from .youtube_client import ChannelNotFoundError
+
+DEFAULT_TTL = 5 * 60
+# Channel results kept at most; the soonest to expire are evicted first
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_COUNT = 5
+MAX_COUNT = 500
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           429: "Too Many Requests", 502: "Bad Gateway"}
+
+
+class HTTPError(Exception):
+    """An error response with a status code."""
+    
+    def __init__(self, status, message):
+        self.status = status
+        super().__init__(message)
+
+
+def _query_number(query, name, cast, default=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return cast(values[-1])
+    except ValueError:
+        raise HTTPError(400, f"{name} must be a number") from None
+
+
+class ResultCache:
+    """
+    Per-channel analysis results with a TTL, plus the in-flight fetches
+    that concurrent identical requests merge into. Expired results are
+    dropped as new ones arrive, and at most `max_entries` are kept.
+    """
+    
+    def __init__(self, ttl=DEFAULT_TTL, clock=time.monotonic, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.merged = 0
+        self._results = {}
+        self._inflight = {}
+    
+    async def get(self, key, fetch):
+        """Cached results for `key`, awaiting `fetch()` (at most once at a time) when stale."""
+        entry = self._results.get(key)
+        if entry is not None and entry[0] > self.clock():
+            self.hits += 1
+            return entry[1]
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.merged += 1
+            return await asyncio.shield(inflight)
+        
+        self.misses += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            results = await fetch()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unshared failure is not logged
+            future.exception()
+            raise
+        else:
+            self._store(key, results)
+            future.set_result(results)
+            return results
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                # The leading request was cancelled; fail the requests merged into it
+                future.set_exception(RuntimeError("Upstream fetch was cancelled"))
+                future.exception()
+    
+    def _store(self, key, results):
+        now = self.clock()
+        # Re-inserting keeps the dict in expiry order, since every entry lives `ttl`
+        self._results.pop(key, None)
+        self._results[key] = (now + self.ttl, results)
+        while self._results:
+            oldest, (expires, _) = next(iter(self._results.items()))
+            if expires > now and len(self._results) <= self.max_entries:
+                break
+            del self._results[oldest]
+    
+    def invalidate(self, key=None):
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+    
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "merged": self.merged, "entries": len(self._results)}
+
+
+class AnalysisService:
+    """
+    Routes JSON requests to a shared VideoAnalyzer.
+    
+    Blocking client calls run on the default thread pool so one slow
+    channel never stalls the event loop.
+    """
+    
+    def __init__(self, analyzer, ttl=DEFAULT_TTL, max_count=MAX_COUNT, clock=time.monotonic):
+        self.analyzer = analyzer
+        self.max_count = max_count
+        self.results = ResultCache(ttl, clock)
+    
+    def _analyze(self, channel_id, count):
+        videos = self.analyzer.stream_channel_videos(channel_id, limit=count)
+        return self.analyzer.analyze_videos(videos)
+    
+    async def channel_results(self, channel_id, count=DEFAULT_COUNT):
+        """analyze_videos() results for a channel's latest `count` videos, cached and merged."""
+        return await self.results.get(
+            (channel_id, count), lambda: asyncio.to_thread(self._analyze, channel_id, count)
+        )
+    
+    async def handle(self, method, target):
+        """Answer one request; returns (status, JSON-serializable body)."""
+        try:
+            if method != "GET":
+                raise HTTPError(405, f"{method} is not supported")
+            return 200, await self._route(target)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except QuotaExceededError as e:
+            return 429, {"error": str(e)}
+        except ChannelNotFoundError as e:
+            return 404, {"error": str(e)}
+        except Exception as e:
+            # Upstream failures (and bugs) are never cached, so the next request retries
+            return 502, {"error": str(e)}
+    
+    async def _route(self, target):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = parse_qs(url.query)
+        
+        if parts == ["health"]:
+            return {"status": "ok", "cache": self.results.stats}
+        if len(parts) != 3 or parts[0] != "channels":
+            raise HTTPError(404, f"No route for {url.path}")
+        
+        channel_id, view = parts[1], parts[2]
+        count = _query_number(query, "count", int, DEFAULT_COUNT)
+        if not 1 <= count <= self.max_count:
+            raise HTTPError(400, f"count must be between 1 and {self.max_count}")
+        
+        if view == "videos":
+            return await self.channel_results(channel_id, count)
+        if view == "comparison":
+            return self.analyzer.get_comparison_data(await self.channel_results(channel_id, count))
+        if view == "top":
+            return self.analyzer.get_top_performer(await self.channel_results(channel_id, count))
+        if view == "filter":
+            min_views = _query_number(query, "min_views", int)
+            min_engagement = _query_number(query, "min_engagement", float)
+            return self.analyzer.filter_by_performance(
+                await self.channel_results(channel_id, count), min_views=min_views, min_engagement=min_engagement
+            )
+        raise HTTPError(404, f"No route for {url.path}")
+    
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = not request_line.rstrip().endswith(b"HTTP/1.0")
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "connection":
+                        keep_alive = value.strip().lower() == "keep-alive"
+                
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    status, body = 400, {"error": "Malformed request line"}
+                    keep_alive = False
+                else:
+                    status, body = await self.handle(method, target)
+                
+                payload = json.dumps(body, ensure_ascii=False).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening; returns the asyncio Server."""
+        return await asyncio.start_server(self._handle_connection, host, port)
+    
+    async def serve_forever(self, host="127.0.0.1", port=0):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class ServiceThread:
+    """An AnalysisService running on its own event loop in a daemon thread."""
+    
+    def __init__(self, service, host="127.0.0.1", port=0):
+        self.service = service
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(service.start(host, port))
+        self.server_port = self.server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+    
+    def shutdown(self):
+        async def stop():
+            self.server.close()
+            # Idle keep-alive connections would otherwise outlive the loop
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.server.wait_closed()
+        
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+def serve_analysis(analyzer, port, host="127.0.0.1", ttl=DEFAULT_TTL):
+    """Serve the analysis API from a daemon thread; returns it (call shutdown() to stop)."""
+    return ServiceThread(AnalysisService(analyzer, ttl=ttl), host, port)
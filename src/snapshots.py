@@ -0,0 +1,171 @@
+"""
+Local SQLite store of per-video statistics snapshots.
+
+Snippet fields are stored once per video; statistics are appended as
+timestamped snapshots, so repeat runs only need fresh statistics and
+growth can be measured between snapshots instead of over a video's life.
+"""
+
+import sqlite3
+import threading
+import time
+from .video import Video
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT,
+    title TEXT NOT NULL,
+    published_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    video_id TEXT NOT NULL REFERENCES videos(video_id),
+    taken_at REAL NOT NULL,
+    views INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    PRIMARY KEY (video_id, taken_at)
+);
+CREATE INDEX IF NOT EXISTS videos_by_channel ON videos (channel_id, published_at);
+"""
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class SnapshotStore:
+    """
+    Video metadata and statistics history backed by SQLite.
+    
+    Pass ":memory:" (the default) for a throwaway store. Connections are
+    shared across threads behind a lock.
+    """
+    
+    def __init__(self, path=":memory:", clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+    
+    def record(self, videos, taken_at=None):
+        """
+        Store API `videos` items (or Video records): snippet fields for new
+        videos, plus a statistics snapshot for every item with statistics.
+        """
+        taken_at = self.clock() if taken_at is None else taken_at
+        videos = [d.to_api() if isinstance(d, Video) else d for d in videos]
+        
+        metadata = [
+            (d["id"], d["snippet"].get("channelId"), d["snippet"].get("title", "Unknown"),
+             d["snippet"].get("publishedAt", ""))
+            for d in videos if "snippet" in d
+        ]
+        stats = [
+            (d["id"], taken_at, int(d["statistics"].get("viewCount", 0)),
+             int(d["statistics"].get("likeCount", 0)), int(d["statistics"].get("commentCount", 0)))
+            for d in videos if "statistics" in d
+        ]
+        
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?)", metadata
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)", stats
+            )
+    
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    def _latest_rows(self, video_ids):
+        """Latest snapshot joined with metadata for each known video ID."""
+        rows = {}
+        for i in range(0, len(video_ids), 500):
+            batch = video_ids[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            for row in self._query(f"""
+                SELECT v.video_id, v.channel_id, v.title, v.published_at,
+                       s.taken_at, s.views, s.likes, s.comments
+                FROM videos v
+                LEFT JOIN snapshots s ON s.video_id = v.video_id
+                    AND s.taken_at = (SELECT MAX(taken_at) FROM snapshots WHERE video_id = v.video_id)
+                WHERE v.video_id IN ({placeholders})
+            """, batch):
+                rows[row[0]] = row
+        return rows
+    
+    def known_video_ids(self, video_ids):
+        """The subset of `video_ids` whose snippet fields are already stored."""
+        return set(self._latest_rows(list(video_ids)))
+    
+    def stale_video_ids(self, video_ids, max_age):
+        """Known videos whose latest snapshot is older than `max_age` seconds, in order."""
+        now = self.clock()
+        rows = self._latest_rows(list(video_ids))
+        return [
+            video_id for video_id in video_ids
+            if video_id in rows and (rows[video_id][4] is None or now - rows[video_id][4] >= max_age)
+        ]
+    
+    def latest_video_ids(self, channel_id, limit=None):
+        """A channel's stored video IDs, most recently published first."""
+        return [row[0] for row in self._query(
+            "SELECT video_id FROM videos WHERE channel_id = ? ORDER BY published_at DESC LIMIT ?",
+            (channel_id, -1 if limit is None else limit)
+        )]
+    
+    def get_videos(self, video_ids):
+        """
+        Stored videos as API-shaped items (id, snippet, latest statistics),
+        in the order given. Unknown IDs are skipped.
+        """
+        rows = self._latest_rows(list(video_ids))
+        videos = []
+        for video_id in video_ids:
+            if video_id not in rows:
+                continue
+            _, channel_id, title, published_at, taken_at, views, likes, comments = rows[video_id]
+            video = {
+                "id": video_id,
+                "snippet": {"channelId": channel_id, "title": title, "publishedAt": published_at}
+            }
+            if taken_at is not None:
+                video["statistics"] = {
+                    "viewCount": str(views),
+                    "likeCount": str(likes),
+                    "commentCount": str(comments)
+                }
+            videos.append(video)
+        return videos
+    
+    def history(self, video_id):
+        """Every snapshot for a video as (taken_at, views, likes, comments), oldest first."""
+        return self._query(
+            "SELECT taken_at, views, likes, comments FROM snapshots WHERE video_id = ? ORDER BY taken_at",
+            (video_id,)
+        )
+    
+    def views_per_day(self, video_id):
+        """Views per day between the two latest snapshots, or None with fewer than two."""
+        rows = self._query(
+            "SELECT taken_at, views FROM snapshots WHERE video_id = ? ORDER BY taken_at DESC LIMIT 2",
+            (video_id,)
+        )
+        if len(rows) < 2:
+            return None
+        (latest_at, latest_views), (previous_at, previous_views) = rows
+        elapsed_days = (latest_at - previous_at) / SECONDS_PER_DAY
+        if elapsed_days <= 0:
+            return None
+        return max(latest_views - previous_views, 0) / elapsed_days
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
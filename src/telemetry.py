@@ -0,0 +1,257 @@
+"""
+Counters and latency histograms for the client, analyzer and formatters.
+
+Hooks on the hot path report into the module-level TELEMETRY registry,
+which is disabled by default so an uninstrumented run pays only an
+attribute check per hook. main.py enables it for --profile and the
+Prometheus exports.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+PREFIX = "video_analyzer_"
+
+# Seconds; spans a local cache hit to a slow API page
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    "api_requests_total": "YouTube API requests sent, by endpoint and HTTP status",
+    "api_request_seconds": "YouTube API request latency in seconds, by endpoint",
+    "api_response_bytes_total": "YouTube API response bytes received, by endpoint",
+    "quota_units_total": "YouTube API quota units spent, by endpoint",
+    "cache_lookups_total": "Response cache lookups, by result",
+    "json_decode_seconds": "Time spent decoding API response JSON, by endpoint",
+    "stage_seconds": "Time spent in analysis and formatting stages",
+    "videos_analyzed_total": "Videos run through analyze_video",
+}
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+    
+    def quantile(self, q):
+        """Upper bucket bound holding the `q` quantile (the max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class _Timer:
+    __slots__ = ("telemetry", "name", "labels", "start")
+    
+    def __init__(self, telemetry, name, labels):
+        self.telemetry = telemetry
+        self.name = name
+        self.labels = labels
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.telemetry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Telemetry:
+    """
+    Thread-safe registry of labelled counters and histograms.
+    
+    count(), observe() and timer() do nothing until enable() is called.
+    """
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.enabled = False
+        self.buckets = buckets
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+    
+    def enable(self):
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+    
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+    
+    def timer(self, name, **labels):
+        """Context manager observing the time spent inside it."""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, name, labels)
+    
+    def timed(self, stage):
+        """Decorator timing every call into the `stage_seconds` histogram."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self, "stage_seconds", {"stage": stage}):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def counter(self, name, **labels):
+        """Current value of a counter (0 if never incremented)."""
+        return self._counters.get((name, _label_key(labels)), 0)
+    
+    def total(self, name, **labels):
+        """Sum of a counter across every label set matching `labels`."""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(
+                value for (counter, label_key), value in self._counters.items()
+                if counter == name and wanted <= set(label_key)
+            )
+    
+    def histogram(self, name, **labels):
+        """The histogram for `name` and `labels`, or None if nothing was observed."""
+        return self._histograms.get((name, _label_key(labels)))
+    
+    def to_prometheus(self):
+        """Every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            histograms = [(key, list(h.counts), h.sum, h.count) for key, h in histograms]
+        
+        lines = []
+        described = set()
+        
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {PREFIX}{name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        
+        for (name, labels), value in counters:
+            describe(name, "counter")
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+        
+        for (name, labels), counts, total, count in histograms:
+            describe(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', repr(bound))])} {cumulative}")
+            lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {count}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path):
+        """Write the exposition to `path`, e.g. for node_exporter's textfile collector."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        # Scrapers must never see a half-written file
+        os.replace(tmp_path, path)
+    
+    def summary(self):
+        """Per-histogram (name, labels, count, total, mean, p95, max) rows, slowest total first."""
+        with self._lock:
+            rows = [
+                (name, dict(labels), h.count, h.sum, h.sum / h.count if h.count else 0.0, h.quantile(0.95), h.max)
+                for (name, labels), h in self._histograms.items()
+            ]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+TELEMETRY = Telemetry()
+
+
+def serve_prometheus(port, telemetry=TELEMETRY, host="127.0.0.1"):
+    """Serve `/metrics` from a daemon thread; returns the server (call shutdown() to stop)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            payload = telemetry.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,87 @@
+"""
+HTTP transport with pooled, keep-alive connections for the YouTube API.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "qformedia-video-analyzer (gzip)",
+}
+
+
+class HTTPTransport:
+    """
+    Pooled HTTP transport shared by every request a client makes.
+    
+    All sessions mount the same HTTPAdapter, so connections to the API host
+    are kept alive and reused instead of paying a TCP+TLS handshake per call.
+    `requests.Session` is not thread-safe, so each thread gets its own
+    session; the adapter's urllib3 pool underneath is shared and is.
+    Sessions are kept per thread and those of exited threads dropped, so
+    short-lived worker threads do not pile up sessions.
+    """
+    
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT,
+                 max_retries=0, headers=None):
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=False
+        )
+        self._local = threading.local()
+        # Thread -> its session
+        self._sessions = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """The calling thread's session, created on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self._local.session = session
+            with self._lock:
+                # A dead thread's connections are back in the shared pool; only its session is left
+                for thread in [t for t in self._sessions if not t.is_alive()]:
+                    del self._sessions[thread]
+                self._sessions[threading.current_thread()] = session
+        return session
+    
+    def fetch(self, url, params=None, headers=None):
+        """Send a GET request and return the raw response."""
+        return self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+    
+    def get(self, url, params=None):
+        """Send a GET request and return the decoded JSON body."""
+        return self.fetch(url, params=params).json()
+    
+    def close(self):
+        """Close every session and drop the pooled connections."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+        self.adapter.close()
+        self._local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
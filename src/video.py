@@ -0,0 +1,90 @@
+"""
+Compact typed record for a single video.
+"""
+
+from datetime import datetime, timezone
+
+
+def parse_timestamp(published):
+    """Epoch seconds for an API ISO-8601 timestamp, or None if it is empty."""
+    if not published:
+        return None
+    return datetime.fromisoformat(published.replace("Z", "+00:00")).timestamp()
+
+
+def format_timestamp(published_ts):
+    """API-style ISO-8601 string ("...Z") for epoch seconds, or "" for None."""
+    if published_ts is None:
+        return ""
+    return datetime.fromtimestamp(published_ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Video:
+    """
+    The fields the analyzer reads from a `videos` API item, parsed once.
+    
+    Counts are ints and the publish time is epoch seconds. The raw API
+    payload (descriptions, thumbnails, tags, ...) is dropped unless
+    `keep_raw` is passed to from_api().
+    """
+    
+    __slots__ = ("video_id", "channel_id", "title", "published_ts", "views", "likes", "comments", "raw")
+    
+    def __init__(self, video_id, title="Unknown", published_ts=None, views=0, likes=0, comments=0,
+                 channel_id=None, raw=None):
+        self.video_id = video_id
+        self.channel_id = channel_id
+        self.title = title
+        self.published_ts = published_ts
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.raw = raw
+    
+    @classmethod
+    def from_api(cls, d, keep_raw=False):
+        """Parse a `videos` API item (or a stored item of the same shape)."""
+        statistics = d.get("statistics", {})
+        snippet = d.get("snippet", {})
+        return cls(
+            video_id=d.get("id"),
+            channel_id=snippet.get("channelId"),
+            title=snippet.get("title", "Unknown"),
+            published_ts=parse_timestamp(snippet.get("publishedAt", "")),
+            views=int(statistics.get("viewCount", 0)),
+            likes=int(statistics.get("likeCount", 0)),
+            comments=int(statistics.get("commentCount", 0)),
+            raw=d if keep_raw else None
+        )
+    
+    @property
+    def published_at(self):
+        """Publish time as the API's ISO-8601 string."""
+        return format_timestamp(self.published_ts)
+    
+    def to_api(self):
+        """API-shaped dict with only the parsed fields (or the raw payload if kept)."""
+        if self.raw is not None:
+            return self.raw
+        return {
+            "id": self.video_id,
+            "snippet": {"channelId": self.channel_id, "title": self.title, "publishedAt": self.published_at},
+            "statistics": {
+                "viewCount": str(self.views),
+                "likeCount": str(self.likes),
+                "commentCount": str(self.comments)
+            }
+        }
+    
+    def __eq__(self, other):
+        if not isinstance(other, Video):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self):
+        return f"Video({self.video_id!r}, {self.title!r}, views={self.views})"
+
+
+def as_video(d, keep_raw=False):
+    """Return `d` as a Video, parsing it first if it is a raw API dict."""
+    return d if isinstance(d, Video) else Video.from_api(d, keep_raw=keep_raw)
@@ -0,0 +1,282 @@
+"""
+Resident watch mode: keep channels' latest videos fresh with adaptive polling.
+
+A single long-lived VideoAnalyzer keeps its client, pooled connections and
+caches warm between polls. Each video is re-polled on its own schedule:
+new uploads every few minutes, the settled back catalogue every few hours,
+faster while views are climbing and backing off while they are flat. Due
+videos from every channel share 50-ID `videos` requests, and new uploads
+are spotted through batched channel video counts, so fresher numbers for
+new uploads do not cost more quota than a cron job refetching everything.
+"""
+
+import logging
+import time
+from .config import DEFAULT_UPLOAD_INTERVAL
+from .fields import STATISTICS_FIELDS
+from .metrics import analyze_video
+from .scheduler import QuotaExceededError
+from .telemetry import TELEMETRY
+from .video import Video
+from .youtube_client import ChannelNotFoundError
+
+log = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# (videos younger than this, poll them this often)
+AGE_INTERVALS = (
+    (6 * HOUR, 5 * MINUTE),
+    (DAY, 15 * MINUTE),
+    (7 * DAY, HOUR),
+    (30 * DAY, 3 * HOUR),
+)
+SETTLED_INTERVAL = 6 * HOUR
+
+MIN_INTERVAL = 5 * MINUTE
+MAX_INTERVAL = 12 * HOUR
+
+# Views per hour above which a video is polled twice as often as its age suggests
+FAST_VELOCITY = 1000
+# Interval multiplier while a video's statistics are unchanged
+BACKOFF = 2
+
+# Failed polls are retried after MIN_INTERVAL, doubling up to MAX_INTERVAL
+ERROR_BACKOFF = 2
+
+
+def age_interval(age):
+    """Base poll interval in seconds for a video `age` seconds old."""
+    for max_age, interval in AGE_INTERVALS:
+        if age < max_age:
+            return interval
+    return SETTLED_INTERVAL
+
+
+def poll_interval(age, views_per_hour=None, previous=None, changed=True):
+    """
+    Seconds until a video should be polled again.
+    
+    Starts from the interval for its age, halves it for fast-growing
+    videos, and doubles the previous interval while nothing changed.
+    """
+    interval = age_interval(age)
+    if views_per_hour is not None and views_per_hour >= FAST_VELOCITY:
+        interval /= 2
+    if not changed and previous is not None:
+        interval = max(interval, previous * BACKOFF)
+    return min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+
+
+class WatchedVideo:
+    """Polling state for one video."""
+    
+    __slots__ = ("video", "channel_id", "polled_at", "next_poll", "interval", "views_per_hour")
+    
+    def __init__(self, video, channel_id, polled_at):
+        self.video = video
+        self.channel_id = channel_id
+        self.polled_at = polled_at
+        self.next_poll = polled_at
+        self.interval = None
+        self.views_per_hour = None
+    
+    def analysis(self):
+        """analyze_video() output, with growth from the measured view velocity."""
+        views_per_day = self.views_per_hour * 24 if self.views_per_hour is not None else None
+        result = analyze_video(self.video, views_per_day)
+        result["channel_id"] = self.channel_id
+        result["views_per_hour"] = self.views_per_hour
+        return result
+
+
+class ChannelWatcher:
+    """
+    Polls the latest `count` videos of each channel and reports analyses
+    whenever a video is new or its statistics changed.
+    
+    run() is a generator of (channel_id, analysis) pairs that sleeps until
+    the next video or channel is due; poll_once() does a single pass for
+    callers that drive their own loop. Videos missing from a successful
+    refresh (deleted or made private) stop being watched, and so do
+    channels the API no longer knows. `clock` and `sleep` are injectable
+    for tests.
+    """
+    
+    def __init__(self, analyzer, channel_ids, count=5, upload_interval=DEFAULT_UPLOAD_INTERVAL,
+                 clock=time.time, sleep=time.sleep):
+        self.analyzer = analyzer
+        self.client = analyzer.client
+        self.channel_ids = list(dict.fromkeys(channel_ids))
+        self.count = count
+        self.upload_interval = upload_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.watched = {}
+        self.polls = 0
+        self.errors = 0
+        self.last_error = None
+        self._video_counts = {}
+        self._next_upload_check = dict.fromkeys(self.channel_ids, 0)
+        # Videos added or changed by a poll that failed before reporting them
+        self._unreported = {}
+    
+    def _check_uploads(self, now):
+        """
+        Re-read the latest uploads of channels whose video count changed
+        and start watching the new ones. Returns the added WatchedVideos.
+        
+        A channel is only marked checked once its new uploads are fetched,
+        so a failed request leaves it due for the next poll.
+        """
+        due = [c for c in self.channel_ids if self._next_upload_check[c] <= now]
+        if not due:
+            return []
+        
+        counts = self.client.get_channel_video_counts(due)
+        new = []
+        checked = []
+        for channel_id in due:
+            count = counts.get(channel_id)
+            if channel_id in self._video_counts and self._video_counts[channel_id] == count:
+                self._next_upload_check[channel_id] = now + self.upload_interval
+                continue
+            
+            try:
+                playlist_id = self.client.get_uploads_playlist_id(channel_id)
+            except ChannelNotFoundError as e:
+                self._drop_channel(channel_id, e)
+                continue
+            latest = list(self.client.iter_playlist_video_ids(playlist_id, limit=self.count))
+            # Videos pushed out of the latest `count` stop being watched
+            for video_id, state in list(self.watched.items()):
+                if state.channel_id == channel_id and video_id not in latest:
+                    del self.watched[video_id]
+            new.extend((video_id, channel_id) for video_id in latest if video_id not in self.watched)
+            checked.append((channel_id, count))
+        
+        added = self._add(new, now) if new else []
+        for channel_id, count in checked:
+            self._video_counts[channel_id] = count
+            self._next_upload_check[channel_id] = now + self.upload_interval
+        return added
+    
+    def _drop_channel(self, channel_id, error):
+        """Stop watching a channel the API no longer knows, and its videos."""
+        log.warning("Dropping channel %s from watch: %s", channel_id, error)
+        TELEMETRY.count("watch_errors_total", error=type(error).__name__)
+        self.errors += 1
+        self.last_error = error
+        self.channel_ids.remove(channel_id)
+        del self._next_upload_check[channel_id]
+        self._video_counts.pop(channel_id, None)
+        for video_id, state in list(self.watched.items()):
+            if state.channel_id == channel_id:
+                del self.watched[video_id]
+    
+    def _schedule(self, state, now, changed):
+        published_ts = state.video.published_ts
+        age = now - published_ts if published_ts is not None else 0
+        state.interval = poll_interval(age, state.views_per_hour, state.interval, changed)
+        state.next_poll = now + state.interval
+    
+    def _add(self, new, now):
+        channels = dict(new)
+        added = []
+        for item in self.client.iter_video_details(list(channels), fields=self.analyzer.fields):
+            video = Video.from_api(item, keep_raw=self.analyzer.keep_raw)
+            state = self.watched[video.video_id] = WatchedVideo(video, channels[video.video_id], now)
+            self._schedule(state, now, changed=True)
+            added.append(state)
+        if added and self.analyzer.store is not None:
+            self.analyzer.store.record((state.video for state in added), taken_at=now)
+        return added
+    
+    def _refresh(self, video_ids, now):
+        # The client raises on error responses, so a failed refresh leaves every video due
+        items = list(self.client.iter_video_details(video_ids, fields=STATISTICS_FIELDS))
+        # Deleted or private videos are left out of a successful response; stop asking for them
+        returned = {item["id"] for item in items}
+        for video_id in video_ids:
+            if video_id not in returned:
+                self.watched.pop(video_id, None)
+        changed = []
+        for item in items:
+            state = self.watched.get(item["id"])
+            if state is None:
+                continue
+            video = state.video
+            statistics = item.get("statistics", {})
+            counts = (
+                int(statistics.get("viewCount", 0)),
+                int(statistics.get("likeCount", 0)),
+                int(statistics.get("commentCount", 0))
+            )
+            is_changed = counts != (video.views, video.likes, video.comments)
+            
+            hours = (now - state.polled_at) / HOUR
+            if hours > 0:
+                state.views_per_hour = max(counts[0] - video.views, 0) / hours
+            video.views, video.likes, video.comments = counts
+            state.polled_at = now
+            self._schedule(state, now, is_changed)
+            if is_changed:
+                changed.append(state)
+        if items and self.analyzer.store is not None:
+            self.analyzer.store.record(items, taken_at=now)
+        return changed
+    
+    def poll_once(self):
+        """
+        Check due channels for uploads and refresh due videos.
+        Returns (channel_id, analysis) pairs for new or changed videos,
+        including any a previous, failed poll got before its error.
+        """
+        now = self.clock()
+        due_ids = [video_id for video_id, state in self.watched.items() if state.next_poll <= now]
+        for state in self._check_uploads(now):
+            self._unreported[state.video.video_id] = state
+        due_ids = [video_id for video_id in due_ids if video_id in self.watched]
+        if due_ids:
+            for state in self._refresh(due_ids, now):
+                self._unreported[state.video.video_id] = state
+        
+        self.polls += 1
+        updated, self._unreported = self._unreported, {}
+        return [(state.channel_id, state.analysis()) for video_id, state in updated.items()
+                if self.watched.get(video_id) is state]
+    
+    def next_wakeup(self):
+        """Epoch seconds when the next channel or video is due."""
+        return min(
+            list(self._next_upload_check.values()) + [state.next_poll for state in self.watched.values()],
+            default=self.clock() + self.upload_interval
+        )
+    
+    def run(self, max_polls=None):
+        """
+        Yield (channel_id, analysis) for every new or changed video until
+        stopped. A poll failing on a network error or exhausted quota is
+        counted and retried after a growing delay instead of ending the run.
+        """
+        backoff = None
+        while True:
+            try:
+                updates = self.poll_once()
+            except (QuotaExceededError, OSError) as e:
+                # requests' exceptions, timeouts included, are OSErrors
+                self.polls += 1
+                self.errors += 1
+                self.last_error = e
+                TELEMETRY.count("watch_errors_total", error=type(e).__name__)
+                backoff = MIN_INTERVAL if backoff is None else min(backoff * ERROR_BACKOFF, MAX_INTERVAL)
+                delay = backoff
+            else:
+                backoff = None
+                yield from updates
+                delay = max(self.next_wakeup() - self.clock(), 0)
+            if max_polls is not None and self.polls >= max_polls:
+                return
+            self.sleep(delay)
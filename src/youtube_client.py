@@ -2,72 +2,381 @@
 YouTube API Client for fetching video data.
 """
 
-import os
-import requests
-from dotenv import load_dotenv
+import time
+from itertools import islice
+from . import config
+from .keys import APIKeyPool, QUOTA_ERROR_REASONS
+from .cache import UploadsPlaylistCache, PartCache
+from .fields import (
+    STATIC_PARTS,
+    PLAYLIST_ITEM_FIELDS,
+    UPLOADS_PLAYLIST_FIELDS,
+    VIDEO_COUNT_FIELDS,
+    COMMENT_THREAD_FIELDS
+)
+from .scheduler import QuotaExceededError, QUOTA_COSTS, DEFAULT_COST, PRIORITY_FRESH, PRIORITY_NORMAL, PRIORITY_BACKLOG
+from .telemetry import TELEMETRY
 
-load_dotenv()
-
-API_KEY = os.getenv("YOUTUBE_API_KEY")
 BASE_URL = "https://www.googleapis.com/youtube/v3"
 
-# Quantum Tech HD channel ID
-CHANNEL_ID = "UC4Tklxku1yPcRIH0VVCKoeA"
+# The API caps both maxResults and the number of IDs per request at 50
+MAX_PAGE_SIZE = 50
+# ...except for commentThreads, which pages up to 100 threads
+MAX_COMMENT_PAGE_SIZE = 100
+
+# Error reason for commentThreads of a video whose comments are turned off
+COMMENTS_DISABLED = "commentsDisabled"
+
+DETAIL_PARTS = "snippet,statistics,contentDetails"
+
+# Errors about the key itself rather than the resource requested
+KEY_ERROR_REASONS = QUOTA_ERROR_REASONS + ("keyInvalid", "keyExpired", "accessNotConfigured", "ipRefererBlocked")
+
+
+class APIError(OSError):
+    """
+    A non-2xx API response that is not about the key used. It is an
+    OSError, like requests' own exceptions, so callers retrying failed
+    requests retry these too.
+    """
+    
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+        error = body.get("error", {}) if isinstance(body, dict) else {}
+        errors = error.get("errors") or [{}]
+        self.reason = errors[0].get("reason")
+        super().__init__(f"YouTube API error {status_code}: {error.get('message') or self.reason or 'no details'}")
+
+
+def chunked(items, size):
+    """Yield lists of up to `size` items from any iterable."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ChannelNotFoundError(LookupError):
+    """The API does not know the channel asked for."""
+
+
+def error_body(response):
+    """The JSON body of an error response, or None if it is not JSON (e.g. a proxy's HTML page)."""
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def key_error_reason(body):
+    """The reason an API error body rejects the key used, or None if it is about something else."""
+    errors = body.get("error", {}).get("errors", []) if isinstance(body, dict) else []
+    for error in errors:
+        if error.get("reason") in KEY_ERROR_REASONS:
+            return error["reason"]
+    return None
+
+
+def response_size(response):
+    """Bytes received for a response: the wire size when the server sent it, else the body size."""
+    length = response.headers.get("Content-Length")
+    if length is not None:
+        return int(length)
+    content = getattr(response, "content", b"")
+    return len(content) if isinstance(content, bytes) else 0
+
+
+def uploads_playlists_from(channel_data):
+    """Extract {channel ID: uploads playlist ID} from a `channels` response."""
+    return {
+        item["id"]: item["contentDetails"]["relatedPlaylists"]["uploads"]
+        for item in channel_data["items"]
+    }
 
 
 class YouTubeClient:
-    def __init__(self, api_key=None):
-        self.api_key = api_key or API_KEY
-        if not self.api_key:
-            raise ValueError("YouTube API key is required")
+    def __init__(self, api_key=None, transport=None, cache=None, playlist_cache=None, scheduler=None,
+                 part_cache=None):
+        # A single key, a list of keys or a shared APIKeyPool
+        self.keys = APIKeyPool.from_keys(api_key or config.api_keys() or config.api_key())
+        if transport is None:
+            # requests is only imported once a client actually needs the network
+            from .transport import HTTPTransport
+            transport = HTTPTransport()
+        self.transport = transport
+        self.cache = cache
+        self.playlist_cache = playlist_cache if playlist_cache is not None else UploadsPlaylistCache()
+        self.scheduler = scheduler
+        self.part_cache = part_cache if part_cache is not None else PartCache()
     
-    def get_channel_videos(self, channel_id=None, max_results=5):
-        """Fetch the latest videos from a channel."""
-        channel_id = channel_id or CHANNEL_ID
+    def _send(self, endpoint, url, params, headers=None, priority=PRIORITY_NORMAL):
+        """
+        Send one request over the network with a key from the pool, waiting
+        for the scheduler if there is one. A key rejected for its quota or
+        credentials is taken out of rotation and the request retried with
+        the next key; a key without enough budget left for this request is
+        only skipped for it. Any other error response raises APIError.
+        """
+        skipped = set()
+        while True:
+            key = self.keys.choose(self.scheduler, exclude=skipped)
+            if key is None:
+                raise QuotaExceededError(None, "Every YouTube API key is out of quota or rejected")
+            
+            if self.scheduler is not None:
+                try:
+                    self.scheduler.acquire(endpoint, key=key, priority=priority)
+                except QuotaExceededError:
+                    # Cheaper requests may still fit in what this key has left today
+                    skipped.add(key)
+                    continue
+            
+            start = time.perf_counter()
+            response = self.transport.fetch(url, params=dict(params, key=key), headers=headers)
+            if TELEMETRY.enabled:
+                self._record(endpoint, response, time.perf_counter() - start)
+            
+            # 304s are answered from the response cache
+            if response.status_code < 400:
+                return response
+            body = error_body(response)
+            reason = key_error_reason(body) if response.status_code in (400, 403) else None
+            if reason is None:
+                raise APIError(response.status_code, body)
+            if self.scheduler is not None and reason in QUOTA_ERROR_REASONS:
+                self.scheduler.exhaust(key)
+            self.keys.disable(key, reason)
+    
+    def _record(self, endpoint, response, seconds):
+        """Report one API round trip to telemetry."""
+        cost = self.scheduler.cost(endpoint) if self.scheduler is not None else QUOTA_COSTS.get(endpoint, DEFAULT_COST)
+        TELEMETRY.count("api_requests_total", endpoint=endpoint, status=response.status_code)
+        TELEMETRY.observe("api_request_seconds", seconds, endpoint=endpoint)
+        TELEMETRY.count("api_response_bytes_total", response_size(response), endpoint=endpoint)
+        TELEMETRY.count("quota_units_total", cost, endpoint=endpoint)
+    
+    def _get(self, endpoint, params, priority=PRIORITY_NORMAL):
+        """Make a GET request against an API endpoint and return the JSON body."""
+        url = f"{BASE_URL}/{endpoint}"
         
-        # First, get the uploads playlist ID
-        channel_url = f"{BASE_URL}/channels"
-        params = {
-            "part": "contentDetails",
-            "id": channel_id,
-            "key": self.api_key
-        }
+        def send(headers=None):
+            return self._send(endpoint, url, params, headers=headers, priority=priority)
         
-        response = requests.get(channel_url, params=params)
-        channel_data = response.json()
+        if self.cache is not None:
+            return self.cache.fetch(send, endpoint, params)
+        response = send()
+        with TELEMETRY.timer("json_decode_seconds", endpoint=endpoint):
+            return response.json()
+    
+    def close(self):
+        """Release pooled connections held by the transport."""
+        self.transport.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def resolve_uploads_playlists(self, channel_ids):
+        """
+        Map channel IDs to their uploads playlist IDs.
         
-        uploads_playlist_id = channel_data["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        Known channels come from the playlist cache; the rest are looked
+        up 50 per `channels` request and remembered. Channels the API does
+        not return are left out of the result.
+        """
+        missing = self.playlist_cache.missing(channel_ids)
+        for batch in chunked(missing, MAX_PAGE_SIZE):
+            channel_data = self._get("channels", {
+                "part": "contentDetails",
+                "id": ",".join(batch),
+                "fields": UPLOADS_PLAYLIST_FIELDS
+            }, priority=PRIORITY_FRESH)
+            self.playlist_cache.update(uploads_playlists_from(channel_data))
         
-        # Get videos from uploads playlist
-        playlist_url = f"{BASE_URL}/playlistItems"
-        params = {
-            "part": "snippet",
-            "playlistId": uploads_playlist_id,
-            "maxResults": max_results,
-            "key": self.api_key
+        return {
+            channel_id: self.playlist_cache.get(channel_id)
+            for channel_id in channel_ids
+            if channel_id in self.playlist_cache
         }
+    
+    def get_channel_video_counts(self, channel_ids):
+        """
+        Map channel IDs to their public video counts, 50 channels per
+        `channels` request. A changed count means uploads (or removals).
+        """
+        counts = {}
+        for batch in chunked(dict.fromkeys(channel_ids), MAX_PAGE_SIZE):
+            channel_data = self._get("channels", {
+                "part": "statistics",
+                "id": ",".join(batch),
+                "fields": VIDEO_COUNT_FIELDS
+            }, priority=PRIORITY_FRESH)
+            for item in channel_data["items"]:
+                counts[item["id"]] = int(item.get("statistics", {}).get("videoCount", 0))
+        return counts
+    
+    def get_uploads_playlist_id(self, channel_id=None):
+        """Look up the uploads playlist ID for a channel."""
+        channel_id = channel_id or config.channel_id()
+        
+        playlists = self.resolve_uploads_playlists([channel_id])
+        if channel_id not in playlists:
+            raise ChannelNotFoundError(f"Channel not found: {channel_id}")
+        return playlists[channel_id]
+    
+    def iter_playlist_video_ids(self, playlist_id, limit=None):
+        """Yield video IDs from a playlist, following page tokens until exhausted."""
+        page_token = None
+        remaining = limit
+        
+        while remaining is None or remaining > 0:
+            page_size = MAX_PAGE_SIZE if remaining is None else min(remaining, MAX_PAGE_SIZE)
+            params = {
+                "part": "snippet",
+                "playlistId": playlist_id,
+                "maxResults": page_size,
+                "fields": PLAYLIST_ITEM_FIELDS
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            
+            # The first page holds the newest uploads; the rest is back catalogue
+            priority = PRIORITY_BACKLOG if page_token else PRIORITY_FRESH
+            playlist_data = self._get("playlistItems", params, priority=priority)
+            
+            for item in playlist_data["items"][:page_size]:
+                yield item["snippet"]["resourceId"]["videoId"]
+                if remaining is not None:
+                    remaining -= 1
+            
+            page_token = playlist_data.get("nextPageToken")
+            if not page_token:
+                break
+    
+    def iter_channel_videos(self, channel_id=None, limit=None, fields=None):
+        """
+        Stream videos from a channel's uploads playlist, newest first.
+        
+        Pages through the whole playlist (or up to `limit` videos) and
+        fetches details one page at a time, so only a single page of
+        videos is held in memory.
+        """
+        uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
+        video_ids = self.iter_playlist_video_ids(uploads_playlist_id, limit=limit)
+        return self.iter_video_details(video_ids, fields=fields)
+    
+    def get_channel_videos(self, channel_id=None, max_results=5, fields=None):
+        """Fetch the latest videos from a channel."""
+        return list(self.iter_channel_videos(channel_id, limit=max_results, fields=fields))
+    
+    def video_request(self, video_ids, fields):
+        """
+        Params for a `videos` request projected onto FieldMask `fields`, or
+        None if the part cache already holds everything it would return.
         
-        response = requests.get(playlist_url, params=params)
-        playlist_data = response.json()
-        video_ids = []
-        for item in playlist_data["items"]:
-            video_ids.append(item["snippet"]["resourceId"]["videoId"])
+        Static parts cached for every video in the batch are left out, so
+        a repeat request for known videos only asks for their statistics.
+        """
+        parts = [
+            part for part in fields.parts
+            if part not in STATIC_PARTS or not self.part_cache.covers(video_ids, part, fields.part_fields(part))
+        ]
+        if not parts:
+            return None
+        return {"part": ",".join(parts), "id": ",".join(video_ids), "fields": fields.selector(parts)}
+    
+    def merge_video_items(self, video_ids, fields, data):
+        """Items of a video_request() response (None if skipped), with cached parts filled in."""
+        if data is None:
+            items = [{"id": video_id} for video_id in video_ids]
+        else:
+            items = data["items"]
+            self.part_cache.update(items, fields)
+        return [self.part_cache.fill(item, fields) for item in items]
+    
+    def iter_video_details(self, video_ids, part=DETAIL_PARTS, fields=None):
+        """
+        Yield detailed statistics for video IDs, 50 IDs per request.
         
-        return self.get_video_details(video_ids)
+        With a FieldMask as `fields`, only its parts and fields are
+        requested (and parts already cached are skipped) instead of `part`.
+        """
+        for i, batch in enumerate(chunked(video_ids, MAX_PAGE_SIZE)):
+            priority = PRIORITY_BACKLOG if i else PRIORITY_FRESH
+            if fields is None:
+                data = self._get("videos", {"part": part, "id": ",".join(batch)}, priority=priority)
+                yield from data["items"]
+                continue
+            
+            params = self.video_request(batch, fields)
+            data = None if params is None else self._get("videos", params, priority=priority)
+            yield from self.merge_video_items(batch, fields, data)
     
-    def get_video_details(self, video_ids):
+    def get_video_details(self, video_ids, part=DETAIL_PARTS, fields=None):
         """Fetch detailed statistics for a list of video IDs."""
         if not video_ids:
             return []
         
-        videos_url = f"{BASE_URL}/videos"
+        return list(self.iter_video_details(video_ids, part=part, fields=fields))
+    
+    def comment_thread_params(self, video_id, page_size, page_token=None):
+        """Params for one page of a video's comment threads, newest first."""
         params = {
-            "part": "snippet,statistics,contentDetails",
-            "id": ",".join(video_ids),
-            "key": self.api_key
+            "part": "snippet",
+            "videoId": video_id,
+            "maxResults": page_size,
+            "order": "time",
+            "fields": COMMENT_THREAD_FIELDS
         }
+        if page_token:
+            params["pageToken"] = page_token
+        return params
+    
+    def iter_comment_pages(self, video_id, limit=None):
+        """
+        Yield a video's comment threads one page (up to 100 threads) at a
+        time, newest first, until `limit` threads or the end. Videos with
+        comments disabled yield nothing.
+        """
+        page_token = None
+        remaining = limit
         
-        response = requests.get(videos_url, params=params)
-        data = response.json()
-        
-        return data.get("items", [])
+        while remaining is None or remaining > 0:
+            page_size = MAX_COMMENT_PAGE_SIZE if remaining is None else min(remaining, MAX_COMMENT_PAGE_SIZE)
+            try:
+                data = self._get("commentThreads", self.comment_thread_params(video_id, page_size, page_token),
+                                 priority=PRIORITY_BACKLOG)
+            except APIError as e:
+                if e.reason == COMMENTS_DISABLED:
+                    return
+                raise
+            items = data["items"][:page_size]
+            if items:
+                yield items
+            if remaining is not None:
+                remaining -= len(items)
+            
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                break
+    
+    def iter_comment_threads(self, video_id, limit=None):
+        """Stream a video's comment threads, holding one page in memory at a time."""
+        for page in self.iter_comment_pages(video_id, limit=limit):
+            yield from page
+
+
+def __getattr__(name):
+    # Environment-derived settings used to be module constants read at import
+    if name == "API_KEY":
+        return config.api_key()
+    if name == "API_KEYS":
+        return config.api_keys()
+    if name == "CHANNEL_ID":
+        return config.channel_id()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,139 @@
+"""
+Shared test fixtures and helpers.
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Settable stand-in for time.time; sleep() advances it instead of blocking."""
+    
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_video(video_id):
+    return {
+        "id": video_id,
+        "snippet": {"title": f"Video {video_id}", "publishedAt": "2024-11-20T10:00:00Z"},
+        "statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": "1"}
+    }
+
+
+class FakeAPI:
+    """Serves a fake uploads playlist of `total` videos, one page at a time."""
+    
+    def __init__(self, total):
+        self.video_ids = [f"v{i}" for i in range(total)]
+        self.calls = []
+    
+    def __call__(self, endpoint, params, priority=None):
+        self.calls.append((endpoint, dict(params)))
+        
+        if endpoint == "channels":
+            return {"items": [
+                {"id": cid, "contentDetails": {"relatedPlaylists": {"uploads": "UU123"}}}
+                for cid in params["id"].split(",")
+            ]}
+        
+        if endpoint == "playlistItems":
+            start = int(params.get("pageToken", 0))
+            end = start + params["maxResults"]
+            page = {
+                "items": [
+                    {"snippet": {"resourceId": {"videoId": vid}}}
+                    for vid in self.video_ids[start:end]
+                ]
+            }
+            if end < len(self.video_ids):
+                page["nextPageToken"] = str(end)
+            return page
+        
+        if endpoint == "videos":
+            return {"items": [make_video(vid) for vid in params["id"].split(",")]}
+        
+        raise AssertionError(f"Unexpected endpoint {endpoint}")
+    
+    def count(self, endpoint):
+        return sum(1 for name, _ in self.calls if name == endpoint)
+
+
+def with_views(video, views):
+    return dict(video, statistics=dict(video["statistics"], viewCount=str(views)))
+
+
+def mock_videos():
+    """Five videos of one channel, as raw API items."""
+    return [
+        {
+            "id": "video1",
+            "snippet": {
+                "title": "Amazing Tech Video",
+                "publishedAt": "2024-11-20T10:00:00Z"
+            },
+            "statistics": {
+                "viewCount": "1500000",
+                "likeCount": "50000",
+                "commentCount": "3000"
+            }
+        },
+        {
+            "id": "video2",
+            "snippet": {
+                "title": "Incredible Construction",
+                "publishedAt": "2024-11-15T10:00:00Z"
+            },
+            "statistics": {
+                "viewCount": "2000000",
+                "likeCount": "80000",
+                "commentCount": "5000"
+            }
+        },
+        {
+            "id": "video3",
+            "snippet": {
+                "title": "DIY Project Guide",
+                "publishedAt": "2024-11-10T10:00:00Z"
+            },
+            "statistics": {
+                "viewCount": "900000",
+                "likeCount": "30000",
+                "commentCount": "2000"
+            }
+        },
+        {
+            "id": "video4",
+            "snippet": {
+                "title": "Future Technology",
+                "publishedAt": "2024-11-05T10:00:00Z"
+            },
+            "statistics": {
+                "viewCount": "500000",
+                "likeCount": "20000",
+                "commentCount": "1500"
+            }
+        },
+        {
+            "id": "video5",
+            "snippet": {
+                "title": "Engineering Marvels",
+                "publishedAt": "2024-11-01T10:00:00Z"
+            },
+            "statistics": {
+                "viewCount": "750000",
+                "likeCount": "25000",
+                "commentCount": "1800"
+            }
+        }
+    ]
@@ -0,0 +1,72 @@
+"""
+Tests for the single-pass VideoAggregate.
+"""
+
+import pytest
+from src.aggregate import VideoAggregate
+
+
+def result(video_id, views, engagement, likes=10, comments=1):
+    return {
+        "video_id": video_id,
+        "views": views,
+        "likes": likes,
+        "comments": comments,
+        "engagement_rate": engagement,
+        "growth_score": 1.0,
+        "days_old": 10
+    }
+
+
+RESULTS = [
+    result("a", 500, 2.0),
+    result("b", 900, 5.0),
+    result("c", 100, 5.0),
+    result("d", 900, 1.0),
+    result("e", 300, 3.0),
+]
+
+
+class TestVideoAggregate:
+    
+    def test_comparison_from_generator(self):
+        comparison = VideoAggregate.from_results(r for r in RESULTS).to_comparison()
+        
+        assert comparison["total_videos"] == 5
+        assert comparison["total_views"] == 2700
+        assert comparison["average_views"] == 540
+        assert comparison["average_engagement"] == pytest.approx(3.2)
+        assert comparison["top_performer"]["video_id"] == "b"
+        assert comparison["best_engagement"]["video_id"] == "b"
+    
+    def test_top_k_ties_go_to_first_seen(self):
+        aggregate = VideoAggregate.from_results(RESULTS, top_k=3)
+        
+        assert [r["video_id"] for r in aggregate.top("views")] == ["b", "d", "a"]
+        assert [r["video_id"] for r in aggregate.top("engagement_rate", 2)] == ["b", "c"]
+    
+    def test_min_max(self):
+        aggregate = VideoAggregate.from_results(RESULTS)
+        
+        assert aggregate.mins["views"] == 100
+        assert aggregate.maxes["engagement_rate"] == 5.0
+    
+    def test_merge_matches_single_pass(self):
+        whole = VideoAggregate.from_results(RESULTS, top_k=3)
+        merged = VideoAggregate.from_results(RESULTS[:2], top_k=3).merge(
+            VideoAggregate.from_results(RESULTS[2:], top_k=3)
+        )
+        
+        assert merged.to_comparison() == whole.to_comparison()
+        assert merged.top("views") == whole.top("views")
+        assert merged.mins == whole.mins
+    
+    def test_empty(self):
+        aggregate = VideoAggregate.from_results([])
+        
+        assert aggregate.to_comparison() == {}
+        assert aggregate.best("views") is None
+    
+    def test_untracked_metric(self):
+        with pytest.raises(KeyError):
+            VideoAggregate().top("likes")
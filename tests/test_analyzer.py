@@ -5,75 +5,15 @@ Tests for the VideoAnalyzer class.
 import pytest
 from datetime import datetime
 from unittest.mock import Mock, patch
-from src.analyzer import VideoAnalyzer
+from src.analyzer import VideoAnalyzer, merge_comparison_data
+from tests.conftest import mock_videos
 
 
 class TestVideoAnalyzer:
     
     def setup_method(self):
         """Set up test fixtures."""
-        self.mock_videos = [
-            {
-                "id": "video1",
-                "snippet": {
-                    "title": "Amazing Tech Video",
-                    "publishedAt": "2024-11-20T10:00:00Z"
-                },
-                "statistics": {
-                    "viewCount": "1500000",
-                    "likeCount": "50000",
-                    "commentCount": "3000"
-                }
-            },
-            {
-                "id": "video2",
-                "snippet": {
-                    "title": "Incredible Construction",
-                    "publishedAt": "2024-11-15T10:00:00Z"
-                },
-                "statistics": {
-                    "viewCount": "2000000",
-                    "likeCount": "80000",
-                    "commentCount": "5000"
-                }
-            },
-            {
-                "id": "video3",
-                "snippet": {
-                    "title": "DIY Project Guide",
-                    "publishedAt": "2024-11-10T10:00:00Z"
-                },
-                "statistics": {
-                    "viewCount": "900000",
-                    "likeCount": "30000",
-                    "commentCount": "2000"
-                }
-            },
-            {
-                "id": "video4",
-                "snippet": {
-                    "title": "Future Technology",
-                    "publishedAt": "2024-11-05T10:00:00Z"
-                },
-                "statistics": {
-                    "viewCount": "500000",
-                    "likeCount": "20000",
-                    "commentCount": "1500"
-                }
-            },
-            {
-                "id": "video5",
-                "snippet": {
-                    "title": "Engineering Marvels",
-                    "publishedAt": "2024-11-01T10:00:00Z"
-                },
-                "statistics": {
-                    "viewCount": "750000",
-                    "likeCount": "25000",
-                    "commentCount": "1800"
-                }
-            }
-        ]
+        self.mock_videos = mock_videos()
     
     @patch('src.analyzer.YouTubeClient')
     def test_analyze_videos_returns_correct_count(self, mock_client_class):
@@ -144,3 +84,73 @@ class TestVideoAnalyzer:
         
         for field in required_fields:
             assert field in comparison, f"Missing field: {field}"
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_iter_analysis_consumes_generator(self, mock_client_class):
+        """Test that analysis streams over a generator of videos."""
+        mock_client_class.return_value = Mock()
+        
+        analyzer = VideoAnalyzer(api_key="test_key")
+        stream = (video for video in self.mock_videos)
+        
+        results = analyzer.iter_analysis(stream)
+        first = next(results)
+        
+        assert first["video_id"] == "video1"
+        assert len(list(results)) == 4
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_zero_view_video_does_not_abort_stream(self, mock_client_class):
+        """Test that an upcoming premiere with no views is analyzed, not raised on."""
+        mock_client_class.return_value = Mock()
+        premiere = {
+            "id": "premiere",
+            "snippet": {"title": "Upcoming Premiere", "publishedAt": "2024-12-01T10:00:00Z"},
+            "statistics": {"viewCount": "0", "likeCount": "0", "commentCount": "0"}
+        }
+        
+        analyzer = VideoAnalyzer(api_key="test_key")
+        results = list(analyzer.iter_analysis([premiere] + self.mock_videos))
+        
+        assert len(results) == 6
+        assert results[0]["engagement_rate"] == 0.0
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_comparison_over_generator(self, mock_client_class):
+        """Test that comparison works on a stream of results."""
+        mock_client_class.return_value = Mock()
+        
+        analyzer = VideoAnalyzer(api_key="test_key")
+        stream = analyzer.iter_analysis(video for video in self.mock_videos)
+        
+        comparison = analyzer.get_comparison_data(stream)
+        
+        assert comparison["total_videos"] == 5
+        assert comparison["total_views"] == 5650000
+        assert comparison["top_performer"]["video_id"] == "video2"
+
+
+class TestMergeComparisonData:
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_rollup_matches_single_comparison(self, mock_client_class):
+        """Test that merging per-channel aggregates equals one comparison over all videos."""
+        mock_client_class.return_value = Mock()
+        analyzer = VideoAnalyzer(api_key="test_key")
+        fixtures = TestVideoAnalyzer()
+        fixtures.setup_method()
+        results = analyzer.analyze_videos(fixtures.mock_videos)
+        
+        parts = [analyzer.get_comparison_data(results[:2]), analyzer.get_comparison_data(results[2:])]
+        merged = merge_comparison_data(parts)
+        whole = analyzer.get_comparison_data(results)
+        
+        for field in ["total_videos", "total_views", "total_likes", "total_comments"]:
+            assert merged[field] == whole[field]
+        assert merged["average_views"] == pytest.approx(whole["average_views"])
+        assert merged["average_engagement"] == pytest.approx(whole["average_engagement"])
+        assert merged["best_engagement"]["video_id"] == whole["best_engagement"]["video_id"]
+    
+    def test_empty(self):
+        assert merge_comparison_data([]) == {}
+        assert merge_comparison_data([{}]) == {}
@@ -0,0 +1,156 @@
+"""
+Tests for the memory-mapped statistics archive.
+"""
+
+import numpy as np
+import os
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from src.analyzer import VideoAnalyzer
+from src.archive import StatsArchive, SECONDS_PER_DAY, column_file
+from src.frame import VideoFrame
+from tests.conftest import make_video, with_views
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def archive(tmp_path, clock):
+    with StatsArchive(str(tmp_path / "archive"), clock=clock) as archive:
+        yield archive
+
+
+class TestStatsArchive:
+    
+    def test_empty(self, archive):
+        assert len(archive) == 0
+        assert archive.row_range() == (0, 0)
+        assert len(archive.to_frame(now=NOW)) == 0
+    
+    def test_record_appends_rows(self, archive, clock):
+        archive.record([make_video("v1"), make_video("v2")])
+        clock.now += 60
+        archive.record([{"id": "v1", "statistics": {"viewCount": "5000"}}])
+        
+        columns = archive.columns()
+        assert len(archive) == 3
+        assert columns["video"].tolist() == [0, 1, 0]
+        assert columns["views"].tolist() == [1000, 1000, 5000]
+        assert columns["likes"].tolist() == [10, 10, 0]
+        assert archive.titles == ["Video v1", "Video v2"]
+    
+    def test_columns_are_memory_mapped(self, archive):
+        archive.record([make_video("v1")])
+        
+        assert isinstance(archive.column("views"), np.memmap)
+        assert np.shares_memory(archive.columns()["views"], archive.column("views"))
+    
+    def test_reopen(self, archive, clock):
+        archive.record([make_video("v1")])
+        clock.now += 60
+        archive.record([make_video("v1")], taken_at=clock.now)
+        
+        reopened = StatsArchive(archive.path)
+        assert len(reopened) == 2
+        assert reopened.video_ids == ["v1"]
+        assert reopened.columns()["taken_at"].tolist() == [int(clock.now) - 60, int(clock.now)]
+    
+    def test_snippet_change_is_kept_on_reopen(self, archive):
+        archive.record([make_video("v1")])
+        renamed = make_video("v1")
+        renamed["snippet"] = dict(renamed["snippet"], title="Renamed")
+        archive.record([renamed])
+        
+        assert StatsArchive(archive.path).titles == ["Renamed"]
+    
+    def test_out_of_order_append_rejected(self, archive, clock):
+        archive.record([make_video("v1")])
+        
+        with pytest.raises(ValueError):
+            archive.record([make_video("v1")], taken_at=clock.now - 1)
+        with pytest.raises(ValueError):
+            archive.append(["v1", "v2"], [clock.now + 2, clock.now + 1], [1, 2], [0, 0], [0, 0])
+        assert len(archive) == 1
+    
+    def test_torn_append_is_ignored_and_truncated(self, archive, clock):
+        archive.record([make_video("v1")])
+        with open(os.path.join(archive.path, column_file("views")), "ab") as f:
+            f.write(b"\x01\x02\x03")
+        
+        reopened = StatsArchive(archive.path, clock=clock)
+        assert len(reopened) == 1
+        reopened.record([make_video("v2")])
+        assert reopened.columns()["views"].tolist() == [1000, 1000]
+    
+    def test_torn_video_line_is_dropped_before_next_append(self, archive, clock):
+        archive.record([make_video("A"), make_video("B")])
+        with open(os.path.join(archive.path, "videos.jsonl"), "ab") as f:
+            f.write(b'[2, "C", "UC')
+        
+        reopened = StatsArchive(archive.path, clock=clock)
+        assert reopened.video_ids == ["A", "B"]
+        clock.now += 60
+        reopened.record([make_video("D"), with_views(make_video("E"), 5000)])
+        
+        reloaded = StatsArchive(archive.path)
+        assert reloaded.video_ids == ["A", "B", "D", "E"]
+        frame = reloaded.to_frame(now=NOW)
+        assert dict(zip(frame.video_id, frame.views.tolist())) == {"A": 1000, "B": 1000, "D": 1000, "E": 5000}
+    
+    def test_time_range(self, archive):
+        archive.append(["v1", "v2", "v1", "v2"], [100, 100, 200, 300], [1, 2, 3, 4], [0] * 4, [0] * 4)
+        
+        assert archive.row_range(100, 200) == (0, 2)
+        assert archive.row_range(150) == (2, 4)
+        assert archive.columns(200, 301)["views"].tolist() == [3, 4]
+    
+    @pytest.mark.parametrize("chunk_rows", [1, 2, 1000])
+    def test_scan_covers_range(self, archive, chunk_rows):
+        archive.append([f"v{i % 3}" for i in range(10)], list(range(10)), list(range(10)), [0] * 10, [0] * 10)
+        
+        chunks = list(archive.scan(2, 9, chunk_rows=chunk_rows))
+        assert np.concatenate([c["views"] for c in chunks]).tolist() == list(range(2, 9))
+        assert all(len(c["views"]) <= chunk_rows for c in chunks)
+    
+    @pytest.mark.parametrize("chunk_rows", [1, 3, 1000])
+    def test_latest_and_views_per_day(self, archive, chunk_rows):
+        day = SECONDS_PER_DAY
+        archive.append(["v1", "v2", "v1", "v3", "v1"], [0, 0, day, day, 2 * day],
+                       [100, 50, 300, 7, 700], [1, 2, 3, 4, 5], [0] * 5)
+        
+        latest = archive.latest(chunk_rows=chunk_rows)
+        assert latest["video"].tolist() == [0, 1, 2]
+        assert latest["views"].tolist() == [700, 50, 7]
+        assert latest["likes"].tolist() == [5, 2, 4]
+        assert latest["views_per_day"][0] == 300.0
+        assert np.isnan(latest["views_per_day"][1:]).all()
+        
+        in_range = archive.latest(0, day + 1, chunk_rows=chunk_rows)
+        assert in_range["views"].tolist() == [300, 50, 7]
+        assert in_range["views_per_day"][0] == 200.0
+
+
+class TestAnalyzeArchive:
+    
+    @pytest.fixture
+    def analyzer(self):
+        with patch("src.analyzer.YouTubeClient"):
+            return VideoAnalyzer(api_key="test_key")
+    
+    def test_single_snapshot_matches_frame(self, analyzer, archive):
+        videos = [with_views(make_video(f"v{i}"), 10_000 * (i + 1)) for i in range(5)]
+        archive.record(videos)
+        
+        frame = analyzer.analyze_archive(archive, now=NOW)
+        assert frame.to_records() == VideoFrame.from_videos(videos, now=NOW).to_records()
+    
+    def test_growth_uses_measured_rate(self, analyzer, archive, clock):
+        archive.record([with_views(make_video("v1"), 1000)])
+        clock.now += SECONDS_PER_DAY
+        archive.record([with_views(make_video("v1"), 2_001_000)])
+        
+        frame = analyzer.analyze_archive(archive, now=NOW)
+        assert frame.views.tolist() == [2_001_000]
+        assert frame.growth_score.tolist() == [10.0]
+        assert analyzer.get_comparison_data(frame)["total_videos"] == 1
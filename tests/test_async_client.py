@@ -0,0 +1,120 @@
+"""
+Tests for the AsyncYouTubeClient class and concurrent channel analysis.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+from src.analyzer import VideoAnalyzer
+from src.async_client import AsyncYouTubeClient
+from tests.conftest import FakeAPI
+
+
+class SlowAPI(FakeAPI):
+    """FakeAPI that takes `delay` seconds per call and tracks peak concurrency."""
+    
+    def __init__(self, total, delay=0.05):
+        super().__init__(total)
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, endpoint, params, priority=None):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return super().__call__(endpoint, params)
+
+
+def run_with(api, coro_factory, max_concurrency=16):
+    async def main():
+        async with AsyncYouTubeClient(api_key="test_key", max_concurrency=max_concurrency) as client:
+            with patch.object(client.client, "_get", side_effect=api):
+                return await coro_factory(client)
+    return asyncio.run(main())
+
+
+class TestAsyncYouTubeClient:
+    
+    def test_get_channel_videos(self):
+        api = FakeAPI(total=120)
+        videos = run_with(api, lambda c: c.get_channel_videos(max_results=5))
+        
+        assert [v["id"] for v in videos] == ["v0", "v1", "v2", "v3", "v4"]
+        assert api.count("videos") == 1
+    
+    def test_limit_spans_pages(self):
+        api = FakeAPI(total=120)
+        videos = run_with(api, lambda c: c.get_channel_videos(max_results=70))
+        
+        assert len(videos) == 70
+        assert [p["maxResults"] for name, p in api.calls if name == "playlistItems"] == [50, 20]
+    
+    def test_video_details_keep_order(self):
+        api = FakeAPI(total=0)
+        video_ids = [f"v{i}" for i in range(120)]
+        videos = run_with(api, lambda c: c.get_video_details(video_ids))
+        
+        assert [v["id"] for v in videos] == video_ids
+    
+    def test_channels_fetched_concurrently(self):
+        """Test that wall-clock time tracks one channel, not the sum of all."""
+        api = SlowAPI(total=5, delay=0.05)
+        channel_ids = [f"UC{i}" for i in range(20)]
+        
+        start = time.perf_counter()
+        results = run_with(api, lambda c: c.get_many_channel_videos(channel_ids))
+        elapsed = time.perf_counter() - start
+        
+        # Sequentially: 20 channels x 3 calls x 50ms = 3s
+        assert list(results) == channel_ids
+        assert elapsed < 1.0
+    
+    def test_channels_resolved_in_bulk(self):
+        api = FakeAPI(total=5)
+        channel_ids = [f"UC{i}" for i in range(60)]
+        run_with(api, lambda c: c.get_many_channel_videos(channel_ids))
+        
+        assert api.count("channels") == 2
+    
+    def test_failed_channel_batch_only_fails_its_channels(self):
+        api = FakeAPI(total=5)
+        
+        def flaky(endpoint, params, priority=None):
+            if endpoint == "channels" and "UC0" in params["id"].split(","):
+                raise ConnectionError("channels batch failed")
+            return api(endpoint, params)
+        
+        channel_ids = [f"UC{i}" for i in range(60)]
+        results = run_with(flaky, lambda c: c.get_many_channel_videos(channel_ids, return_exceptions=True))
+        
+        assert isinstance(results["UC0"], ConnectionError)
+        assert [v["id"] for v in results["UC1"]] == ["v0", "v1", "v2", "v3", "v4"]
+        assert [v["id"] for v in results["UC59"]] == ["v0", "v1", "v2", "v3", "v4"]
+    
+    def test_concurrency_is_bounded(self):
+        api = SlowAPI(total=5, delay=0.02)
+        channel_ids = [f"UC{i}" for i in range(20)]
+        run_with(api, lambda c: c.get_many_channel_videos(channel_ids), max_concurrency=4)
+        
+        assert api.peak <= 4
+
+
+class TestAnalyzeChannels:
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_results_keyed_by_channel(self, mock_client_class):
+        mock_client_class.return_value = Mock(keys="test_key")
+        analyzer = VideoAnalyzer(api_key="test_key")
+        api = FakeAPI(total=10)
+        
+        with patch("src.youtube_client.YouTubeClient._get", side_effect=api):
+            results = analyzer.analyze_channels(["UC1", "UC2"], count=3)
+        
+        assert list(results) == ["UC1", "UC2"]
+        assert [r["video_id"] for r in results["UC1"]] == ["v0", "v1", "v2"]
@@ -0,0 +1,224 @@
+"""
+Tests for the HTTP response cache.
+"""
+
+import json
+import os
+import pytest
+from unittest.mock import Mock, patch
+from src.cache import ResponseCache, MemoryCache, DiskCache, PartCache, cache_key
+from src.fields import ANALYSIS_FIELDS, SEARCH_FIELDS
+from src.youtube_client import YouTubeClient
+
+
+class FakeTransport:
+    """Serves one JSON body with an ETag, answering 304 when it matches."""
+    
+    def __init__(self, etag='"v1"'):
+        self.etag = etag
+        self.requests = []
+    
+    def fetch(self, url, params=None, headers=None):
+        self.requests.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == self.etag:
+            return Mock(status_code=304, headers={})
+        body = {"etag": self.etag, "items": [{"id": "v0"}]}
+        return Mock(status_code=200, headers={"ETag": self.etag}, json=Mock(return_value=body))
+
+
+class TestResponseCache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        self.clock = clock
+        self.transport = FakeTransport()
+        self.cache = ResponseCache(MemoryCache(), ttls={"videos": 60}, clock=self.clock)
+    
+    def fetch(self, endpoint="videos", params=None):
+        params = params or {"id": "v0", "key": "k"}
+        return self.cache.fetch(
+            lambda headers: self.transport.fetch("https://api/" + endpoint, params, headers), endpoint, params
+        )
+    
+    def test_fresh_entry_skips_network(self):
+        self.fetch()
+        body = self.fetch()
+        
+        assert body["items"][0]["id"] == "v0"
+        assert len(self.transport.requests) == 1
+        assert self.cache.stats["hits"] == 1
+        assert self.cache.stats["misses"] == 1
+    
+    def test_stale_entry_revalidates_with_etag(self):
+        self.fetch()
+        self.clock.now += 61
+        body = self.fetch()
+        
+        assert body["items"][0]["id"] == "v0"
+        assert self.transport.requests[-1] == {"If-None-Match": '"v1"'}
+        assert self.cache.stats["revalidations"] == 1
+        assert self.cache.stats["hits"] == 1
+    
+    def test_changed_etag_is_a_miss(self):
+        self.fetch()
+        self.clock.now += 61
+        self.transport.etag = '"v2"'
+        body = self.fetch()
+        
+        assert body["etag"] == '"v2"'
+        assert self.cache.stats["misses"] == 2
+    
+    def test_errors_are_not_cached(self):
+        self.transport.fetch = Mock(return_value=Mock(
+            status_code=403, headers={}, json=Mock(return_value={"error": {"code": 403}})
+        ))
+        self.fetch()
+        
+        assert len(self.cache.backend) == 0
+    
+    def test_evict_expired_uses_endpoint_ttl(self):
+        self.fetch("videos", {"id": "a"})
+        self.fetch("channels", {"id": "b"})
+        self.clock.now += 61
+        
+        assert self.cache.evict_expired() == 1
+        assert self.cache.backend.keys() == [cache_key("channels", {"id": "b"})]
+    
+    def test_api_key_not_in_cache_key(self):
+        assert cache_key("videos", {"id": "a", "key": "secret"}) == cache_key("videos", {"id": "a"})
+
+
+class TestBackends:
+
+    def test_memory_lru_eviction(self):
+        backend = MemoryCache(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        
+        assert backend.keys() == ["a", "c"]
+        assert backend.evictions == 1
+    
+    def test_disk_persists_across_instances(self, tmp_path):
+        DiskCache(tmp_path).set("videos?x", {"stored_at": 1, "body": {"ok": True}})
+        
+        assert DiskCache(tmp_path).get("videos?x")["body"] == {"ok": True}
+    
+    def test_disk_size_cap(self, tmp_path):
+        backend = DiskCache(tmp_path, max_bytes=300)
+        for i in range(5):
+            backend.set(f"k{i}", {"stored_at": i, "body": "x" * 100})
+        
+        assert len(backend) < 5
+        assert backend.get("k4") is not None
+        assert backend.evictions > 0
+    
+    def test_disk_writes_under_cap_do_not_scan_directory(self, tmp_path):
+        backend = DiskCache(tmp_path, max_bytes=10_000)
+        
+        with patch("src.cache.os.listdir", wraps=os.listdir) as listdir:
+            for i in range(20):
+                backend.set(f"k{i}", {"stored_at": i, "body": "x" * 100})
+            backend.set("k0", {"stored_at": 99, "body": "y"})
+            backend.delete("k1")
+        
+        assert listdir.call_count == 0
+        assert backend._size == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+        assert DiskCache(tmp_path)._size == backend._size
+
+
+class TestPartCache:
+
+    def item(self, video_id):
+        return {"id": video_id, "snippet": {"title": video_id}, "statistics": {"viewCount": "1"}}
+    
+    def test_covers_only_fetched_fields(self):
+        cache = PartCache()
+        cache.update([self.item("v1")], ANALYSIS_FIELDS)
+        
+        assert cache.covers(["v1"], "snippet", ANALYSIS_FIELDS.part_fields("snippet"))
+        assert not cache.covers(["v1"], "snippet", SEARCH_FIELDS.part_fields("snippet"))
+        assert not cache.covers(["v1"], "snippet", None)
+        assert not cache.covers(["v1", "v2"], "snippet", ANALYSIS_FIELDS.part_fields("snippet"))
+        assert not cache.covers(["v1"], "statistics", None)
+    
+    def test_fill(self):
+        cache = PartCache()
+        cache.update([self.item("v1")], ANALYSIS_FIELDS)
+        
+        item = cache.fill({"id": "v1", "statistics": {"viewCount": "5"}}, ANALYSIS_FIELDS)
+        
+        assert item == {"id": "v1", "statistics": {"viewCount": "5"}, "snippet": {"title": "v1"}}
+        assert cache.hits == 1
+    
+    def test_lru_eviction(self):
+        cache = PartCache(max_videos=2)
+        for video_id in ("v1", "v2", "v3"):
+            cache.update([self.item(video_id)], ANALYSIS_FIELDS)
+        
+        assert len(cache) == 2
+        assert not cache.covers(["v1"], "snippet", None)
+    
+    def test_parts_expire_after_ttl(self, clock):
+        cache = PartCache(ttl=60, clock=clock)
+        cache.update([self.item("v1")], ANALYSIS_FIELDS)
+        fields = ANALYSIS_FIELDS.part_fields("snippet")
+        
+        clock.now += 59
+        assert cache.covers(["v1"], "snippet", fields)
+        clock.now += 1
+        assert not cache.covers(["v1"], "snippet", fields)
+        
+        cache.update([self.item("v1")], ANALYSIS_FIELDS)
+        assert cache.covers(["v1"], "snippet", fields)
+
+
+class RenamingVideo:
+    """One video's `videos` responses, ETag-tagged by content so unchanged statistics revalidate."""
+    
+    def __init__(self):
+        self.title = "Old title"
+    
+    def fetch(self, url, params=None, headers=None):
+        item = {"id": "v1", "statistics": {"viewCount": "10", "likeCount": "1", "commentCount": "0"}}
+        if "snippet" in params["part"]:
+            item["snippet"] = {"channelId": "UC1", "title": self.title, "publishedAt": "2024-11-20T10:00:00Z"}
+        body = {"items": [item]}
+        etag = f'"{hash(json.dumps(body, sort_keys=True))}"'
+        if headers and headers.get("If-None-Match") == etag:
+            return Mock(status_code=304, headers={})
+        return Mock(status_code=200, headers={"ETag": etag}, json=Mock(return_value=body))
+
+
+class TestClientIntegration:
+
+    def test_client_routes_through_cache(self):
+        transport = FakeTransport()
+        client = YouTubeClient(api_key="test_key", transport=transport, cache=ResponseCache())
+        
+        client.get_video_details(["v0"])
+        client.get_video_details(["v0"])
+        
+        assert len(transport.requests) == 1
+        assert client.cache.stats["hit_ratio"] == 0.5
+    
+    def test_renamed_title_sticks_across_part_cache_expiries(self, clock):
+        api = RenamingVideo()
+        client = YouTubeClient(api_key="test_key", transport=api,
+                               cache=ResponseCache(MemoryCache(), ttls={"videos": 0}, clock=clock),
+                               part_cache=PartCache(ttl=60, clock=clock))
+        
+        def title():
+            (video,) = client.get_video_details(["v1"], fields=ANALYSIS_FIELDS)
+            return video["snippet"]["title"]
+        
+        titles = [title()]
+        clock.now += 10
+        titles.append(title())
+        api.title = "New title"
+        for _ in range(4):
+            clock.now += 35
+            titles.append(title())
+        
+        assert titles == ["Old title"] * 3 + ["New title"] * 3
@@ -0,0 +1,120 @@
+"""
+Tests for the record/replay transports.
+"""
+
+import json
+import pytest
+from datetime import timedelta
+from unittest.mock import Mock
+from src.analyzer import VideoAnalyzer
+from src.cassette import RecordingTransport, ReplayTransport, CassetteMiss
+from src.fields import UPLOADS_PLAYLIST_FIELDS
+from src.youtube_client import YouTubeClient, BASE_URL
+
+
+def live_response(body, status_code=200, elapsed=0.25, etag=None):
+    headers = {"Content-Type": "application/json", "Date": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    if etag:
+        headers["ETag"] = etag
+    return Mock(status_code=status_code, headers=headers, json=Mock(return_value=body),
+                elapsed=timedelta(seconds=elapsed))
+
+
+def fake_api(url, params=None, headers=None):
+    """Answer the three endpoints the client uses for one small channel."""
+    endpoint = url.rsplit("/", 1)[-1]
+    if endpoint == "channels":
+        return live_response({"items": [
+            {"id": "UC1", "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}
+        ]})
+    if endpoint == "playlistItems":
+        return live_response({"items": [
+            {"snippet": {"resourceId": {"videoId": f"v{i}"}}} for i in range(3)
+        ]})
+    return live_response({"items": [
+        {"id": video_id, "snippet": {"title": f"Video {video_id}", "publishedAt": "2024-11-01T00:00:00Z"},
+         "statistics": {"viewCount": "100", "likeCount": "5", "commentCount": "1"}}
+        for video_id in params["id"].split(",")
+    ]}, etag='"videos-etag"')
+
+
+class TestRecordReplay:
+    
+    @pytest.fixture(params=["cassette.jsonl", "cassette.jsonl.gz"])
+    def path(self, request, tmp_path):
+        return str(tmp_path / request.param)
+    
+    def record(self, path):
+        inner = Mock()
+        inner.fetch.side_effect = fake_api
+        with RecordingTransport(path, transport=inner) as recorder:
+            videos = YouTubeClient(api_key="secret-key", transport=recorder).get_channel_videos("UC1", 3)
+        return videos, inner
+    
+    def test_replay_matches_live_run(self, path):
+        live, _ = self.record(path)
+        
+        replay = ReplayTransport(path)
+        replayed = YouTubeClient(api_key="other-key", transport=replay).get_channel_videos("UC1", 3)
+        
+        assert replayed == live
+        assert len(replay) == 3
+        assert replay.requests == 3
+        assert replay.wait_seconds == 0
+    
+    def test_api_key_is_not_recorded(self, tmp_path):
+        path = str(tmp_path / "cassette.jsonl")
+        self.record(path)
+        
+        with open(path) as f:
+            contents = f.read()
+        
+        assert "secret-key" not in contents
+        entry = json.loads(contents.splitlines()[-1])
+        assert entry["headers"] == {"Content-Type": "application/json", "ETag": '"videos-etag"'}
+        assert entry["elapsed"] == 0.25
+    
+    def test_realtime_replay_waits_recorded_latency(self, path):
+        self.record(path)
+        sleeps = []
+        replay = ReplayTransport(path, realtime=True, latency_scale=2.0, sleep=sleeps.append)
+        
+        response = replay.fetch(f"{BASE_URL}/channels", {"part": "contentDetails", "id": "UC1", "key": "k",
+                                                         "fields": UPLOADS_PLAYLIST_FIELDS})
+        
+        assert sleeps == [0.5]
+        assert replay.wait_seconds == 0.5
+        assert response.elapsed == timedelta(seconds=0.25)
+        assert response.headers["content-type"] == "application/json"
+    
+    def test_unrecorded_request_raises(self, path):
+        self.record(path)
+        replay = ReplayTransport(path)
+        
+        with pytest.raises(CassetteMiss):
+            replay.fetch(f"{BASE_URL}/channels", {"part": "contentDetails", "id": "UC2"})
+    
+    def test_repeated_requests_replay_in_order(self, tmp_path):
+        path = str(tmp_path / "cassette.jsonl")
+        inner = Mock()
+        inner.fetch.side_effect = [live_response({"n": 1}), live_response({"n": 2})]
+        with RecordingTransport(path, transport=inner) as recorder:
+            recorder.get("https://example.test/x", {"a": 1})
+            recorder.get("https://example.test/x", {"a": 1})
+        
+        replay = ReplayTransport(path)
+        
+        assert [replay.get("https://example.test/x", {"a": 1})["n"] for _ in range(3)] == [1, 2, 2]
+    
+    def test_portfolio_run_goes_through_cassette(self, path):
+        inner = Mock()
+        inner.fetch.side_effect = fake_api
+        with RecordingTransport(path, transport=inner) as recorder:
+            live = VideoAnalyzer(api_key="secret-key", transport=recorder).analyze_channels(["UC1"], count=3)
+        
+        replay = ReplayTransport(path)
+        replayed = VideoAnalyzer(api_key="replay", transport=replay).analyze_channels(["UC1"], count=3)
+        
+        assert inner.fetch.call_count == 3
+        assert replay.requests == 3
+        assert [r["video_id"] for r in replayed["UC1"]] == [r["video_id"] for r in live["UC1"]] == ["v0", "v1", "v2"]
@@ -0,0 +1,208 @@
+"""
+Tests for comment-thread streaming and conversation metrics.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from src.analyzer import VideoAnalyzer
+from src.async_client import AsyncYouTubeClient
+from src.metrics import CommentStats, TopCounter
+from src.youtube_client import YouTubeClient, APIError
+
+NOW = 1_735_689_600  # 2025-01-01T00:00:00Z
+
+
+def thread(author, replies=0, likes=0, published_at="2024-12-31T00:00:00Z"):
+    return {"snippet": {
+        "totalReplyCount": replies,
+        "topLevelComment": {"snippet": {
+            "authorChannelId": {"value": author}, "publishedAt": published_at, "likeCount": likes
+        }}
+    }}
+
+
+class FakeComments:
+    """Serves `commentThreads` pages for videos with the given thread counts."""
+    
+    def __init__(self, counts, fail=()):
+        self.counts = counts
+        self.fail = fail
+        self.calls = []
+        self.lock = threading.Lock()
+    
+    def __call__(self, endpoint, params, priority=None):
+        assert endpoint == "commentThreads"
+        with self.lock:
+            self.calls.append(dict(params))
+        video_id = params["videoId"]
+        if video_id in self.fail:
+            raise ConnectionError(video_id)
+        if video_id not in self.counts:
+            raise APIError(403, {"error": {"code": 403, "errors": [{"reason": "commentsDisabled"}]}})
+        start = int(params.get("pageToken", 0))
+        end = min(start + params["maxResults"], self.counts[video_id])
+        page = {"items": [thread(f"{video_id}-author{i % 3}", replies=i % 4) for i in range(start, end)]}
+        if end < self.counts[video_id]:
+            page["nextPageToken"] = str(end)
+        return page
+
+
+class TestTopCounter:
+    
+    def test_exact_within_capacity(self):
+        counter = TopCounter(capacity=3)
+        for key in "aabbbc":
+            counter.add(key)
+        
+        assert counter.most_common(2) == [("b", 3), ("a", 2)]
+        assert counter.share(1) == 50.0
+    
+    def test_keeps_heavy_hitters_in_bounded_space(self):
+        counter = TopCounter(capacity=10)
+        stream = ["heavy"] * 500 + [f"once{i}" for i in range(1000)]
+        # Interleave the heavy key with the rest (7919 is coprime with the length)
+        for i in range(len(stream)):
+            counter.add(stream[i * 7919 % len(stream)])
+        
+        assert len(counter.counts) <= 10
+        assert counter.most_common(1)[0][0] == "heavy"
+        assert 500 - counter.total / 11 <= counter.counts["heavy"] <= 500
+    
+    def test_merge(self):
+        first, second = TopCounter(capacity=2), TopCounter(capacity=2)
+        for key in "aab":
+            first.add(key)
+        for key in "aac":
+            second.add(key)
+        
+        merged = first.merge(second)
+        
+        assert merged.total == 6
+        assert len(merged.counts) <= 2
+        assert merged.most_common(1)[0][0] == "a"
+
+
+class TestCommentStats:
+    
+    def test_metrics(self):
+        stats = CommentStats().update([
+            thread("a", replies=3, likes=5, published_at="2024-12-30T00:00:00Z"),
+            thread("a"),
+            thread("b", replies=1),
+            thread("c")
+        ])
+        
+        metrics = stats.to_metrics(now=NOW, top=1)
+        
+        assert metrics["comment_threads"] == 4
+        assert metrics["comments"] == 8
+        assert metrics["comments_per_day"] == 4.0
+        assert metrics["average_replies"] == 1.0
+        assert metrics["max_replies"] == 3
+        assert metrics["reply_rate"] == 50.0
+        assert metrics["comment_likes"] == 5
+        assert metrics["top_commenter_share"] == 50.0
+    
+    def test_velocity_uses_at_least_one_day(self):
+        stats = CommentStats()
+        stats.add(published_ts=NOW - 60, author="a")
+        
+        assert stats.to_metrics(now=NOW)["comments_per_day"] == 1.0
+    
+    def test_empty(self):
+        metrics = CommentStats().to_metrics(now=NOW)
+        
+        assert metrics["comments"] == 0
+        assert metrics["average_replies"] == 0
+        assert metrics["top_commenter_share"] == 0
+    
+    def test_merge_matches_single_pass(self):
+        threads = [thread(f"u{i % 5}", replies=i % 3, published_at=f"2024-12-{i % 28 + 1:02d}T00:00:00Z")
+                   for i in range(50)]
+        merged = CommentStats().update(threads[:20]).merge(CommentStats().update(threads[20:]))
+        
+        assert merged.to_metrics(now=NOW) == CommentStats().update(threads).to_metrics(now=NOW)
+
+
+class TestCommentPaging:
+    
+    def test_pages_until_limit(self):
+        client = YouTubeClient(api_key="test_key")
+        api = FakeComments({"v1": 250})
+        with patch.object(client, "_get", side_effect=api):
+            pages = list(client.iter_comment_pages("v1", limit=150))
+        
+        assert [len(page) for page in pages] == [100, 50]
+        assert [call["maxResults"] for call in api.calls] == [100, 50]
+        assert all("fields" in call and call["order"] == "time" for call in api.calls)
+    
+    def test_comments_disabled_yields_nothing(self):
+        client = YouTubeClient(api_key="test_key")
+        with patch.object(client, "_get", side_effect=FakeComments({})):
+            assert list(client.iter_comment_threads("v1")) == []
+
+
+def stream(api, video_ids, limit=None, max_concurrency=4, stop_after=None):
+    async def main():
+        pages = []
+        async with AsyncYouTubeClient(api_key="test_key", max_concurrency=max_concurrency) as client:
+            with patch.object(client.client, "_get", side_effect=api):
+                async for page in client.stream_comment_threads(video_ids, limit=limit):
+                    pages.append(page)
+                    if stop_after is not None and len(pages) == stop_after:
+                        break
+        return pages
+    return asyncio.run(main())
+
+
+class TestStreamCommentThreads:
+    
+    def test_streams_every_video(self):
+        api = FakeComments({f"v{i}": 120 * i for i in range(6)})
+        
+        pages = stream(api, [f"v{i}" for i in range(6)])
+        
+        threads = {}
+        for video_id, page in pages:
+            threads[video_id] = threads.get(video_id, 0) + len(page)
+        assert threads == {f"v{i}": 120 * i for i in range(1, 6)}
+        assert max(len(page) for _, page in pages) <= 100
+    
+    def test_limit_per_video(self):
+        pages = stream(FakeComments({"v1": 500, "v2": 30}), ["v1", "v2"], limit=120)
+        
+        assert sorted((video_id, len(page)) for video_id, page in pages) == [("v1", 20), ("v1", 100), ("v2", 30)]
+    
+    def test_early_stop_cancels_workers(self):
+        api = FakeComments({f"v{i}": 10_000 for i in range(20)})
+        
+        pages = stream(api, [f"v{i}" for i in range(20)], max_concurrency=2, stop_after=3)
+        
+        assert len(pages) == 3
+        # Two workers, each at most one page ahead beyond the queue
+        assert len(api.calls) <= 3 + 2 + 2
+    
+    def test_errors_propagate(self):
+        with pytest.raises(ConnectionError):
+            stream(FakeComments({"v1": 10}, fail=("v2",)), ["v1", "v2"])
+
+
+class TestAnalyzeComments:
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_metrics_keyed_by_video(self, mock_client_class):
+        mock_client_class.return_value = Mock(keys="test_key")
+        analyzer = VideoAnalyzer(api_key="test_key")
+        api = FakeComments({"v1": 8, "v2": 3})
+        
+        with patch("src.youtube_client.YouTubeClient._get", side_effect=api):
+            results = analyzer.analyze_comments(["v1", "v2", "v3"], now=NOW)
+        
+        assert list(results) == ["v1", "v2", "v3"]
+        assert results["v1"]["comment_threads"] == 8
+        assert results["v1"]["comments"] == 8 + (0 + 1 + 2 + 3) * 2
+        assert results["v1"]["top_commenter_share"] == 100.0
+        assert results["v2"]["max_replies"] == 2
+        assert results["v3"]["comments"] == 0
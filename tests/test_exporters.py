@@ -0,0 +1,106 @@
+"""
+Tests for the streaming JSON Lines, CSV and Parquet exporters.
+"""
+
+import csv
+import io
+import json
+import pytest
+from unittest.mock import Mock
+from main import parse_args, run_export
+from src.exporters import export_jsonl, export_csv, export_parquet, EXPORT_FIELDS
+
+
+def row(video_id, views, title="Video"):
+    return {
+        "channel_id": "UC1",
+        "video_id": video_id,
+        "title": title,
+        "published_at": "2024-11-21T00:00:00Z",
+        "views": views,
+        "likes": 10,
+        "comments": 1,
+        "engagement_rate": 1.5,
+        "growth_score": 2.0,
+        "days_old": 10
+    }
+
+
+class TestExporters:
+    
+    def test_jsonl_one_object_per_line(self):
+        out = io.StringIO()
+        
+        count = export_jsonl([row("a", 100, title="Ünïcode, \"quoted\""), row("b", 200)], out)
+        
+        lines = out.getvalue().splitlines()
+        assert count == 2
+        assert [json.loads(line)["video_id"] for line in lines] == ["a", "b"]
+        assert json.loads(lines[0])["title"] == "Ünïcode, \"quoted\""
+        assert list(json.loads(lines[0])) == list(EXPORT_FIELDS)
+    
+    def test_csv_header_and_rows(self):
+        out = io.StringIO(newline="")
+        
+        count = export_csv([row("a", 100, title="Comma, title"), row("b", 200)], out)
+        
+        out.seek(0)
+        rows = list(csv.DictReader(out))
+        assert count == 2
+        assert [r["video_id"] for r in rows] == ["a", "b"]
+        assert rows[0]["title"] == "Comma, title"
+        assert rows[1]["views"] == "200"
+    
+    def test_rows_are_written_as_they_arrive(self):
+        out = io.StringIO()
+        
+        def rows():
+            for i in range(3):
+                # Every earlier row is already written before the next is produced
+                assert out.getvalue().count("\n") == i
+                yield row(f"v{i}", i)
+        
+        assert export_jsonl(rows(), out) == 3
+    
+    def test_parquet_row_groups(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "videos.parquet"
+        
+        count = export_parquet((row(f"v{i}", i) for i in range(5)), str(path), row_group_size=2)
+        
+        parquet = pq.ParquetFile(path)
+        assert count == 5
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.read().column("views").to_pylist() == [0, 1, 2, 3, 4]
+
+
+class TestExportCommand:
+    
+    def test_binary_format_requires_output(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--format", "parquet"])
+        assert parse_args(["--format", "csv"]).output is None
+    
+    def test_streams_single_channel_to_stdout(self, capsys):
+        analyzer = Mock()
+        analyzer.iter_analysis.return_value = iter([row("a", 100), row("b", 200)])
+        stdout = io.StringIO()
+        
+        ok = run_export(analyzer, ["UC9"], parse_args(["UC9", "--format", "jsonl"]), stdout)
+        
+        assert ok
+        analyzer.stream_channel_videos.assert_called_once_with("UC9", limit=5)
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [r["channel_id"] for r in rows] == ["UC9", "UC9"]
+        assert "Wrote 2 rows" in capsys.readouterr().out
+    
+    def test_portfolio_skips_failed_channels(self, tmp_path):
+        analyzer = Mock()
+        analyzer.analyze_channels.return_value = {"UC1": [row("a", 100)], "UC2": RuntimeError("boom")}
+        path = tmp_path / "out.csv"
+        
+        ok = run_export(analyzer, ["UC1", "UC2"], parse_args(["--format", "csv", "-o", str(path)]), None)
+        
+        assert not ok
+        with open(path, newline="") as f:
+            assert [r["video_id"] for r in csv.DictReader(f)] == ["a"]
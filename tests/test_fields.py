@@ -0,0 +1,70 @@
+"""
+Tests for field projections and partial responses.
+"""
+
+from src.fields import (
+    FieldMask,
+    parse_selector,
+    apply_fields,
+    ANALYSIS_FIELDS,
+    STATISTICS_FIELDS,
+    SEARCH_FIELDS,
+    PLAYLIST_ITEM_FIELDS
+)
+
+
+class TestFieldMask:
+    
+    def test_parts_and_selector(self):
+        assert ANALYSIS_FIELDS.parts == ["snippet", "statistics"]
+        assert ANALYSIS_FIELDS.selector() == (
+            "items(id,snippet(channelId,title,publishedAt),statistics(viewCount,likeCount,commentCount))"
+        )
+        assert ANALYSIS_FIELDS.selector(["statistics"]) == "items(id,statistics(viewCount,likeCount,commentCount))"
+    
+    def test_whole_part_wins_over_its_fields(self):
+        mask = FieldMask("snippet.title", "snippet", "statistics.viewCount", "snippet.tags")
+        
+        assert mask.selector() == "items(id,snippet,statistics(viewCount))"
+        assert mask.part_fields("snippet") is None
+        assert mask.part_fields("statistics") == {"viewCount"}
+    
+    def test_nested_paths(self):
+        assert FieldMask("snippet.thumbnails.default").selector() == "items(id,snippet(thumbnails(default)))"
+    
+    def test_union(self):
+        assert SEARCH_FIELDS.part_fields("snippet") == {"channelId", "title", "publishedAt", "tags", "description"}
+        assert STATISTICS_FIELDS | FieldMask("statistics") == FieldMask("statistics")
+
+
+class TestSelectors:
+    
+    def test_parse(self):
+        assert parse_selector("items(id,snippet/title),nextPageToken") == {
+            "items": {"id": {}, "snippet": {"title": {}}},
+            "nextPageToken": {}
+        }
+    
+    def test_round_trips_mask_selector(self):
+        assert parse_selector(ANALYSIS_FIELDS.selector()) == {"items": ANALYSIS_FIELDS.tree}
+    
+    def test_apply(self):
+        body = {
+            "kind": "youtube#playlistItemListResponse",
+            "nextPageToken": "CAUQAA",
+            "items": [
+                {"etag": "x", "snippet": {"title": "A", "resourceId": {"kind": "youtube#video", "videoId": "v1"}}},
+                {"etag": "y", "snippet": {"title": "B", "resourceId": {"kind": "youtube#video", "videoId": "v2"}}}
+            ]
+        }
+        
+        assert apply_fields(body, PLAYLIST_ITEM_FIELDS) == {
+            "nextPageToken": "CAUQAA",
+            "items": [
+                {"snippet": {"resourceId": {"videoId": "v1"}}},
+                {"snippet": {"resourceId": {"videoId": "v2"}}}
+            ]
+        }
+    
+    def test_missing_fields_are_left_out(self):
+        assert apply_fields({"items": [{"id": "v1"}]}, "items(id,statistics)") == {"items": [{"id": "v1"}]}
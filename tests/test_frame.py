@@ -0,0 +1,128 @@
+"""
+Tests for the columnar VideoFrame and vectorized metrics.
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+from src.analyzer import VideoAnalyzer, analyze_video
+from src.frame import VideoFrame, days_since
+from src.metrics import (
+    calculate_engagement_rate,
+    calculate_growth_score,
+    calculate_virality_index,
+    calculate_engagement_rates,
+    calculate_growth_scores,
+    calculate_virality_indices
+)
+from tests.conftest import mock_videos
+
+
+class TestVectorizedMetrics:
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.views = rng.integers(1, 50_000_000, 500)
+        self.likes = rng.integers(0, 1_000_000, 500)
+        self.comments = rng.integers(0, 100_000, 500)
+        self.days_old = rng.integers(0, 400, 500)
+    
+    def test_engagement_matches_scalar(self):
+        expected = [calculate_engagement_rate(int(l), int(v)) for l, v in zip(self.likes, self.views)]
+        assert calculate_engagement_rates(self.likes, self.views) == pytest.approx(expected)
+    
+    def test_engagement_zero_views(self):
+        assert calculate_engagement_rates([5], [0]).tolist() == [0.0]
+    
+    def test_growth_matches_scalar(self):
+        expected = [calculate_growth_score(int(v), int(d)) for v, d in zip(self.views, self.days_old)]
+        assert calculate_growth_scores(self.views, self.days_old).tolist() == expected
+    
+    def test_growth_threshold_boundaries(self):
+        views = np.array([10000, 10001, 1000000, 1000001])
+        expected = [calculate_growth_score(int(v), 100) for v in views]
+        assert calculate_growth_scores(views, np.full(4, 100)).tolist() == expected
+    
+    def test_growth_with_measured_rate_matches_scalar(self):
+        rates = np.where(self.days_old % 2 == 0, self.views / 100.0, np.nan)
+        expected = [
+            calculate_growth_score(int(v), int(d), None if np.isnan(r) else float(r))
+            for v, d, r in zip(self.views, self.days_old, rates)
+        ]
+        assert calculate_growth_scores(self.views, self.days_old, rates).tolist() == expected
+    
+    def test_virality_matches_scalar(self):
+        expected = [
+            calculate_virality_index(int(v), int(l), int(c), int(d))
+            for v, l, c, d in zip(self.views, self.likes, self.comments, self.days_old)
+        ]
+        assert calculate_virality_indices(self.views, self.likes, self.comments, self.days_old).tolist() == expected
+
+
+class TestVideoFrame:
+
+    def test_matches_per_video_analysis(self):
+        now = datetime(2024, 12, 1, tzinfo=timezone.utc)
+        videos = mock_videos()
+        frame = VideoFrame.from_videos(videos, now=now)
+        
+        assert frame.views.dtype == np.int64
+        assert frame.engagement_rate.dtype == np.float64
+        for record, video in zip(frame.to_records(), videos):
+            expected = analyze_video(video)
+            assert record["video_id"] == expected["video_id"]
+            assert record["views"] == expected["views"]
+            assert record["engagement_rate"] == expected["engagement_rate"]
+        assert frame.days_old.tolist() == [10, 15, 20, 25, 29]
+    
+    def test_days_since_missing_date(self):
+        now = datetime(2024, 12, 1, tzinfo=timezone.utc)
+        published = [np.nan, datetime(2024, 11, 30, 12, tzinfo=timezone.utc).timestamp()]
+        
+        assert days_since(published, now).tolist() == [0, 0]
+    
+    def test_records_round_trip(self):
+        frame = VideoFrame.from_videos(mock_videos())
+        
+        again = VideoFrame.from_records(frame.to_records())
+        
+        assert again.to_records() == frame.to_records()
+        assert frame.record(0)["published_at"] == "2024-11-20T10:00:00Z"
+    
+    def test_mask_selects_rows(self):
+        frame = VideoFrame.from_videos(mock_videos())
+        subset = frame[frame.views > 1_000_000]
+        
+        assert subset.video_id.tolist() == ["video1", "video2"]
+        assert frame["views"] is frame.views
+
+
+class TestAnalyzerFrames:
+
+    @patch('src.analyzer.YouTubeClient')
+    def test_comparison_over_frame(self, mock_client_class):
+        mock_client_class.return_value = Mock()
+        analyzer = VideoAnalyzer(api_key="test_key")
+        analyzer.videos = mock_videos()
+        
+        frame = analyzer.analyze_frame()
+        comparison = analyzer.get_comparison_data(frame)
+        expected = analyzer.get_comparison_data(analyzer.analyze_videos())
+        
+        for field in ["total_videos", "total_views", "total_likes", "total_comments"]:
+            assert comparison[field] == expected[field]
+        assert comparison["average_engagement"] == pytest.approx(expected["average_engagement"])
+        assert comparison["top_performer"]["video_id"] == "video2"
+        assert comparison["best_engagement"]["video_id"] == expected["best_engagement"]["video_id"]
+    
+    @patch('src.analyzer.YouTubeClient')
+    def test_filter_over_frame(self, mock_client_class):
+        mock_client_class.return_value = Mock()
+        analyzer = VideoAnalyzer(api_key="test_key")
+        frame = analyzer.analyze_frame(mock_videos())
+        
+        filtered = analyzer.filter_by_performance(frame, min_views=800_000, min_engagement=3.3)
+        
+        assert isinstance(filtered, VideoFrame)
+        assert filtered.video_id.tolist() == ["video1", "video2", "video3"]
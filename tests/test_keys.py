@@ -0,0 +1,149 @@
+"""
+Tests for API key pooling and rotation.
+"""
+
+import pytest
+from unittest.mock import Mock
+from src.keys import APIKeyPool, mask_key
+from src.scheduler import RequestScheduler, QuotaExceededError
+from src.youtube_client import YouTubeClient, APIError
+
+
+def response(status_code, body):
+    return Mock(status_code=status_code, headers={}, json=Mock(return_value=body))
+
+
+def error_response(reason, status_code=403):
+    return response(status_code, {"error": {"code": status_code, "errors": [{"reason": reason}]}})
+
+
+class TestAPIKeyPool:
+    
+    def test_requires_a_key(self):
+        with pytest.raises(ValueError):
+            APIKeyPool.from_keys(None)
+        with pytest.raises(ValueError):
+            APIKeyPool([])
+    
+    def test_from_keys_accepts_string_list_or_pool(self):
+        pool = APIKeyPool.from_keys(["a", "b", "a"])
+        
+        assert APIKeyPool.from_keys("a").keys == ["a"]
+        assert pool.keys == ["a", "b"]
+        assert APIKeyPool.from_keys(pool) is pool
+    
+    def test_spreads_requests_without_scheduler(self):
+        pool = APIKeyPool(["a", "b", "c"])
+        
+        chosen = [pool.choose() for _ in range(6)]
+        
+        assert sorted(chosen) == ["a", "a", "b", "b", "c", "c"]
+    
+    def test_prefers_key_with_most_quota_left(self):
+        scheduler = RequestScheduler(daily_quota=100)
+        pool = APIKeyPool(["a", "b"])
+        for _ in range(10):
+            scheduler.acquire("videos", key="b")
+        
+        assert pool.choose(scheduler) == "a"
+    
+    def test_disabled_keys_leave_rotation(self):
+        pool = APIKeyPool(["a", "b"])
+        pool.disable("a")
+        
+        assert [pool.choose() for _ in range(3)] == ["b", "b", "b"]
+        
+        pool.disable("b", "keyInvalid")
+        assert pool.choose() is None
+        
+        pool.enable_all()
+        assert pool.choose() is not None
+    
+    def test_quota_disabled_keys_return_next_quota_day(self):
+        today = ["2025-01-01"]
+        pool = APIKeyPool(["a", "b"], day=lambda: today[0])
+        pool.disable("a")
+        pool.disable("b", "keyInvalid")
+        assert pool.choose() is None
+        
+        today[0] = "2025-01-02"
+        
+        assert pool.active_keys == ["a"]
+        assert pool.choose() == "a"
+    
+    def test_usage_masks_keys(self):
+        scheduler = RequestScheduler(daily_quota=100)
+        pool = APIKeyPool(["secret-aaaa1234"])
+        pool.choose(scheduler)
+        scheduler.acquire("videos", key="secret-aaaa1234")
+        
+        usage = pool.usage(scheduler)
+        
+        assert list(usage) == [mask_key("secret-aaaa1234")]
+        assert "secret" not in list(usage)[0]
+        assert usage[mask_key("secret-aaaa1234")] == {
+            "requests": 1, "errors": 0, "active": True, "disabled_reason": None, "used": 1, "remaining": 99
+        }
+
+
+class TestClientKeyRotation:
+    
+    def test_requests_use_keys_from_the_pool(self):
+        transport = Mock()
+        transport.fetch.return_value = response(200, {"items": []})
+        client = YouTubeClient(api_key=["a", "b"], transport=transport)
+        
+        client.get_video_details(["v1"])
+        client.get_video_details(["v2"])
+        
+        used = [call.kwargs["params"]["key"] for call in transport.fetch.call_args_list]
+        assert sorted(used) == ["a", "b"]
+    
+    def test_quota_error_rotates_to_next_key(self):
+        scheduler = RequestScheduler(daily_quota=100)
+        transport = Mock()
+        transport.fetch.side_effect = [error_response("quotaExceeded"), response(200, {"items": []})]
+        client = YouTubeClient(api_key=["a", "b"], transport=transport, scheduler=scheduler)
+        
+        assert client.get_video_details(["v1"]) == []
+        
+        first, second = [call.kwargs["params"]["key"] for call in transport.fetch.call_args_list]
+        assert first != second
+        assert scheduler.remaining(first) == 0
+        assert client.keys.active_keys == [second]
+    
+    def test_raises_when_every_key_is_rejected(self):
+        transport = Mock()
+        transport.fetch.side_effect = [error_response("quotaExceeded"), error_response("keyInvalid", 400)]
+        client = YouTubeClient(api_key=["a", "b"], transport=transport)
+        
+        with pytest.raises(QuotaExceededError):
+            client.get_video_details(["v1"])
+        assert transport.fetch.call_count == 2
+    
+    def test_resource_errors_keep_key_in_rotation(self):
+        transport = Mock()
+        transport.fetch.return_value = error_response("commentsDisabled")
+        client = YouTubeClient(api_key=["a", "b"], transport=transport)
+        
+        with pytest.raises(APIError) as raised:
+            client._get("commentThreads", {"videoId": "v1"})
+        
+        assert raised.value.reason == "commentsDisabled"
+        assert transport.fetch.call_count == 1
+        assert client.keys.active_keys == ["a", "b"]
+    
+    def test_expensive_request_over_budget_keeps_key_in_rotation(self):
+        scheduler = RequestScheduler(daily_quota=150)
+        for _ in range(100):
+            scheduler.acquire("videos", key="a")
+        transport = Mock()
+        transport.fetch.return_value = response(200, {"items": []})
+        client = YouTubeClient(api_key="a", transport=transport, scheduler=scheduler)
+        
+        with pytest.raises(QuotaExceededError):
+            client._get("search", {"q": "x"})
+        
+        assert transport.fetch.call_count == 0
+        assert client.keys.active_keys == ["a"]
+        assert client.get_video_details(["v1"]) == []
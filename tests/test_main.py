@@ -0,0 +1,66 @@
+"""
+Tests for the command-line entry point.
+"""
+
+import subprocess
+import sys
+import pytest
+from main import parse_args, collect_channel_ids, run
+from src.snapshots import SnapshotStore
+
+
+class TestChannelSelection:
+    
+    def test_defaults_to_no_channels(self):
+        assert collect_channel_ids(parse_args([])) == []
+    
+    def test_merges_args_and_file(self, tmp_path):
+        channels_file = tmp_path / "channels.txt"
+        channels_file.write_text("# network\nUC2\n\nUC3  # music\nUC1\n")
+        
+        args = parse_args(["UC1", "UC2", "--channels-file", str(channels_file), "-n", "10"])
+        
+        assert collect_channel_ids(args) == ["UC1", "UC2", "UC3"]
+        assert args.count == 10
+
+
+class TestOfflineReport:
+    
+    @pytest.fixture
+    def snapshot_db(self, tmp_path):
+        path = str(tmp_path / "snapshots.db")
+        with SnapshotStore(path) as store:
+            store.record([
+                {"id": f"v{i}", "snippet": {"channelId": "UC1", "title": f"Video {i}",
+                                            "publishedAt": f"2024-0{i + 1}-01T00:00:00Z"},
+                 "statistics": {"viewCount": str(1000 * (i + 1)), "likeCount": "20", "commentCount": "2"}}
+                for i in range(3)
+            ])
+        return path
+    
+    def test_renders_latest_stored_videos(self, snapshot_db, capsys):
+        run(parse_args(["UC1", "--offline", "--snapshot-db", snapshot_db, "-n", "2"]))
+        
+        out = capsys.readouterr().out
+        assert "Video 2" in out and "Video 1" in out
+        assert "Video 0" not in out
+        assert "TOP PERFORMER" in out
+    
+    def test_unknown_channel_fails(self, snapshot_db):
+        with pytest.raises(SystemExit):
+            run(parse_args(["UC9", "--offline", "--snapshot-db", snapshot_db]))
+    
+    def test_requires_snapshot_db(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--offline"])
+    
+    def test_does_not_import_network_stack(self, snapshot_db):
+        code = (
+            "import sys; sys.argv = ['main.py', 'UC1', '--offline', '--snapshot-db', sys.argv[1]]; "
+            "import main; main.main(); "
+            "print(sorted(m for m in ('requests', 'asyncio', 'dotenv', 'http.server', 'src.youtube_client', "
+            "'src.analyzer') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code, snapshot_db], capture_output=True, text=True, check=True)
+        
+        assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -7,7 +7,9 @@ from src.metrics import (
     calculate_engagement_rate,
     calculate_growth_score,
     calculate_virality_index,
-    calculate_performance_percentile
+    calculate_performance_percentile,
+    calculate_percentiles,
+    calculate_ranks
 )
 
 
@@ -132,3 +134,26 @@ class TestPerformancePercentile:
         result = calculate_performance_percentile(video_views, all_views)
         
         assert result == 0
+
+
+class TestBatchRanking:
+    
+    def test_percentiles_match_single_lookup(self):
+        all_views = [750000, 100000, 1000000, 200000, 500000]
+        
+        result = calculate_percentiles(all_views)
+        
+        assert result.tolist() == [calculate_performance_percentile(v, all_views) for v in all_views]
+    
+    def test_ties_share_percentile_and_rank(self):
+        views = [300, 100, 300, 200]
+        
+        assert calculate_percentiles(views).tolist() == [50.0, 0.0, 50.0, 25.0]
+        assert calculate_ranks(views).tolist() == [1, 4, 1, 3]
+    
+    def test_empty_column(self):
+        assert len(calculate_percentiles([])) == 0
+        assert len(calculate_ranks([])) == 0
+    
+    def test_value_missing_from_list(self):
+        assert calculate_performance_percentile(150000, [100000, 200000]) == 50.0
@@ -0,0 +1,122 @@
+"""
+Tests for process-pool metric computation.
+"""
+
+import gc
+import os
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from src.analyzer import VideoAnalyzer
+from src.archive import StatsArchive, SECONDS_PER_DAY
+from src.frame import VideoFrame, COLUMNS
+from src.parallel import score_frame, shard_bounds, shared_frame, ShardSummary, _blocks
+from tests.conftest import with_views
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def archive(count):
+    return VideoFrame.from_videos([
+        {
+            "id": f"v{i}",
+            "snippet": {"title": f"Video {i}", "publishedAt": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T00:00:00Z"},
+            "statistics": {"viewCount": str(1000 + (i * 7919) % 100_000), "likeCount": str((i * 31) % 5000),
+                           "commentCount": str(i % 97)}
+        }
+        for i in range(count)
+    ], now=NOW)
+
+
+@pytest.fixture
+def analyzer():
+    with patch("src.analyzer.YouTubeClient"):
+        return VideoAnalyzer(api_key="test_key")
+
+
+class TestShards:
+    
+    def test_bounds_cover_every_row_once(self):
+        assert shard_bounds(10, 3) == [(0, 3), (3, 6), (6, 10)]
+        assert shard_bounds(2, 4) == [(0, 1), (1, 2)]
+    
+    def test_merge_keeps_earliest_best_row(self):
+        first = ShardSummary(2, dict.fromkeys(("views", "likes", "comments", "engagement_rate", "growth_score",
+                                                "days_old"), 1), {"views": (50, 1)})
+        second = ShardSummary(2, dict.fromkeys(first.sums, 2), {"views": (50, 3)})
+        
+        merged = first.merge(second)
+        
+        assert merged.count == 4
+        assert merged.sums["views"] == 3
+        assert merged.best["views"] == (50, 1)
+
+
+class TestScoreFrame:
+    
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_matches_serial_frame(self, workers):
+        expected = archive(500)
+        frame = archive(500)
+        frame.engagement_rate[:] = 0
+        frame.growth_score[:] = 0
+        
+        with patch("src.parallel.MIN_PARALLEL_ROWS", 0):
+            summary = score_frame(frame, workers=workers, now=NOW)
+        
+        assert (frame.engagement_rate == expected.engagement_rate).all()
+        assert (frame.growth_score == expected.growth_score).all()
+        assert (frame.days_old == expected.days_old).all()
+        assert summary.count == 500
+        assert summary.sums["views"] == int(expected.views.sum())
+    
+    def test_shared_frame_is_scored_in_place(self):
+        expected = archive(500)
+        frame = shared_frame(**{name: expected[name] for name in COLUMNS})
+        frame.growth_score[:] = 0
+        growth_score = frame.growth_score
+        path = _blocks[frame].path
+        
+        with patch("src.parallel.MIN_PARALLEL_ROWS", 0):
+            score_frame(frame, workers=2, now=NOW)
+        
+        assert frame.growth_score is growth_score
+        assert (frame.growth_score == expected.growth_score).all()
+        assert os.path.exists(path)
+        del frame, growth_score
+        gc.collect()
+        assert not os.path.exists(path)
+    
+    def test_rescore_matches_comparison_data(self, analyzer):
+        frame = archive(300)
+        expected = analyzer.get_comparison_data(archive(300))
+        
+        with patch("src.parallel.MIN_PARALLEL_ROWS", 0):
+            comparison = analyzer.rescore_frame(frame, workers=2, now=NOW)
+        
+        assert comparison["average_engagement"] == pytest.approx(expected.pop("average_engagement"))
+        assert {k: comparison[k] for k in expected} == expected
+    
+    @pytest.mark.parametrize("workers, shared", [(1, False), (2, False), (2, True)])
+    def test_rescore_keeps_measured_growth(self, analyzer, tmp_path, workers, shared):
+        videos = [
+            {"id": f"v{i}", "snippet": {"title": f"Video {i}", "publishedAt": "2020-01-01T00:00:00Z"},
+             "statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": "1"}}
+            for i in range(4)
+        ]
+        archived = StatsArchive(str(tmp_path / "archive"))
+        taken_at = NOW.timestamp() - SECONDS_PER_DAY
+        archived.record(videos, taken_at=taken_at)
+        archived.record([with_views(video, 1000 + 2_000_000) for video in videos], taken_at=taken_at + SECONDS_PER_DAY)
+        frame = analyzer.analyze_archive(archived, now=NOW, shared=shared)
+        expected = frame.growth_score.copy()
+        frame.growth_score[:] = 0
+        
+        with patch("src.parallel.MIN_PARALLEL_ROWS", 0):
+            analyzer.rescore_frame(frame, workers=workers, now=NOW)
+        
+        assert (expected == 10.0).all()
+        assert (frame.growth_score == expected).all()
+    
+    def test_empty_frame(self, analyzer):
+        assert analyzer.rescore_frame(archive(0), workers=2, now=NOW) == {}
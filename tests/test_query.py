@@ -0,0 +1,133 @@
+"""
+Tests for indexed range and text queries.
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from src.analyzer import VideoAnalyzer
+from src.frame import VideoFrame
+from src.query import VideoIndex, tokenize
+from src.video import Video
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+WORDS = ["bridge", "tunnel", "tower", "review", "build"]
+
+
+def catalogue(count):
+    return [
+        {
+            "id": f"v{i}",
+            "snippet": {
+                "title": f"{WORDS[i % 5]} {WORDS[i % 3]} #{i}",
+                "publishedAt": (NOW - timedelta(days=i % 90)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "tags": ["engineering"] if i % 7 == 0 else [],
+                "description": "Steel and concrete" if i % 11 == 0 else ""
+            },
+            "statistics": {"viewCount": str((i * 7919) % 3_000_000), "likeCount": str((i * 31) % 90_000),
+                           "commentCount": str(i % 97)}
+        }
+        for i in range(count)
+    ]
+
+
+def linear_search(frame, texts, text=None, min_views=None, max_views=None, min_engagement=None,
+                  published_after=None):
+    mask = np.ones(len(frame), dtype=bool)
+    if min_views is not None:
+        mask &= frame.views >= min_views
+    if max_views is not None:
+        mask &= frame.views <= max_views
+    if min_engagement is not None:
+        mask &= frame.engagement_rate >= min_engagement
+    if published_after is not None:
+        mask &= frame.published_ts >= published_after.timestamp()
+    if text is not None:
+        mask &= [set(tokenize(text)) <= set(tokenize(t)) for t in texts]
+    return np.flatnonzero(mask)
+
+
+class TestVideoIndex:
+    
+    def setup_method(self):
+        self.videos = catalogue(2000)
+        self.index = VideoIndex.from_videos(self.videos, now=NOW)
+        self.texts = [
+            " ".join([v["snippet"]["title"], *v["snippet"]["tags"], v["snippet"]["description"]])
+            for v in self.videos
+        ]
+    
+    def test_tokenize(self):
+        assert tokenize("Bridge's  TOWER-review") == ["bridge", "s", "tower", "review"]
+    
+    def test_no_predicates_returns_every_row(self):
+        assert self.index.search().tolist() == list(range(2000))
+    
+    @pytest.mark.parametrize("query", [
+        {"min_views": 1_000_000},
+        {"min_views": 1_000_000, "max_views": 1_500_000},
+        {"min_engagement": 3.0},
+        {"text": "bridge"},
+        {"text": "Tower REVIEW"},
+        {"text": "engineering"},
+        {"text": "concrete bridge"},
+        {"text": "bridge", "min_views": 1_000_000, "published_after": NOW - timedelta(days=30)},
+        {"text": "nonexistent", "min_views": 0},
+        {"min_views": 10_000_000},
+    ])
+    def test_matches_linear_scan(self, query):
+        expected = linear_search(self.index.frame, self.texts, **query)
+        assert self.index.search(**query).tolist() == expected.tolist()
+    
+    def test_published_before_is_exclusive(self):
+        cutoff = NOW - timedelta(days=10)
+        rows = self.index.search(published_before=cutoff)
+        assert (self.index.frame.published_ts[rows] < cutoff.timestamp()).all()
+        assert len(rows) == np.count_nonzero(self.index.frame.published_ts < cutoff.timestamp())
+    
+    def test_unknown_publish_time_never_matches_a_range(self):
+        index = VideoIndex.from_videos([Video("v1", views=5), Video("v2", views=5, published_ts=NOW.timestamp())],
+                                       now=NOW)
+        assert index.search(published_after=0).tolist() == [1]
+    
+    def test_titles_only_without_texts(self):
+        index = VideoIndex(self.index.frame)
+        assert len(index.search(text="engineering")) == 0
+        assert len(index.search(text="bridge")) > 0
+    
+    def test_select_returns_frame(self):
+        frame = self.index.select("tunnel", min_views=2_000_000)
+        assert isinstance(frame, VideoFrame)
+        assert (frame.views >= 2_000_000).all()
+        assert all("tunnel" in title.lower() for title in frame.title)
+    
+    def test_unknown_keyword(self):
+        with pytest.raises(TypeError):
+            self.index.search(min_likes=5)
+
+
+class TestAnalyzerIndex:
+    
+    @pytest.fixture
+    def analyzer(self):
+        with patch("src.analyzer.YouTubeClient"):
+            return VideoAnalyzer(api_key="test_key", keep_raw=True)
+    
+    def test_filter_by_performance_matches_frame(self, analyzer):
+        videos = catalogue(500)
+        index = analyzer.index_videos(videos, now=NOW)
+        frame = VideoFrame.from_videos(videos, now=NOW)
+        
+        expected = analyzer.filter_by_performance(frame, min_views=800_000, min_engagement=2.0)
+        filtered = analyzer.filter_by_performance(index, min_views=800_000, min_engagement=2.0)
+        
+        assert filtered.to_records() == expected.to_records()
+    
+    def test_search_videos_uses_fetched_payloads(self, analyzer):
+        analyzer.videos = [Video.from_api(d, keep_raw=True) for d in catalogue(50)]
+        
+        found = analyzer.search_videos(analyzer.index_videos(now=NOW), "engineering")
+        
+        assert found.video_id.tolist() == [f"v{i}" for i in range(0, 50, 7)]
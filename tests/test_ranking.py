@@ -0,0 +1,55 @@
+"""
+Tests for the incremental RankIndex.
+"""
+
+import numpy as np
+import pytest
+from src.frame import VideoFrame
+from src.metrics import calculate_percentiles, calculate_ranks
+from src.ranking import RankIndex
+
+
+class TestRankIndex:
+    
+    def test_matches_batch_engine(self):
+        values = np.random.default_rng(1).integers(0, 1000, 300)
+        index = RankIndex(values.tolist())
+        
+        assert index.percentiles(values).tolist() == calculate_percentiles(values).tolist()
+        assert index.ranks(values).tolist() == calculate_ranks(values).tolist()
+    
+    def test_incremental_insert(self):
+        index = RankIndex([100, 200, 300])
+        assert index.rank(250) == 2
+        
+        index.add(250)
+        index.update([50, 400])
+        
+        assert len(index) == 6
+        assert index.rank(400) == 1
+        assert index.percentile(250) == 50.0
+        assert index.ranks([250]).tolist() == [3]
+    
+    def test_remove(self):
+        index = RankIndex([100, 200, 200])
+        index.remove(200)
+        
+        assert 200 in index
+        assert len(index) == 2
+        with pytest.raises(ValueError):
+            index.remove(999)
+    
+    def test_empty(self):
+        assert RankIndex().percentile(10) == 0
+        assert RankIndex().percentiles([1, 2]).tolist() == [0.0, 0.0]
+    
+    def test_from_frame(self):
+        frame = VideoFrame(
+            video_id=["a", "b", "c"], title=["A", "B", "C"], published_ts=[0.0, 0.0, 0.0],
+            views=[10, 30, 20], likes=[1, 1, 1], comments=[0, 0, 0], days_old=[1, 1, 1],
+            engagement_rate=[10.0, 3.3, 5.0], growth_score=[1.0, 1.0, 1.0]
+        )
+        
+        assert RankIndex.from_frame(frame, "engagement_rate").rank(5.0) == 2
+        assert frame.ranks("views").tolist() == [3, 1, 2]
+        assert frame.percentiles("engagement_rate").tolist() == pytest.approx([66.7, 0.0, 33.3])
@@ -0,0 +1,120 @@
+"""
+Tests for the quota-aware request scheduler.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from src.cache import ResponseCache
+from src.scheduler import (
+    RequestScheduler,
+    TokenBucket,
+    QuotaExceededError,
+    PRIORITY_FRESH,
+    PRIORITY_BACKLOG
+)
+from src.youtube_client import YouTubeClient
+
+
+class TestTokenBucket:
+    
+    def test_refills_over_time(self, clock):
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock)
+        
+        assert bucket.take(5) == 0
+        assert bucket.take(1) == pytest.approx(0.1)
+        clock.now += 0.3
+        assert bucket.take(3) == pytest.approx(0, abs=1e-6)
+    
+    def test_oversized_request_drains_bucket(self, clock):
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock)
+        
+        assert bucket.take(100) == 0
+        assert bucket.tokens == 0
+
+
+class TestRequestScheduler:
+    
+    def test_charges_endpoint_costs(self):
+        scheduler = RequestScheduler(daily_quota=1000, burst=1000)
+        scheduler.acquire("videos", key="k1")
+        scheduler.acquire("search", key="k1")
+        
+        assert scheduler.remaining("k1") == 899
+        assert scheduler.usage()["k1"] == {"requests": 2, "used": 101, "remaining": 899}
+    
+    def test_refuses_past_daily_quota(self):
+        scheduler = RequestScheduler(daily_quota=2, burst=10)
+        scheduler.acquire("videos")
+        scheduler.acquire("videos")
+        
+        with pytest.raises(QuotaExceededError):
+            scheduler.acquire("videos")
+    
+    def test_quota_resets_with_the_day(self):
+        today = ["2026-01-01"]
+        scheduler = RequestScheduler(daily_quota=1, burst=10, day=lambda: today[0])
+        scheduler.acquire("videos")
+        scheduler.exhaust()
+        
+        today[0] = "2026-01-02"
+        
+        assert scheduler.remaining() == 1
+    
+    def test_keys_have_separate_budgets(self):
+        scheduler = RequestScheduler(daily_quota=1, burst=10)
+        scheduler.acquire("videos", key="k1")
+        scheduler.acquire("videos", key="k2")
+        
+        assert scheduler.remaining("k1") == scheduler.remaining("k2") == 0
+    
+    def test_fresh_requests_jump_the_queue(self):
+        scheduler = RequestScheduler(rate=20, burst=1)
+        scheduler.acquire("videos")
+        order = []
+        
+        def request(name, priority):
+            scheduler.acquire("videos", priority=priority)
+            order.append(name)
+        
+        threads = [threading.Thread(target=request, args=(f"backlog{i}", PRIORITY_BACKLOG)) for i in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.01)
+        fresh = threading.Thread(target=request, args=("fresh", PRIORITY_FRESH))
+        fresh.start()
+        for t in threads + [fresh]:
+            t.join()
+        
+        assert order[0] == "fresh"
+
+
+def ok_response(body):
+    return Mock(status_code=200, headers={}, json=Mock(return_value=body))
+
+
+class TestClientScheduling:
+    
+    def test_cache_hits_cost_nothing(self):
+        scheduler = RequestScheduler(daily_quota=100)
+        transport = Mock()
+        transport.fetch.return_value = ok_response({"items": []})
+        client = YouTubeClient(api_key="k", transport=transport, cache=ResponseCache(), scheduler=scheduler)
+        
+        client.get_video_details(["v1"])
+        client.get_video_details(["v1"])
+        
+        assert scheduler.remaining("k") == 99
+    
+    def test_quota_error_exhausts_key(self):
+        scheduler = RequestScheduler(daily_quota=100)
+        transport = Mock()
+        transport.fetch.return_value = Mock(status_code=403, json=Mock(return_value={
+            "error": {"code": 403, "errors": [{"reason": "quotaExceeded"}]}
+        }))
+        client = YouTubeClient(api_key="k", transport=transport, scheduler=scheduler)
+        
+        with pytest.raises(QuotaExceededError):
+            client.get_video_details(["v1"])
+        assert scheduler.remaining("k") == 0
@@ -0,0 +1,245 @@
+"""
+Tests for the HTTP analysis service.
+"""
+
+import asyncio
+import threading
+import pytest
+import requests
+from unittest.mock import Mock
+from src.analyzer import VideoAnalyzer
+from src.scheduler import QuotaExceededError
+from src.service import AnalysisService, ResultCache, serve_analysis
+
+
+def api_response(body):
+    return Mock(status_code=200, headers={}, json=Mock(return_value=body))
+
+
+class FakeAPI:
+    """
+    Answers channel UC1 with three videos; optionally blocks until released,
+    and answers the endpoints in `failing` with a 503.
+    """
+    
+    def __init__(self, gate=None, failing=()):
+        self.gate = gate
+        self.failing = set(failing)
+        self.calls = []
+    
+    def fetch(self, url, params=None, headers=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls.append(endpoint)
+        if self.gate is not None:
+            self.gate.wait(5)
+        if endpoint in self.failing:
+            return Mock(status_code=503, headers={}, json=Mock(return_value={
+                "error": {"code": 503, "message": "Backend Error", "errors": [{"reason": "backendError"}]}
+            }))
+        if endpoint == "channels":
+            return api_response({"items": [
+                {"id": "UC1", "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}
+            ] if "UC1" in params["id"].split(",") else []})
+        if endpoint == "playlistItems":
+            return api_response({"items": [{"snippet": {"resourceId": {"videoId": f"v{i}"}}} for i in range(3)]})
+        return api_response({"items": [
+            {"id": video_id, "snippet": {"title": video_id, "publishedAt": "2024-11-01T00:00:00Z"},
+             "statistics": {"viewCount": str(1000 * (i + 1)), "likeCount": str(10 * (i + 1) ** 2),
+                            "commentCount": "1"}}
+            for i, video_id in enumerate(params["id"].split(","))
+        ]})
+
+
+class TestResultCache:
+    
+    def test_results_expire_after_ttl(self, clock):
+        cache = ResultCache(ttl=60, clock=clock)
+        fetch = Mock(side_effect=lambda: asyncio.sleep(0, result=["r"]))
+        
+        async def scenario():
+            await cache.get("k", fetch)
+            await cache.get("k", fetch)
+            clock.now += 61
+            await cache.get("k", fetch)
+        
+        asyncio.run(scenario())
+        
+        assert fetch.call_count == 2
+        assert cache.stats == {"hits": 1, "misses": 2, "merged": 0, "entries": 1}
+    
+    def test_concurrent_requests_share_one_fetch(self):
+        cache = ResultCache()
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ["r"]
+        
+        async def scenario():
+            return await asyncio.gather(*(cache.get("k", fetch) for _ in range(5)))
+        
+        assert asyncio.run(scenario()) == [["r"]] * 5
+        assert len(calls) == 1
+        assert cache.merged == 4
+    
+    def test_failures_are_shared_but_not_cached(self):
+        cache = ResultCache()
+        fetch = Mock(side_effect=lambda: asyncio.sleep(0, result=None) if fetch.call_count > 1 else boom())
+        
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+        
+        async def scenario():
+            first = await asyncio.gather(cache.get("k", fetch), cache.get("k", fetch), return_exceptions=True)
+            return first, await cache.get("k", fetch)
+        
+        first, retried = asyncio.run(scenario())
+        
+        assert [str(e) for e in first] == ["upstream down"] * 2
+        assert retried is None
+        assert fetch.call_count == 2
+    
+    def test_expired_and_excess_entries_are_evicted(self, clock):
+        cache = ResultCache(ttl=60, clock=clock, max_entries=2)
+        
+        async def fetch():
+            return ["r"]
+        
+        async def scenario():
+            await cache.get("a", fetch)
+            clock.now += 30
+            await cache.get("b", fetch)
+            await cache.get("c", fetch)
+            evicted_for_size = set(cache._results)
+            clock.now += 65
+            await cache.get("d", fetch)
+            return evicted_for_size
+        
+        assert asyncio.run(scenario()) == {"b", "c"}
+        assert set(cache._results) == {"d"}
+    
+    def test_cancelled_fetch_releases_merged_requests(self):
+        cache = ResultCache()
+        
+        async def fetch():
+            await asyncio.sleep(10)
+        
+        async def scenario():
+            leader = asyncio.create_task(cache.get("k", fetch))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(cache.get("k", fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await asyncio.wait_for(asyncio.gather(leader, waiter, return_exceptions=True), 1)
+        
+        leader, waiter = asyncio.run(scenario())
+        
+        assert isinstance(leader, asyncio.CancelledError)
+        assert isinstance(waiter, RuntimeError)
+        assert cache._inflight == {}
+
+
+class TestAnalysisService:
+    
+    def service(self, api=None):
+        return AnalysisService(VideoAnalyzer(api_key="k", transport=api or FakeAPI()))
+    
+    def test_routes(self):
+        service = self.service()
+        
+        async def scenario():
+            return [
+                await service.handle("GET", "/channels/UC1/videos?count=3"),
+                await service.handle("GET", "/channels/UC1/comparison?count=3"),
+                await service.handle("GET", "/channels/UC1/top?count=3"),
+                await service.handle("GET", "/channels/UC1/filter?count=3&min_views=2000"),
+            ]
+        
+        (s1, videos), (s2, comparison), (s3, top), (s4, filtered) = asyncio.run(scenario())
+        
+        assert (s1, s2, s3, s4) == (200, 200, 200, 200)
+        assert [v["video_id"] for v in videos] == ["v0", "v1", "v2"]
+        assert comparison["total_views"] == 6000
+        assert top["video_id"] == "v2"
+        assert [v["video_id"] for v in filtered] == ["v1", "v2"]
+        assert service.results.stats["misses"] == 1
+    
+    def test_errors(self):
+        service = self.service()
+        service.analyzer.stream_channel_videos = Mock(side_effect=QuotaExceededError("k"))
+        
+        async def scenario():
+            return [
+                (await service.handle("GET", "/nope"))[0],
+                (await service.handle("GET", "/channels/UC1/videos?count=0"))[0],
+                (await service.handle("GET", "/channels/UC1/filter?min_views=lots"))[0],
+                (await service.handle("POST", "/channels/UC1/videos"))[0],
+                (await service.handle("GET", "/channels/UC1/videos"))[0],
+            ]
+        
+        assert asyncio.run(scenario()) == [404, 400, 400, 405, 429]
+    
+    def test_unknown_channel_is_not_found(self):
+        service = self.service()
+        
+        status, body = asyncio.run(service.handle("GET", "/channels/UCx/videos"))
+        
+        assert status == 404
+        assert body == {"error": "Channel not found: UCx"}
+    
+    def test_other_lookup_errors_are_not_not_found(self):
+        service = self.service()
+        service.analyzer.stream_channel_videos = Mock(side_effect=KeyError("items"))
+        
+        status, _ = asyncio.run(service.handle("GET", "/channels/UC1/videos"))
+        
+        assert status == 502
+    
+    @pytest.mark.parametrize("endpoint", ["channels", "playlistItems", "videos"])
+    def test_upstream_errors_are_bad_gateway_and_not_cached(self, endpoint):
+        api = FakeAPI(failing=[endpoint])
+        service = self.service(api)
+        
+        async def scenario():
+            failed = await service.handle("GET", "/channels/UC1/videos?count=3")
+            api.failing.clear()
+            return failed, await service.handle("GET", "/channels/UC1/videos?count=3")
+        
+        (status, body), (retry_status, videos) = asyncio.run(scenario())
+        
+        assert status == 502
+        assert "Backend Error" in body["error"]
+        assert retry_status == 200
+        assert len(videos) == 3
+    
+    def test_http_clients_share_one_upstream_fetch(self):
+        gate = threading.Event()
+        api = FakeAPI(gate)
+        server = serve_analysis(VideoAnalyzer(api_key="k", transport=api), 0)
+        url = f"http://127.0.0.1:{server.server_port}"
+        responses = []
+        
+        def get(path):
+            responses.append(requests.get(url + path, timeout=5))
+        
+        clients = [threading.Thread(target=get, args=(f"/channels/UC1/{view}",))
+                   for view in ("videos", "comparison", "top", "videos")]
+        try:
+            for client in clients:
+                client.start()
+            while server.service.results.merged < 3:
+                threading.Event().wait(0.01)
+            gate.set()
+            for client in clients:
+                client.join()
+            health = requests.get(url + "/health", timeout=5).json()
+        finally:
+            server.shutdown()
+        
+        assert [r.status_code for r in responses] == [200] * 4
+        assert all(r.headers["Content-Type"] == "application/json" for r in responses)
+        assert api.calls == ["channels", "playlistItems", "videos"]
+        assert health["cache"]["misses"] == 1
+        assert health["cache"]["merged"] == 3
@@ -0,0 +1,128 @@
+"""
+Tests for the snapshot store and delta refresh.
+"""
+
+import pytest
+from unittest.mock import patch
+from src.analyzer import VideoAnalyzer
+from src.snapshots import SnapshotStore, SECONDS_PER_DAY
+from tests.conftest import FakeAPI, make_video, with_views
+
+
+class TestSnapshotStore:
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        self.clock = clock
+        self.store = SnapshotStore(clock=self.clock)
+    
+    def test_round_trip(self):
+        self.store.record([make_video("v1")])
+        
+        assert self.store.get_videos(["v1", "missing"]) == [{
+            "id": "v1",
+            "snippet": {"channelId": None, "title": "Video v1", "publishedAt": "2024-11-20T10:00:00Z"},
+            "statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": "1"}
+        }]
+    
+    def test_statistics_only_snapshot_keeps_snippet(self):
+        self.store.record([make_video("v1")])
+        self.clock.now += 60
+        self.store.record([{"id": "v1", "statistics": {"viewCount": "5000"}}])
+        
+        video = self.store.get_videos(["v1"])[0]
+        assert video["snippet"]["title"] == "Video v1"
+        assert video["statistics"]["viewCount"] == "5000"
+        assert len(self.store.history("v1")) == 2
+    
+    def test_stale_video_ids(self):
+        self.store.record([make_video("v1")])
+        self.clock.now += 100
+        self.store.record([make_video("v2")])
+        
+        assert self.store.stale_video_ids(["v1", "v2", "v3"], max_age=50) == ["v1"]
+    
+    def test_views_per_day_between_snapshots(self):
+        self.store.record([with_views(make_video("v1"), 1000)])
+        assert self.store.views_per_day("v1") is None
+        
+        self.clock.now += SECONDS_PER_DAY / 2
+        self.store.record([with_views(make_video("v1"), 6000)])
+        
+        assert self.store.views_per_day("v1") == pytest.approx(10000)
+    
+    def test_latest_video_ids_by_channel(self):
+        self.store.record([
+            {"id": v, "snippet": {"channelId": channel, "title": v, "publishedAt": published}}
+            for v, channel, published in [
+                ("old", "UC1", "2023-01-01T00:00:00Z"),
+                ("new", "UC1", "2024-06-01T00:00:00Z"),
+                ("other", "UC2", "2024-07-01T00:00:00Z"),
+            ]
+        ])
+        
+        assert self.store.latest_video_ids("UC1") == ["new", "old"]
+        assert self.store.latest_video_ids("UC1", 1) == ["new"]
+        assert self.store.latest_video_ids("UC3") == []
+    
+    def test_persists_to_disk(self, tmp_path):
+        path = str(tmp_path / "snapshots.db")
+        with SnapshotStore(path) as store:
+            store.record([make_video("v1")])
+        
+        with SnapshotStore(path) as store:
+            assert store.known_video_ids(["v1", "v2"]) == {"v1"}
+
+
+class TestDeltaRefresh:
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, clock):
+        self.clock = clock
+        self.analyzer = VideoAnalyzer(api_key="test_key", store=SnapshotStore(clock=self.clock))
+        self.api = FakeAPI(total=10)
+    
+    def refresh(self, count=5):
+        with patch.object(self.analyzer.client, "_get", side_effect=self.api):
+            return self.analyzer.refresh_latest_videos(count=count, max_age=3600)
+    
+    def video_parts(self):
+        return [p["part"] for name, p in self.api.calls if name == "videos"]
+    
+    def test_first_run_fetches_full_details(self):
+        videos = self.refresh()
+        
+        assert [v.video_id for v in videos] == ["v0", "v1", "v2", "v3", "v4"]
+        assert self.video_parts() == ["snippet,statistics"]
+    
+    def test_fresh_snapshots_skip_videos_endpoint(self):
+        self.refresh()
+        self.clock.now += 60
+        self.refresh()
+        
+        assert len(self.video_parts()) == 1
+    
+    def test_stale_videos_request_statistics_only(self):
+        self.refresh(count=3)
+        self.clock.now += 7200
+        videos = self.refresh(count=5)
+        
+        assert self.video_parts() == ["snippet,statistics", "snippet,statistics", "statistics"]
+        stats_call = [p for name, p in self.api.calls if name == "videos"][2]
+        assert stats_call["id"] == "v0,v1,v2"
+        assert len(videos) == 5
+    
+    def test_growth_uses_measured_velocity(self):
+        store = self.analyzer.store
+        store.record([with_views(make_video("v1"), 1000)])
+        self.clock.now += SECONDS_PER_DAY
+        store.record([with_views(make_video("v1"), 2_001_000)])
+        
+        result = self.analyzer.analyze_videos(store.get_videos(["v1"]))[0]
+        
+        # 2M views in the last day scores 10.0, lifetime average would not
+        assert result["growth_score"] == 10.0
+    
+    def test_refresh_requires_store(self):
+        with pytest.raises(ValueError):
+            VideoAnalyzer(api_key="test_key").refresh_latest_videos()
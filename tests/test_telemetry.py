@@ -0,0 +1,128 @@
+"""
+Tests for telemetry counters, histograms and Prometheus export.
+"""
+
+import pytest
+import requests
+from unittest.mock import Mock
+from src.telemetry import Telemetry, Histogram, TELEMETRY, serve_prometheus
+from src.cache import ResponseCache
+from src.formatters import format_profile, format_video_list
+from src.youtube_client import YouTubeClient
+
+
+@pytest.fixture
+def telemetry():
+    TELEMETRY.reset()
+    TELEMETRY.enable()
+    yield TELEMETRY
+    TELEMETRY.disable()
+    TELEMETRY.reset()
+
+
+class TestHistogram:
+    
+    def test_buckets_are_upper_bounds(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(2.65)
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(1.0) == 2.0
+
+
+class TestTelemetry:
+    
+    def test_disabled_registry_records_nothing(self):
+        registry = Telemetry()
+        registry.count("api_requests_total", endpoint="videos")
+        with registry.timer("stage_seconds", stage="x"):
+            pass
+        
+        assert registry.to_prometheus() == "\n"
+    
+    def test_counters_and_totals(self):
+        registry = Telemetry()
+        registry.enable()
+        registry.count("api_requests_total", endpoint="videos", status=200)
+        registry.count("api_requests_total", 2, endpoint="channels", status=200)
+        registry.count("api_requests_total", endpoint="videos", status=403)
+        
+        assert registry.counter("api_requests_total", endpoint="videos", status=200) == 1
+        assert registry.total("api_requests_total") == 4
+        assert registry.total("api_requests_total", endpoint="videos") == 2
+    
+    def test_timed_decorator(self):
+        registry = Telemetry()
+        
+        @registry.timed("work")
+        def work(x):
+            return x * 2
+        
+        assert work(2) == 4
+        assert registry.histogram("stage_seconds", stage="work") is None
+        
+        registry.enable()
+        work(3)
+        assert registry.histogram("stage_seconds", stage="work").count == 1
+    
+    def test_prometheus_exposition(self):
+        registry = Telemetry(buckets=(0.1, 1.0))
+        registry.enable()
+        registry.count("quota_units_total", 3, endpoint="videos")
+        registry.observe("api_request_seconds", 0.5, endpoint="videos")
+        
+        lines = registry.to_prometheus().splitlines()
+        
+        assert "# TYPE video_analyzer_quota_units_total counter" in lines
+        assert 'video_analyzer_quota_units_total{endpoint="videos"} 3' in lines
+        assert "# TYPE video_analyzer_api_request_seconds histogram" in lines
+        assert 'video_analyzer_api_request_seconds_bucket{endpoint="videos",le="0.1"} 0' in lines
+        assert 'video_analyzer_api_request_seconds_bucket{endpoint="videos",le="1.0"} 1' in lines
+        assert 'video_analyzer_api_request_seconds_bucket{endpoint="videos",le="+Inf"} 1' in lines
+        assert 'video_analyzer_api_request_seconds_count{endpoint="videos"} 1' in lines
+    
+    def test_write_and_serve(self, tmp_path, telemetry):
+        telemetry.count("videos_analyzed_total", 5)
+        path = tmp_path / "metrics.prom"
+        
+        telemetry.write_prometheus(str(path))
+        server = serve_prometheus(0)
+        try:
+            response = requests.get(f"http://127.0.0.1:{server.server_port}/metrics")
+        finally:
+            server.shutdown()
+        
+        assert "video_analyzer_videos_analyzed_total 5" in path.read_text()
+        assert response.text == path.read_text()
+        assert response.headers["Content-Type"].startswith("text/plain")
+
+
+class TestHooks:
+    
+    def test_client_requests_and_cache(self, telemetry):
+        transport = Mock()
+        transport.fetch.return_value = Mock(
+            status_code=200, headers={"Content-Length": "120"}, json=Mock(return_value={"items": []})
+        )
+        client = YouTubeClient(api_key="k", transport=transport, cache=ResponseCache())
+        
+        client.get_video_details(["v1"])
+        client.get_video_details(["v1"])
+        
+        assert telemetry.counter("api_requests_total", endpoint="videos", status=200) == 1
+        assert telemetry.total("api_response_bytes_total") == 120
+        assert telemetry.total("quota_units_total") == 1
+        assert telemetry.counter("cache_lookups_total", result="miss") == 1
+        assert telemetry.counter("cache_lookups_total", result="hit") == 1
+        assert telemetry.histogram("api_request_seconds", endpoint="videos").count == 1
+        assert telemetry.histogram("json_decode_seconds", endpoint="videos").count == 1
+    
+    def test_formatters_are_timed(self, telemetry):
+        format_video_list([{"title": "A", "views": 10, "engagement_rate": 1.0}])
+        
+        assert telemetry.histogram("stage_seconds", stage="format_video_list").count == 1
+        assert "format_video_list" in format_profile(telemetry)
@@ -0,0 +1,93 @@
+"""
+Tests for the pooled HTTP transport.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.transport import HTTPTransport
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = set()
+    
+    def do_GET(self):
+        StubHandler.connections.add(self.client_address)
+        body = json.dumps({
+            "path": self.path,
+            "accept_encoding": self.headers.get("Accept-Encoding", "")
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTTPTransport:
+    
+    def test_returns_json_body(self, stub_url):
+        with HTTPTransport() as transport:
+            data = transport.get(f"{stub_url}/videos", params={"id": "abc"})
+        
+        assert data["path"] == "/videos?id=abc"
+    
+    def test_negotiates_gzip(self, stub_url):
+        with HTTPTransport() as transport:
+            data = transport.get(f"{stub_url}/videos")
+        
+        assert "gzip" in data["accept_encoding"]
+    
+    def test_connections_are_reused(self, stub_url):
+        """Test that sequential calls share one keep-alive connection."""
+        with HTTPTransport() as transport:
+            for _ in range(10):
+                transport.get(f"{stub_url}/videos")
+        
+        assert len(StubHandler.connections) == 1
+    
+    def test_threads_get_separate_sessions(self):
+        transport = HTTPTransport()
+        sessions = []
+        
+        def grab():
+            sessions.append(transport.session)
+        
+        threads = [threading.Thread(target=grab) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len({id(s) for s in sessions}) == 3
+        assert all(s.get_adapter("https://x") is transport.adapter for s in sessions)
+        transport.close()
+    
+    def test_sessions_of_exited_threads_are_dropped(self):
+        transport = HTTPTransport()
+        for _ in range(5):
+            thread = threading.Thread(target=lambda: transport.session)
+            thread.start()
+            thread.join()
+        session = transport.session
+        
+        assert list(transport._sessions.values()) == [session]
+        transport.close()
+        assert transport._sessions == {}
@@ -0,0 +1,54 @@
+"""
+Tests for the compact Video record.
+"""
+
+from src.video import Video, as_video
+from tests.conftest import make_video
+
+
+def full_api_item(video_id):
+    item = make_video(video_id)
+    item["snippet"].update({
+        "channelId": "UC123",
+        "description": "A long description " * 50,
+        "thumbnails": {size: {"url": f"https://i.ytimg.com/{video_id}/{size}.jpg"} for size in ("default", "high")},
+        "tags": ["tech", "diy", "engineering"]
+    })
+    item["contentDetails"] = {"duration": "PT12M3S"}
+    return item
+
+
+class TestVideo:
+    
+    def test_parses_needed_fields_once(self):
+        video = Video.from_api(full_api_item("v1"))
+        
+        assert video.video_id == "v1"
+        assert video.channel_id == "UC123"
+        assert (video.views, video.likes, video.comments) == (1000, 10, 1)
+        assert video.published_ts == 1732096800.0
+        assert video.published_at == "2024-11-20T10:00:00Z"
+        assert video.raw is None
+    
+    def test_raw_kept_on_request(self):
+        item = full_api_item("v1")
+        
+        assert Video.from_api(item, keep_raw=True).raw is item
+    
+    def test_slotted(self):
+        video = Video.from_api(make_video("v1"))
+        
+        assert not hasattr(video, "__dict__")
+    
+    def test_missing_fields(self):
+        video = Video.from_api({"id": "v1"})
+        
+        assert video.published_ts is None
+        assert video.published_at == ""
+        assert video.views == 0
+    
+    def test_to_api_round_trip(self):
+        video = Video.from_api(full_api_item("v1"))
+        
+        assert Video.from_api(video.to_api()) == video
+        assert as_video(video) is video
@@ -0,0 +1,218 @@
+"""
+Tests for the adaptive-polling watch mode.
+"""
+
+import pytest
+from unittest.mock import Mock
+from src.analyzer import VideoAnalyzer
+from src.scheduler import QuotaExceededError
+from src.snapshots import SnapshotStore
+from src.video import format_timestamp
+from src.watch import (
+    ChannelWatcher, poll_interval, MINUTE, HOUR, DAY, MIN_INTERVAL, MAX_INTERVAL, SETTLED_INTERVAL
+)
+
+NOW = 1_700_000_000
+
+SERVER_ERROR = Mock(status_code=503, headers={}, json=Mock(return_value={"error": {"code": 503}}))
+
+
+class FakeChannel:
+    """One channel's uploads, answering the endpoints the watcher uses."""
+    
+    def __init__(self, videos):
+        # video_id -> [published_ts, views]
+        self.videos = videos
+        self.calls = []
+        # Exceptions to raise from the next requests, in order
+        self.failures = []
+        # endpoint -> exceptions or responses for its next requests
+        self.failing = {}
+    
+    def fetch(self, url, params=None, headers=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls.append((endpoint, params.get("part")))
+        if self.failures:
+            raise self.failures.pop(0)
+        if self.failing.get(endpoint):
+            failure = self.failing[endpoint].pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        known = "UC1" in params.get("id", "").split(",")
+        if endpoint == "channels" and params["part"] == "statistics":
+            body = {"items": [{"id": "UC1", "statistics": {"videoCount": str(len(self.videos))}}] if known else []}
+        elif endpoint == "channels":
+            body = {"items": [{"id": "UC1", "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}]
+                    if known else []}
+        elif endpoint == "playlistItems":
+            latest = sorted(self.videos, key=lambda v: self.videos[v][0], reverse=True)
+            body = {"items": [{"snippet": {"resourceId": {"videoId": v}}} for v in latest]}
+        else:
+            body = {"items": [self.item(video_id, params["part"]) for video_id in params["id"].split(",")
+                              if video_id in self.videos]}
+        return Mock(status_code=200, headers={}, json=Mock(return_value=body))
+    
+    def item(self, video_id, part):
+        published_ts, views = self.videos[video_id]
+        item = {"id": video_id, "statistics": {"viewCount": str(views), "likeCount": "1", "commentCount": "0"}}
+        if "snippet" in part:
+            item["snippet"] = {"title": video_id, "channelId": "UC1", "publishedAt": format_timestamp(published_ts)}
+        return item
+    
+    def count(self, endpoint, part=None):
+        return sum(1 for e, p in self.calls if e == endpoint and (part is None or p == part))
+
+
+class TestPollInterval:
+    
+    def test_new_uploads_poll_more_often_than_back_catalogue(self):
+        assert poll_interval(HOUR) == 5 * MINUTE
+        assert poll_interval(12 * HOUR) == 15 * MINUTE
+        assert poll_interval(3 * DAY) == HOUR
+        assert poll_interval(365 * DAY) == SETTLED_INTERVAL
+    
+    def test_fast_videos_poll_sooner(self):
+        assert poll_interval(3 * DAY, views_per_hour=5000) == HOUR / 2
+        assert poll_interval(HOUR, views_per_hour=5000) == MIN_INTERVAL
+    
+    def test_unchanged_videos_back_off(self):
+        assert poll_interval(3 * DAY, previous=HOUR, changed=False) == 2 * HOUR
+        assert poll_interval(365 * DAY, previous=MAX_INTERVAL, changed=False) == MAX_INTERVAL
+
+
+class TestChannelWatcher:
+    
+    @pytest.fixture
+    def channel(self):
+        return FakeChannel({"new": [NOW - HOUR, 100], "old": [NOW - 100 * DAY, 5000]})
+    
+    def watcher(self, channel, clock, store=None, **kwargs):
+        analyzer = VideoAnalyzer(api_key="k", transport=channel, store=store)
+        return ChannelWatcher(analyzer, ["UC1"], count=2, clock=clock, sleep=clock.sleep, **kwargs)
+    
+    def test_first_poll_reports_every_video(self, channel, clock):
+        updates = self.watcher(channel, clock).poll_once()
+        
+        assert sorted(row["video_id"] for _, row in updates) == ["new", "old"]
+        assert {channel_id for channel_id, _ in updates} == {"UC1"}
+        assert channel.count("videos", "snippet,statistics") == 1
+    
+    def test_new_uploads_are_polled_before_back_catalogue(self, channel, clock):
+        watcher = self.watcher(channel, clock)
+        watcher.poll_once()
+        channel.videos["new"][1] = 700
+        
+        clock.sleep(watcher.next_wakeup() - clock())
+        updates = watcher.poll_once()
+        
+        assert clock.now == NOW + 5 * MINUTE
+        assert [row["video_id"] for _, row in updates] == ["new"]
+        assert updates[0][1]["views"] == 700
+        assert updates[0][1]["views_per_hour"] == pytest.approx(7200)
+        assert watcher.watched["old"].next_poll == NOW + SETTLED_INTERVAL
+    
+    def test_run_sleeps_until_next_due_video(self, channel, clock):
+        watcher = self.watcher(channel, clock)
+        
+        updates = list(watcher.run(max_polls=3))
+        
+        assert len(updates) == 2
+        assert watcher.polls == 3
+        assert clock.now == NOW + 10 * MINUTE
+    
+    def test_unchanged_videos_are_not_reported_and_back_off(self, channel, clock):
+        watcher = self.watcher(channel, clock)
+        watcher.poll_once()
+        
+        clock.now += 5 * MINUTE
+        
+        assert watcher.poll_once() == []
+        assert watcher.watched["new"].interval == 10 * MINUTE
+    
+    def test_uploads_are_only_relisted_when_video_count_changes(self, channel, clock):
+        watcher = self.watcher(channel, clock)
+        watcher.poll_once()
+        clock.now += 5 * MINUTE
+        watcher.poll_once()
+        
+        assert channel.count("playlistItems") == 1
+        
+        channel.videos["newest"] = [NOW, 10]
+        clock.now += 5 * MINUTE
+        updates = watcher.poll_once()
+        
+        assert channel.count("playlistItems") == 2
+        assert "newest" in [row["video_id"] for _, row in updates]
+        assert set(watcher.watched) == {"newest", "new"}
+    
+    def test_polls_are_recorded_in_store(self, channel, clock):
+        store = SnapshotStore(clock=clock)
+        watcher = self.watcher(channel, clock, store=store)
+        watcher.poll_once()
+        channel.videos["new"][1] = 400
+        clock.now += 5 * MINUTE
+        watcher.poll_once()
+        
+        assert [views for _, views, _, _ in store.history("new")] == [100, 400]
+    
+    def test_videos_missing_from_refresh_stop_being_watched(self, channel, clock):
+        watcher = self.watcher(channel, clock, upload_interval=DAY)
+        watcher.poll_once()
+        del channel.videos["new"]
+        
+        updates = list(watcher.run(max_polls=4))
+        
+        assert updates == []
+        assert set(watcher.watched) == {"old"}
+        # "new" is asked for once after it disappears; the next poll waits for "old"
+        assert channel.count("videos", "statistics") == 2
+        assert clock.now == NOW + SETTLED_INTERVAL
+    
+    def test_run_backs_off_and_continues_after_errors(self, channel, clock):
+        watcher = self.watcher(channel, clock)
+        channel.failures = [TimeoutError("read timed out"), QuotaExceededError("k")]
+        
+        updates = list(watcher.run(max_polls=3))
+        
+        assert sorted(row["video_id"] for _, row in updates) == ["new", "old"]
+        assert watcher.errors == 2
+        assert isinstance(watcher.last_error, QuotaExceededError)
+        assert clock.now == NOW + MIN_INTERVAL + 2 * MIN_INTERVAL
+    
+    def test_failed_refresh_keeps_videos_for_the_next_poll(self, channel, clock):
+        watcher = self.watcher(channel, clock, upload_interval=DAY)
+        list(watcher.run(max_polls=1))
+        channel.failing["videos"] = [SERVER_ERROR]
+        channel.videos["new"][1] = 400
+        
+        # Nothing is due at once; the 503 hits the poll 5 minutes later, retried 5 minutes after that
+        updates = list(watcher.run(max_polls=4))
+        
+        assert set(watcher.watched) == {"new", "old"}
+        assert watcher.errors == 1
+        assert [row["views"] for _, row in updates] == [400]
+    
+    def test_uploads_failing_to_load_are_picked_up_next_poll(self, channel, clock):
+        watcher = self.watcher(channel, clock)
+        watcher.poll_once()
+        channel.videos["newest"] = [NOW, 10]
+        channel.failing["videos"] = [ConnectionError("connection reset")]
+        clock.now += 5 * MINUTE
+        
+        with pytest.raises(ConnectionError):
+            watcher.poll_once()
+        updates = watcher.poll_once()
+        
+        assert "newest" in watcher.watched
+        assert "newest" in [row["video_id"] for _, row in updates]
+    
+    def test_unknown_channel_is_dropped_and_the_rest_watched(self, channel, clock):
+        watcher = ChannelWatcher(VideoAnalyzer(api_key="k", transport=channel), ["UCX", "UC1"], count=2,
+                                 clock=clock, sleep=clock.sleep)
+        
+        updates = list(watcher.run(max_polls=2))
+        
+        assert watcher.channel_ids == ["UC1"]
+        assert isinstance(watcher.last_error, LookupError)
+        assert sorted(row["video_id"] for _, row in updates) == ["new", "old"]
@@ -0,0 +1,199 @@
+"""
+Tests for the YouTubeClient class.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from src.youtube_client import YouTubeClient, APIError, chunked
+from src.fields import FieldMask, ANALYSIS_FIELDS, STATISTICS_FIELDS
+from src.cache import UploadsPlaylistCache
+from tests.conftest import FakeAPI
+
+
+class TestChunked:
+
+    def test_splits_into_fixed_size_chunks(self):
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    
+    def test_empty_input(self):
+        assert list(chunked([], 50)) == []
+
+
+class TestChannelCrawl:
+
+    def setup_method(self):
+        self.client = YouTubeClient(api_key="test_key")
+    
+    def test_latest_videos_uses_single_page(self):
+        """Test that fetching the latest 5 videos costs one page and one detail call."""
+        api = FakeAPI(total=120)
+        with patch.object(self.client, "_get", side_effect=api):
+            videos = self.client.get_channel_videos(max_results=5)
+        
+        assert [v["id"] for v in videos] == ["v0", "v1", "v2", "v3", "v4"]
+        assert api.count("playlistItems") == 1
+        assert api.count("videos") == 1
+    
+    def test_stream_follows_page_tokens(self):
+        """Test that the crawl walks every page of the uploads playlist."""
+        api = FakeAPI(total=120)
+        with patch.object(self.client, "_get", side_effect=api):
+            videos = list(self.client.iter_channel_videos())
+        
+        assert len(videos) == 120
+        assert api.count("playlistItems") == 3
+        assert api.count("videos") == 3
+    
+    def test_stream_is_lazy(self):
+        """Test that the first video is yielded before later pages are requested."""
+        api = FakeAPI(total=120)
+        with patch.object(self.client, "_get", side_effect=api):
+            stream = self.client.iter_channel_videos()
+            first = next(stream)
+        
+        assert first["id"] == "v0"
+        assert api.count("playlistItems") == 1
+    
+    def test_limit_spans_pages(self):
+        """Test that limits above one page still stop at the requested count."""
+        api = FakeAPI(total=120)
+        with patch.object(self.client, "_get", side_effect=api):
+            videos = self.client.get_channel_videos(max_results=70)
+        
+        assert len(videos) == 70
+        assert [p["maxResults"] for name, p in api.calls if name == "playlistItems"] == [50, 20]
+    
+    def test_video_details_are_batched_by_50(self):
+        """Test that detail lookups group IDs into 50-per-request calls."""
+        api = FakeAPI(total=0)
+        video_ids = [f"v{i}" for i in range(120)]
+        with patch.object(self.client, "_get", side_effect=api):
+            videos = self.client.get_video_details(video_ids)
+        
+        assert len(videos) == 120
+        batch_sizes = [len(p["id"].split(",")) for name, p in api.calls if name == "videos"]
+        assert batch_sizes == [50, 50, 20]
+
+
+class TestUploadsPlaylistResolution:
+
+    def test_resolution_is_memoized(self):
+        client = YouTubeClient(api_key="test_key")
+        api = FakeAPI(total=10)
+        with patch.object(client, "_get", side_effect=api):
+            client.get_channel_videos("UC1")
+            client.get_channel_videos("UC1")
+        
+        assert api.count("channels") == 1
+    
+    def test_bulk_resolution_50_per_request(self):
+        client = YouTubeClient(api_key="test_key")
+        api = FakeAPI(total=0)
+        channel_ids = [f"UC{i}" for i in range(120)]
+        with patch.object(client, "_get", side_effect=api):
+            playlists = client.resolve_uploads_playlists(channel_ids)
+            client.resolve_uploads_playlists(channel_ids)
+        
+        assert list(playlists) == channel_ids
+        assert api.count("channels") == 3
+    
+    def test_persists_across_runs(self, tmp_path):
+        path = tmp_path / "uploads_playlists.json"
+        api = FakeAPI(total=0)
+        
+        first = YouTubeClient(api_key="test_key", playlist_cache=UploadsPlaylistCache(path))
+        with patch.object(first, "_get", side_effect=api):
+            first.get_uploads_playlist_id("UC1")
+        
+        second = YouTubeClient(api_key="test_key", playlist_cache=UploadsPlaylistCache(path))
+        with patch.object(second, "_get", side_effect=api):
+            assert second.get_uploads_playlist_id("UC1") == "UU123"
+        
+        assert api.count("channels") == 1
+    
+    def test_unknown_channel(self):
+        client = YouTubeClient(api_key="test_key")
+        with patch.object(client, "_get", return_value={"items": []}):
+            with pytest.raises(LookupError):
+                client.get_uploads_playlist_id("UCmissing")
+
+
+class TestErrorResponses:
+
+    def test_server_error_raises_instead_of_returning_no_items(self):
+        transport = Mock()
+        transport.fetch.return_value = Mock(status_code=503, headers={}, json=Mock(return_value={
+            "error": {"code": 503, "message": "Backend Error", "errors": [{"reason": "backendError"}]}
+        }))
+        client = YouTubeClient(api_key="test_key", transport=transport)
+        
+        with pytest.raises(APIError) as raised:
+            client.get_video_details(["v1"])
+        
+        assert raised.value.status_code == 503
+        assert raised.value.reason == "backendError"
+        assert "Backend Error" in str(raised.value)
+    
+    def test_non_json_error_page(self):
+        transport = Mock()
+        transport.fetch.return_value = Mock(status_code=403, headers={}, json=Mock(side_effect=ValueError("not JSON")))
+        client = YouTubeClient(api_key=["a", "b"], transport=transport)
+        
+        with pytest.raises(APIError) as raised:
+            client.get_video_details(["v1"])
+        
+        assert raised.value.status_code == 403
+        assert transport.fetch.call_count == 1
+        assert client.keys.active_keys == ["a", "b"]
+
+
+class TestFieldProjection:
+
+    def setup_method(self):
+        self.client = YouTubeClient(api_key="test_key")
+        self.api = FakeAPI(total=60)
+    
+    def video_calls(self):
+        return [params for name, params in self.api.calls if name == "videos"]
+    
+    def test_requests_only_masked_parts_and_fields(self):
+        with patch.object(self.client, "_get", side_effect=self.api):
+            videos = self.client.get_channel_videos(max_results=3, fields=ANALYSIS_FIELDS)
+        
+        assert [v["id"] for v in videos] == ["v0", "v1", "v2"]
+        (params,) = self.video_calls()
+        assert params["part"] == "snippet,statistics"
+        assert params["fields"] == ANALYSIS_FIELDS.selector()
+        playlist_params = [p for name, p in self.api.calls if name == "playlistItems"][0]
+        assert playlist_params["fields"] == "nextPageToken,items/snippet/resourceId/videoId"
+    
+    def test_cached_snippets_are_not_requested_again(self):
+        with patch.object(self.client, "_get", side_effect=self.api):
+            first = self.client.get_video_details(["v0", "v1"], fields=ANALYSIS_FIELDS)
+            second = self.client.get_video_details(["v0", "v1"], fields=ANALYSIS_FIELDS)
+            mixed = self.client.get_video_details(["v1", "v2"], fields=ANALYSIS_FIELDS)
+        
+        assert [p["part"] for p in self.video_calls()] == ["snippet,statistics", "statistics", "snippet,statistics"]
+        assert second == first
+        assert [v["snippet"]["title"] for v in mixed] == ["Video v1", "Video v2"]
+    
+    def test_fully_cached_request_is_skipped(self):
+        snippet_only = FieldMask("snippet.title")
+        with patch.object(self.client, "_get", side_effect=self.api):
+            self.client.get_video_details(["v0"], fields=snippet_only)
+            videos = self.client.get_video_details(["v0"], fields=snippet_only)
+        
+        assert len(self.video_calls()) == 1
+        assert videos == [{"id": "v0", "snippet": {"title": "Video v0", "publishedAt": "2024-11-20T10:00:00Z"}}]
+    
+    def test_statistics_mask(self):
+        with patch.object(self.client, "_get", side_effect=self.api):
+            self.client.get_video_details(["v0"], fields=STATISTICS_FIELDS)
+        
+        assert self.video_calls()[0]["part"] == "statistics"
+    
+    def test_without_fields_requests_detail_parts(self):
+        with patch.object(self.client, "_get", side_effect=self.api):
+            self.client.get_video_details(["v0"])
+        
+        assert self.video_calls()[0] == {"part": "snippet,statistics,contentDetails", "id": "v0"}